@@ -5,14 +5,37 @@ Methods that have been imported into this file are expected to be used by the
 end user inside their project.
 """
 
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import os
 from pathlib import Path
+from importlib import import_module
 from agentstack import conf
 from agentstack.utils import get_framework
-from agentstack.agents import get_agent
-from agentstack.tasks import get_task
-from agentstack.inputs import get_inputs
-from agentstack import frameworks
+
+if TYPE_CHECKING:
+    from agentstack.agents import get_agent
+    from agentstack.tasks import get_task
+    from agentstack.inputs import get_inputs
+
+# These pull in pydantic, ruamel and the framework/tool machinery, so they are
+# imported on first access to keep `import agentstack` (and the CLI) fast.
+_LAZY_ATTRIBUTES: dict[str, tuple[str, Optional[str]]] = {
+    'get_agent': ('agentstack.agents', 'get_agent'),
+    'get_task': ('agentstack.tasks', 'get_task'),
+    'get_inputs': ('agentstack.inputs', 'get_inputs'),
+    'frameworks': ('agentstack.frameworks', None),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module 'agentstack' has no attribute '{name}'")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = import_module(module_name)
+    value = getattr(module, attribute) if attribute else module
+    globals()[name] = value
+    return value
+
 
 ___all___ = [
     "conf", 
@@ -60,9 +83,45 @@ class ToolLoader:
 
     Get a tool's callables by name with `agentstack.tools[tool_name]`
     Include them in your agent's tool list with `tools = [*agentstack.tools[tool_name], ]`
+
+    Callables are cached per tool and reused until the tool's `config.json` or the
+    project's `agentstack.json` changes on disk, or `invalidate()` is called.
     """
 
+    def __init__(self):
+        self._cache: dict[str, tuple[tuple, list[Callable]]] = {}
+
+    def _cache_key(self, tool_name: str) -> tuple:
+        """Identify the inputs that resolving a tool depends on."""
+        from agentstack._tools import TOOLS_DIR, TOOLS_CONFIG_FILENAME
+
+        def mtime(path: Path) -> Optional[int]:
+            try:
+                return os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+
+        project_config = conf.PATH / conf.CONFIG_FILENAME
+        tool_config = TOOLS_DIR / tool_name / TOOLS_CONFIG_FILENAME
+        return (str(conf.PATH), mtime(project_config), mtime(tool_config))
+
     def __getitem__(self, tool_name: str) -> list[Callable]:
-        return frameworks.get_tool_callables(tool_name)
+        key = self._cache_key(tool_name)
+        cached = self._cache.get(tool_name)
+        if cached is None or cached[0] != key:
+            from agentstack import frameworks
+
+            cached = (key, frameworks.get_tool_callables(tool_name))
+            self._cache[tool_name] = cached
+        return list(cached[1])
+
+    def invalidate(self, tool_name: Optional[str] = None) -> None:
+        """
+        Drop cached callables for `tool_name`, or for all tools if no name is given.
+        """
+        if tool_name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(tool_name, None)
 
 tools = ToolLoader()
@@ -1,9 +1,13 @@
-from typing import Optional, Protocol, runtime_checkable
+from typing import Any, Callable, Optional, Protocol, runtime_checkable
 from types import ModuleType
 import os
 import sys
+import ast
+import typing
+import inspect
 from pathlib import Path
 from importlib import import_module
+from importlib.util import find_spec
 import pydantic
 from agentstack.exceptions import ValidationError
 from agentstack.utils import get_package_path, open_json_file, term_color, snake_to_camel
@@ -99,6 +103,161 @@ class ToolConfig(pydantic.BaseModel):
                 f"ModuleNotFoundError: {e}"
             )
 
+    @property
+    def lazy_module(self) -> 'LazyToolModule':
+        """
+        A stand-in for `module` that does not import the tool module until one of
+        its tools is called. Importing a tool module pulls in its SDK and often
+        constructs clients, so deferring it keeps project startup fast.
+
+        Falls back to the eagerly imported (and validated) `module` when the tool
+        functions can't be described from the module source alone.
+        """
+        functions = _describe_tool_functions(self)
+        if functions is None:
+            return self.module  # type: ignore[return-value]
+        return LazyToolModule(self, functions)
+
+
+class LazyToolFunction:
+    """
+    Callable proxy for a tool function. Carries the name, docstring, signature and
+    annotations read from the module source so frameworks can build tool schemas,
+    and imports the tool module on the first call.
+    """
+
+    def __init__(self, tool: ToolConfig, name: str, doc: Optional[str], signature: inspect.Signature):
+        self.__name__ = name
+        self.__qualname__ = name
+        self.__module__ = tool.module_name
+        self.__doc__ = doc
+        self.__signature__ = signature
+        self.__annotations__ = {
+            param.name: param.annotation
+            for param in signature.parameters.values()
+            if param.annotation is not inspect.Parameter.empty
+        }
+        if signature.return_annotation is not inspect.Signature.empty:
+            self.__annotations__['return'] = signature.return_annotation
+        self._tool = tool
+        self._func: Optional[Callable] = None
+
+    def __call__(self, *args, **kwargs):
+        if self._func is None:
+            self._func = getattr(self._tool.module, self.__name__)
+        return self._func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._func else "not loaded"
+        return f"<LazyToolFunction {self.__module__}.{self.__name__} ({state})>"
+
+
+class LazyToolModule:
+    """
+    Proxy for a tool module. Configured tool names resolve to `LazyToolFunction`s;
+    any other attribute imports the real module.
+    """
+
+    def __init__(self, tool: ToolConfig, functions: dict[str, LazyToolFunction]):
+        self._tool = tool
+        self._functions = functions
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name in self._functions:
+            return self._functions[name]
+        return getattr(self._tool.module, name)
+
+
+def _describe_tool_functions(tool: ToolConfig) -> Optional[dict[str, LazyToolFunction]]:
+    """
+    Read the signatures and docstrings of a tool's functions from its source
+    without importing it. Returns None if any tool function isn't a plain,
+    undecorated top-level `def` whose annotations and defaults can be resolved
+    statically; callers should import the module instead.
+    """
+    try:
+        spec = find_spec(tool.module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith('.py'):
+        return None
+    origin: str = spec.origin
+
+    try:
+        with open(origin, encoding='utf-8') as f:
+            source_tree = ast.parse(f.read(), filename=origin)
+    except (OSError, SyntaxError):
+        return None
+
+    definitions = {node.name: node for node in source_tree.body if isinstance(node, ast.FunctionDef)}
+    namespace = vars(typing)
+
+    def evaluate(node: Optional[ast.expr], literal: bool = False) -> Any:
+        if node is None:
+            return inspect.Parameter.empty
+        if literal:
+            return ast.literal_eval(node)
+        return eval(compile(ast.Expression(node), origin, 'eval'), dict(namespace))
+
+    functions = {}
+    for name in tool.tools:
+        node = definitions.get(name)
+        if node is None or node.decorator_list:
+            return None
+
+        args = node.args
+        params = []
+        try:
+            positional = args.posonlyargs + args.args
+            defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+            for i, (arg, default) in enumerate(zip(positional, defaults)):
+                kind = (
+                    inspect.Parameter.POSITIONAL_ONLY
+                    if i < len(args.posonlyargs)
+                    else inspect.Parameter.POSITIONAL_OR_KEYWORD
+                )
+                params.append(
+                    inspect.Parameter(
+                        arg.arg,
+                        kind,
+                        default=evaluate(default, literal=True),
+                        annotation=evaluate(arg.annotation),
+                    )
+                )
+            if args.vararg:
+                params.append(
+                    inspect.Parameter(
+                        args.vararg.arg,
+                        inspect.Parameter.VAR_POSITIONAL,
+                        annotation=evaluate(args.vararg.annotation),
+                    )
+                )
+            for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+                params.append(
+                    inspect.Parameter(
+                        arg.arg,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        default=evaluate(default, literal=True),
+                        annotation=evaluate(arg.annotation),
+                    )
+                )
+            if args.kwarg:
+                params.append(
+                    inspect.Parameter(
+                        args.kwarg.arg,
+                        inspect.Parameter.VAR_KEYWORD,
+                        annotation=evaluate(args.kwarg.annotation),
+                    )
+                )
+            signature = inspect.Signature(params, return_annotation=evaluate(node.returns))
+        except (NameError, AttributeError, TypeError, ValueError, SyntaxError):
+            return None  # references names only the module itself can resolve
+
+        functions[name] = LazyToolFunction(tool, name, ast.get_docstring(node), signature)
+    return functions
+
 
 def get_all_tool_paths() -> list[Path]:
     """
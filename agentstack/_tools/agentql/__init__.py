@@ -1,13 +1,67 @@
 import os
+import copy
+import time
+import threading
 import httpx
 
-from typing import Optional
+from typing import Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 QUERY_DATA_ENDPOINT = "https://api.agentql.com/v1/query-data"
 API_TIMEOUT_SECONDS = 900
+CONNECT_TIMEOUT_SECONDS = 10
 
 API_KEY = os.getenv("AGENTQL_API_KEY")
 
+# Seconds a page's query result is reused for the same query and prompt; 0 disables the cache
+CACHE_TTL_SECONDS = int(os.getenv("AGENTQL_CACHE_TTL") or 300)
+MAX_CACHED_RESULTS = 128
+# Number of pages `query_data_many` queries at once
+MAX_CONCURRENT_QUERIES = 5
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+_cache: OrderedDict[tuple[str, Optional[str], Optional[str]], tuple[float, dict]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Get the shared client, which keeps connections open and multiplexes requests over HTTP/2."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                http2=True,
+                headers={"X-API-Key": f"{API_KEY}", "Content-Type": "application/json"},
+                timeout=httpx.Timeout(API_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(max_connections=MAX_CONCURRENT_QUERIES, keepalive_expiry=60),
+            )
+        return _client
+
+
+def _get_cached(key: tuple[str, Optional[str], Optional[str]]) -> Optional[dict]:
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() >= cached[0]:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        # callers may modify the result they're given
+        return copy.deepcopy(cached[1])
+
+
+def _set_cached(key: tuple[str, Optional[str], Optional[str]], data: dict) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, copy.deepcopy(data))
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_RESULTS:
+            _cache.popitem(last=False)
+
+
 def query_data(url: str, query: Optional[str], prompt: Optional[str]) -> dict:
     """
     url: url of website to scrape
@@ -44,24 +98,20 @@ You can't include new lines in your semantic context. The following query struct
 }
 ```
     """
+    key = (url, query, prompt)
+    if CACHE_TTL_SECONDS > 0:
+        cached = _get_cached(key)
+        if cached is not None:
+            return cached
+
     payload = {
         "url": url,
         "query": query,
         "prompt": prompt
     }
 
-    headers = {
-        "X-API-Key": f"{API_KEY}",
-        "Content-Type": "application/json"
-    }
-
     try:
-        response = httpx.post(
-            QUERY_DATA_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=API_TIMEOUT_SECONDS
-        )
+        response = _get_client().post(QUERY_DATA_ENDPOINT, json=payload)
         response.raise_for_status()
 
     except httpx.HTTPStatusError as e:
@@ -77,4 +127,31 @@ You can't include new lines in your semantic context. The following query struct
             raise ValueError(msg) from e
     else:
         json = response.json()
-        return json["data"]
\ No newline at end of file
+        if CACHE_TTL_SECONDS > 0:
+            _set_cached(key, json["data"])
+        return json["data"]
+
+
+def query_data_many(urls: list[str], query: Optional[str], prompt: Optional[str]) -> dict:
+    """
+    urls: urls of the websites to scrape
+    query: AgentQL query to scrape each url with; the syntax is described in query_data
+    prompt: Natural language description of the data you want to scrape
+
+    Scrapes several websites at once with the same query or prompt. Returns a dict
+    mapping each url to its data, or to {"error": message} if scraping it failed.
+    """
+    def query_url(url: str) -> dict[str, Any]:
+        try:
+            return query_data(url, query, prompt)
+        except ValueError as e:
+            return {"error": str(e)}
+        except httpx.HTTPError as e:
+            return {"error": f"Request failed: {e}"}
+
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_QUERIES, len(unique_urls))) as executor:
+        return dict(zip(unique_urls, executor.map(query_url, unique_urls)))
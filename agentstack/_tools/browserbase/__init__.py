@@ -1,21 +1,226 @@
+"""
+Load pages in Browserbase's headless browsers.
+
+Page loads are routed to a pool of warm browser sessions. Each session is
+owned by a worker thread which keeps its browser connected between loads and
+releases the session once it has been idle for a while, so loading many pages
+doesn't start a new browser for each one.
+"""
+
 import os
-from typing import Optional, Any
+import queue
+import atexit
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 from browserbase import Browserbase
+from playwright.sync_api import Browser, Playwright, sync_playwright
+
+
+if not os.getenv("BROWSERBASE_API_KEY"):
+    raise Exception(
+        "Browserbase API Key not found. Did you set the BROWSERBASE_API_KEY in your project's .env file?"
+    )
+if not os.getenv("BROWSERBASE_PROJECT_ID"):
+    raise Exception(
+        "Browserbase Project ID not found. Did you set the BROWSERBASE_PROJECT_ID in your project's .env file?"
+    )
+
+BROWSERBASE_API_KEY = os.environ["BROWSERBASE_API_KEY"]
+BROWSERBASE_PROJECT_ID = os.environ["BROWSERBASE_PROJECT_ID"]
+
+CONNECT_URL = "wss://connect.browserbase.com?apiKey={api_key}&sessionId={session_id}"
+# Number of sessions kept open, which is also the number of pages loaded at once
+POOL_SIZE = 3
+# Seconds a session is kept open without any pages to load before it is released
+IDLE_TIMEOUT = 60
+PAGE_TIMEOUT_MS = 30_000
+# Upper limit on the content returned for one page
+MAX_CONTENT_CHARS = 100_000
+
+_client: Optional[Browserbase] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> Browserbase:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Browserbase(api_key=BROWSERBASE_API_KEY)
+        return _client
+
+
+def _load_page(browser: Browser, url: str, text_content: bool) -> str:
+    context = browser.contexts[0] if browser.contexts else browser.new_context()
+    page = context.new_page()
+    try:
+        page.goto(url, timeout=PAGE_TIMEOUT_MS, wait_until="domcontentloaded")
+        content = page.inner_text("body") if text_content else page.content()
+        return content[:MAX_CONTENT_CHARS]
+    finally:
+        page.close()
+
+
+class _SessionWorker(threading.Thread):
+    """Loads pages from the pool's queue in one browser session, which it opens on first use."""
+
+    def __init__(self, pool: "_SessionPool"):
+        super().__init__(name="browserbase-session", daemon=True)
+        self.pool = pool
+        self.session_id: Optional[str] = None
+        self.browser: Optional[Browser] = None
+
+    def _connect(self, playwright: Playwright) -> Browser:
+        if self.browser is None or not self.browser.is_connected():
+            self._release()
+            session = _get_client().sessions.create(project_id=BROWSERBASE_PROJECT_ID, proxies=self.pool.proxy)
+            self.session_id = session.id
+            self.browser = playwright.chromium.connect_over_cdp(session.connect_url)
+        return self.browser
+
+    def _release(self) -> None:
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self.session_id is not None:
+            try:
+                _get_client().sessions.update(self.session_id, project_id=BROWSERBASE_PROJECT_ID, status="REQUEST_RELEASE")
+            except Exception:
+                pass  # sessions end on their own when they time out
+            self.session_id = None
+
+    def _load(self, playwright: Playwright, url: str, text_content: bool) -> str:
+        try:
+            return _load_page(self._connect(playwright), url, text_content)
+        except Exception:
+            if self.browser is not None and self.browser.is_connected():
+                raise
+        # the session was lost; load the page again in a new one
+        return _load_page(self._connect(playwright), url, text_content)
+
+    def run(self) -> None:
+        try:
+            with sync_playwright() as playwright:
+                while True:
+                    job = self.pool.next_job(self)
+                    if job is None:
+                        break
+                    future, url, text_content = job
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(self._load(playwright, url, text_content))
+                    except Exception as e:
+                        future.set_exception(e)
+                self._release()
+        except Exception as e:
+            self.pool.remove(self, error=e)
+        finally:
+            self.pool.remove(self)
+
+
+class _SessionPool:
+    """Warm sessions with the same proxy setting, started as page loads need them."""
+
+    def __init__(self, proxy: bool):
+        self.proxy = proxy
+        self.jobs: queue.Queue = queue.Queue()
+        self.workers: set[_SessionWorker] = set()
+        self.idle = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def submit(self, url: str, text_content: bool) -> Future:
+        future: Future = Future()
+        with self.lock:
+            self.jobs.put((future, url, text_content))
+            if self.jobs.qsize() > self.idle and len(self.workers) < POOL_SIZE:
+                worker = _SessionWorker(self)
+                self.workers.add(worker)
+                worker.start()
+        return future
 
+    def next_job(self, worker: _SessionWorker) -> Optional[tuple[Future, str, bool]]:
+        """The next page for `worker` to load, or None when it should release its session and stop."""
+        while True:
+            with self.lock:
+                self.idle += 1
+            try:
+                job = self.jobs.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                job = None
+            with self.lock:
+                self.idle -= 1
+                if job is not None or self.closed:
+                    return job
+                # a page may have been queued just as this worker timed out
+                if self.jobs.empty():
+                    self.workers.discard(worker)
+                    return None
 
-BROWSERBASE_API_KEY = os.getenv("BROWSERBASE_API_KEY")
-BROWSERBASE_PROJECT_ID = os.getenv("BROWSERBASE_PROJECT_ID")
+    def remove(self, worker: _SessionWorker, error: Optional[Exception] = None) -> None:
+        """Remove a stopped worker. If it stopped because of `error` and was the last one, fail the queued pages."""
+        with self.lock:
+            self.workers.discard(worker)
+            if error is None or self.workers:
+                return
+            while not self.jobs.empty():
+                job = self.jobs.get_nowait()
+                if job is not None and job[0].set_running_or_notify_cancel():
+                    job[0].set_exception(error)
 
-client = Browserbase(BROWSERBASE_API_KEY, BROWSERBASE_PROJECT_ID)
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            workers = list(self.workers)
+        for _ in workers:
+            self.jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+
+
+_pools: dict[bool, _SessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(proxy: bool) -> _SessionPool:
+    with _pools_lock:
+        if proxy not in _pools:
+            _pools[proxy] = _SessionPool(proxy)
+        return _pools[proxy]
+
+
+def _close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(_close_pools)
+
+
+def _load_in_session(session_id: str, url: str, text_content: bool) -> str:
+    """Load a page in a session the caller created, rather than one from the pool."""
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.connect_over_cdp(
+            CONNECT_URL.format(api_key=BROWSERBASE_API_KEY, session_id=session_id)
+        )
+        try:
+            return _load_page(browser, url, text_content)
+        finally:
+            browser.close()
 
 
-# TODO can we define a type for the return value?
 def load_url(
     url: str,
     text_content: Optional[bool] = True,
     session_id: Optional[str] = None,
     proxy: Optional[bool] = None,
-) -> Any:
+) -> str:
     """
     Load a URL in a headless browser and return the page content.
 
@@ -25,6 +230,36 @@ def load_url(
         session_id: Session ID to use for the browser
         proxy: Use a proxy for the browser
     Returns:
-        Any: Page content
+        str: Page content
+    """
+    if session_id:
+        # Playwright's sync API can't run inside an event loop, so the page is loaded in its own thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(_load_in_session, session_id, url, bool(text_content)).result()
+    return _get_pool(bool(proxy)).submit(url, bool(text_content)).result()
+
+
+def load_urls(
+    urls: list[str],
+    text_content: Optional[bool] = True,
+    proxy: Optional[bool] = None,
+) -> dict:
+    """
+    Load several URLs at once in headless browsers and return the content of each page.
+
+    Args:
+        urls: URLs to load
+        text_content: Return text content if True, otherwise return raw content
+        proxy: Use a proxy for the browser
+    Returns:
+        dict: The content of each page by URL, or an error message for pages that failed to load
     """
-    return client.load_url(url)
+    pool = _get_pool(bool(proxy))
+    futures = {url: pool.submit(url, bool(text_content)) for url in dict.fromkeys(urls)}
+    results = {}
+    for url, future in futures.items():
+        try:
+            results[url] = future.result()
+        except Exception as e:
+            results[url] = f"Error: failed to load {url}: {e}"
+    return results
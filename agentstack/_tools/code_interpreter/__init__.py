@@ -1,18 +1,84 @@
 import os
+import io
+import sys
+import codecs
+import atexit
+import shlex
+import hashlib
+import threading
+import uuid
+from typing import Any, Callable, Optional
 from agentstack.utils import get_package_path
 import docker
 
 CONTAINER_NAME = "code-interpreter"
+CONTAINER_LABEL = "agentstack.code-interpreter"
 DEFAULT_IMAGE_TAG = os.getenv("CODE_INTERPRETER_DEFAULT_IMAGE_TAG", "code-interpreter:latest")
 DOCKERFILE_PATH = os.getenv("CODE_INTERPRETER_DOCKERFILE_PATH", get_package_path() / "tools/code_interpreter")
+POOL_SIZE = int(os.getenv("CODE_INTERPRETER_POOL_SIZE") or 2)
+WORKSPACE_DIR = "/workspace"
 
-client = docker.from_env()
+# Run before a container is reused: stop anything the previous code left running
+# and clear its temporary files. The project directory mounted at /workspace is
+# left alone since it belongs to the user.
+RESET_COMMAND = ["sh", "-c", "pkill -9 -f '^python3 -c'; rm -rf /tmp/* /tmp/.[!.]*; true"]
 
+OutputCallback = Callable[[str, str], None]
 
-def _verify_docker_image() -> None:
-    try:
-        client.images.get(DEFAULT_IMAGE_TAG)
-    except docker.errors.ImageNotFound:
+
+def _echo_output(stream: str, text: str) -> None:
+    """Stream output from the container to our own stdout and stderr as it arrives."""
+    out = sys.stderr if stream == 'stderr' else sys.stdout
+    out.write(text)
+    out.flush()
+
+
+def _get_library_image_tag(libraries: list[str]) -> str:
+    """Get the tag of the image with `libraries` installed on top of the default image."""
+    libraries_hash = hashlib.sha256("\n".join(sorted(set(libraries))).encode('utf-8')).hexdigest()
+    repository = DEFAULT_IMAGE_TAG.rsplit(':', 1)[0]
+    return f"{repository}:libs-{libraries_hash[:16]}"
+
+
+class ContainerPool:
+    """
+    Keeps containers running between calls so code runs without waiting on
+    Docker to start a new one.
+
+    Containers are created per image and working directory, and up to `size`
+    idle containers are kept; the least recently used are stopped first.
+    Libraries are installed into an image tagged with a hash of the library
+    set, so each combination of libraries is only installed once.
+    """
+
+    def __init__(self, client: Any, size: int = POOL_SIZE):
+        self.client = client
+        self.size = size
+        self._idle: list[tuple[tuple[str, str], Any]] = []
+        self._keys: dict[str, tuple[str, str]] = {}  # container id -> (image, mounted directory)
+        self._images: set[str] = set()
+        self._lock = threading.Lock()
+
+    def get_image(self, libraries: list[str]) -> str:
+        """Get an image with `libraries` installed, building it if necessary."""
+        self._verify_image(DEFAULT_IMAGE_TAG, self._build_default_image)
+        if not libraries:
+            return DEFAULT_IMAGE_TAG
+
+        tag = _get_library_image_tag(libraries)
+        self._verify_image(tag, lambda: self._build_library_image(tag, libraries))
+        return tag
+
+    def _verify_image(self, tag: str, build: Callable[[], None]) -> None:
+        if tag in self._images:
+            return
+        try:
+            self.client.images.get(tag)
+        except docker.errors.ImageNotFound:
+            build()
+        self._images.add(tag)
+
+    def _build_default_image(self) -> None:
         if not os.path.exists(DOCKERFILE_PATH):
             raise Exception(
                 (
@@ -21,53 +87,138 @@ def _verify_docker_image() -> None:
                 )
             )
 
-        client.images.build(
-            path=DOCKERFILE_PATH,
+        self.client.images.build(
+            path=str(DOCKERFILE_PATH),
             tag=DEFAULT_IMAGE_TAG,
             rm=True,
         )
 
+    def _build_library_image(self, tag: str, libraries: list[str]) -> None:
+        packages = " ".join(shlex.quote(library) for library in sorted(set(libraries)))
+        dockerfile = f"FROM {DEFAULT_IMAGE_TAG}\nRUN pip install --no-cache-dir {packages}\n"
+        self.client.images.build(
+            fileobj=io.BytesIO(dockerfile.encode('utf-8')),
+            tag=tag,
+            rm=True,
+        )
 
-def _init_docker_container() -> docker.models.containers.Container:
-    current_path = os.getcwd()
-    client = docker.from_env()
+    def acquire(self, image: str) -> Any:
+        """Get a running container for `image`, reusing an idle one if there is one."""
+        key = (image, os.getcwd())
+        with self._lock:
+            for i, (idle_key, container) in enumerate(self._idle):
+                if idle_key == key:
+                    del self._idle[i]
+                    return container
+
+        container = self.client.containers.run(
+            image,
+            detach=True,
+            tty=True,
+            working_dir=WORKSPACE_DIR,
+            name=f"{CONTAINER_NAME}-{uuid.uuid4().hex[:12]}",
+            labels={CONTAINER_LABEL: "true"},
+            volumes={key[1]: {"bind": WORKSPACE_DIR, "mode": "rw"}},  # type: ignore
+        )
+        with self._lock:
+            self._keys[container.id] = key
+        return container
+
+    def release(self, container: Any) -> None:
+        """Reset a container and keep it for reuse, stopping the oldest idle container if the pool is full."""
+        try:
+            exit_code, _ = exec_streaming(self.client, container, RESET_COMMAND)
+        except Exception:
+            exit_code = -1
+        if exit_code != 0:
+            self.discard(container)
+            return
+
+        with self._lock:
+            self._idle.append((self._keys[container.id], container))
+            evicted = self._idle[: -self.size] if self.size > 0 else list(self._idle)
+            del self._idle[: len(evicted)]
+
+        for _, idle_container in evicted:
+            self.discard(idle_container)
+
+    def discard(self, container: Any) -> None:
+        """Stop and remove a container."""
+        with self._lock:
+            self._keys.pop(container.id, None)
+        try:
+            container.stop()
+            container.remove()
+        except docker.errors.APIError:
+            pass
+
+    def shutdown(self) -> None:
+        """Stop and remove all idle containers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, container in idle:
+            self.discard(container)
+
+
+def exec_streaming(
+    client: Any, container: Any, command: list[str], on_output: Optional[OutputCallback] = None
+) -> tuple[int, str]:
+    """
+    Run a command in a container, passing stdout and stderr to `on_output` as
+    they arrive. Returns the exit code and the combined output.
+    """
+    exec_id = client.api.exec_create(container.id, command, workdir=WORKSPACE_DIR)['Id']
+
+    # chunks can end part way through a multi-byte character
+    decoders = {stream: codecs.getincrementaldecoder('utf-8')(errors='replace') for stream in ('stdout', 'stderr')}
+    output = []
+    for stdout, stderr in client.api.exec_start(exec_id, stream=True, demux=True):
+        for stream, chunk in (('stdout', stdout), ('stderr', stderr)):
+            if not chunk:
+                continue
+            text = decoders[stream].decode(chunk)
+            output.append(text)
+            if on_output:
+                on_output(stream, text)
+
+    exit_code = client.api.exec_inspect(exec_id)['ExitCode']
+    return exit_code, "".join(output)
 
-    # kill container if it's already running
-    try:
-        existing_container = client.containers.get(CONTAINER_NAME)
-        existing_container.stop()
-        existing_container.remove()
-    except docker.errors.NotFound:
-        pass
-
-    return client.containers.run(
-        DEFAULT_IMAGE_TAG,
-        detach=True,
-        tty=True,
-        working_dir="/workspace",
-        name=CONTAINER_NAME,
-        volumes={current_path: {"bind": "/workspace", "mode": "rw"}},  # type: ignore
-    )
+
+_pool: Optional[ContainerPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ContainerPool:
+    """Get the shared container pool, connecting to Docker on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ContainerPool(docker.from_env())
+            atexit.register(_pool.shutdown)
+        return _pool
 
 
 def run_code(code: str, libraries_used: list[str]) -> str:
     """
     Run the code in a Docker container using Python 3.
 
-    The container will be built and started, the code will be executed, and the container will be stopped.
+    Containers are kept running between calls and libraries are installed into a cached image,
+    so repeated calls start quickly. Output is streamed as the code runs.
 
     Args:
         code: The code to be executed. ALWAYS PRINT the final result and the output of the code.
         libraries_used: A list of libraries to be installed in the container before running the code.
     """
-    _verify_docker_image()
-    container = _init_docker_container()
+    pool = _get_pool()
+    image = pool.get_image(libraries_used)
+    container = pool.acquire(image)
 
-    for library in libraries_used:
-        container.exec_run(f"pip install {library}")
-
-    result = container.exec_run(f'python3 -c "{code}"')
-    container.stop()
-    container.remove()
+    try:
+        exit_code, output = exec_streaming(pool.client, container, ["python3", "-c", code], on_output=_echo_output)
+    except Exception:
+        pool.discard(container)
+        raise
 
-    return f"exit code: {result.exit_code}\n" f"{result.output.decode('utf-8')}"
+    pool.release(container)
+    return f"exit code: {exit_code}\n" f"{output}"
@@ -1,19 +1,65 @@
 """Framework-agnostic implementation of composio tools."""
 
-import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 from composio import Action, ComposioToolSet
+from composio.client.collections import ConnectedAccountModel
 from composio.constants import DEFAULT_ENTITY_ID
 
+# Seconds an entity's list of connected accounts is reused before it is fetched again
+CONNECTED_ACCOUNTS_TTL = 300
+# Number of actions `execute_actions` runs at once
+MAX_CONCURRENT_ACTIONS = 8
 
-def _check_connected_account(app: str, toolset: ComposioToolSet) -> None:
-    """Check if connected account exists for the app."""
-    connections = toolset.client.connected_accounts.get()
-    if app not in [connection.appUniqueId for connection in connections]:
+_toolset: Optional[ComposioToolSet] = None
+_toolset_lock = threading.Lock()
+
+_connected_accounts: Dict[str, tuple[float, List[ConnectedAccountModel]]] = {}
+_connected_accounts_lock = threading.Lock()
+
+
+def _get_toolset() -> ComposioToolSet:
+    """Get the toolset shared by all composio tools in this process."""
+    global _toolset
+    with _toolset_lock:
+        if _toolset is None:
+            _toolset = ComposioToolSet()
+        return _toolset
+
+
+def _get_connected_accounts(entity_id: str, refresh: bool = False) -> List[ConnectedAccountModel]:
+    """Get the connected accounts of an entity, cached for `CONNECTED_ACCOUNTS_TTL` seconds."""
+    with _connected_accounts_lock:
+        cached = _connected_accounts.get(entity_id)
+        if cached and not refresh and time.monotonic() < cached[0]:
+            return cached[1]
+
+    accounts = _get_toolset().client.connected_accounts.get(entity_ids=[entity_id])
+    with _connected_accounts_lock:
+        _connected_accounts[entity_id] = (time.monotonic() + CONNECTED_ACCOUNTS_TTL, accounts)
+    return accounts
+
+
+def _check_connected_account(app: str, entity_id: str) -> str:
+    """Check if connected account exists for the app, and return its ID."""
+
+    def find_account(accounts: List[ConnectedAccountModel]) -> Optional[ConnectedAccountModel]:
+        matches = [account for account in accounts if account.appUniqueId == app]
+        # prefer an active account when an app has been connected more than once
+        return next((account for account in matches if account.status == "ACTIVE"), matches[0] if matches else None)
+
+    account = find_account(_get_connected_accounts(entity_id))
+    if account is None:
+        # the account may have been connected since the cache was filled
+        account = find_account(_get_connected_accounts(entity_id, refresh=True))
+    if account is None:
         raise RuntimeError(
             f"No connected account found for app `{app}`; " f"Run `composio add {app}` to fix this"
         )
+    return account.id
 
 
 def execute_action(
@@ -34,22 +80,64 @@ def execute_action(
     Returns:
         Dict containing the action result
     """
-    toolset = ComposioToolSet()
+    toolset = _get_toolset()
     action = Action(action_name)
+    entity_id = entity_id or DEFAULT_ENTITY_ID
 
+    connected_account_id = None
     if not no_auth:
-        _check_connected_account(action.app, toolset)
+        connected_account_id = _check_connected_account(action.app, entity_id)
 
     return toolset.execute_action(
         action=action,
         params=params,
-        entity_id=entity_id or DEFAULT_ENTITY_ID,
+        entity_id=entity_id,
+        connected_account_id=connected_account_id,
     )
 
 
+def execute_actions(actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Execute several independent composio actions at once.
+
+    Args:
+        actions: The actions to execute, each a dict with the `action_name` and
+            `params` to pass to `execute_action`, and optionally `entity_id` and `no_auth`
+
+    Returns:
+        List containing the result of each action, in the same order as `actions`.
+        An action that fails has a result with `successful` set to False and the `error`.
+    """
+
+    def execute(action: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return execute_action(
+                action_name=action["action_name"],
+                params=action.get("params", {}),
+                entity_id=action.get("entity_id"),
+                no_auth=action.get("no_auth", False),
+            )
+        except Exception as e:
+            return {"data": {}, "error": str(e), "successful": False}
+
+    if not actions:
+        return []
+
+    # fetch each entity's connected accounts once, rather than once per action running at the same time
+    entity_ids = [action.get("entity_id") or DEFAULT_ENTITY_ID for action in actions if not action.get("no_auth")]
+    for entity_id in dict.fromkeys(entity_ids):
+        try:
+            _get_connected_accounts(entity_id)
+        except Exception:
+            pass  # reported by the actions that need the accounts
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_ACTIONS, len(actions))) as executor:
+        return list(executor.map(execute, actions))
+
+
 def get_action_schema(action_name: str) -> Dict[str, Any]:
     """Get the schema for a composio action."""
-    toolset = ComposioToolSet()
+    toolset = _get_toolset()
     action = Action(action_name)
     (action_schema,) = toolset.get_action_schemas(actions=[action])
     return action_schema.model_dump(exclude_none=True)
@@ -60,7 +148,7 @@ def find_actions_by_use_case(
     use_case: str,
 ) -> List[Dict[str, Any]]:
     """Find actions by use case."""
-    toolset = ComposioToolSet()
+    toolset = _get_toolset()
     actions = toolset.find_actions_by_use_case(*apps, use_case=use_case)
     return [get_action_schema(action.name) for action in actions]
 
@@ -70,6 +158,6 @@ def find_actions_by_tags(
     tags: List[str],
 ) -> List[Dict[str, Any]]:
     """Find actions by tags."""
-    toolset = ComposioToolSet()
+    toolset = _get_toolset()
     actions = toolset.find_actions_by_tags(*apps, tags=tags)
     return [get_action_schema(action.name) for action in actions]
@@ -1,14 +1,285 @@
-"""Framework-agnostic directory search implementation using embedchain."""
+"""Framework-agnostic directory search implementation with a persistent local index.
+
+Files are split into chunks and stored in a SQLite index in the user's cache
+directory. The index remembers each file's mtime and size, so a search only
+reads and embeds files that changed since the last one. Queries combine a BM25
+ranking from SQLite's full-text search with embedding similarity.
+"""
 
 from typing import Optional
 from pathlib import Path
-from embedchain.loaders.directory_loader import DirectoryLoader
 import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from appdirs import user_cache_dir
+
+INDEX_DIR = Path(os.getenv('DIRECTORY_SEARCH_INDEX_DIR') or user_cache_dir('agentstack')) / 'directory_search'
+EMBEDDING_MODEL = os.getenv('DIRECTORY_SEARCH_EMBEDDING_MODEL') or 'text-embedding-3-small'
+
+CHUNK_SIZE = 1500  # characters
+CHUNK_OVERLAP = 200
+MAX_FILE_SIZE = 5 * 1024 * 1024
+# Searches within this many seconds of each other reuse the last directory scan.
+RESCAN_INTERVAL = 2.0
+EMBEDDING_BATCH_SIZE = 256
+NUM_RESULTS = 5
+# Results taken from each ranking before they are combined with reciprocal rank fusion.
+NUM_CANDIDATES = 50
+RRF_K = 60
+# Query embeddings kept in the index; the least recently used are dropped first.
+MAX_QUERY_EMBEDDINGS = 1000
+SKIP_DIRS = {'node_modules', '__pycache__', 'venv'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE IF NOT EXISTS chunks (id INTEGER PRIMARY KEY, path TEXT, content TEXT, embedding BLOB);
+CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(content);
+CREATE TABLE IF NOT EXISTS query_embeddings (query TEXT PRIMARY KEY, embedding BLOB);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_openai_client = None
+
+
+def _embed(texts: list[str]) -> Optional[np.ndarray]:
+    """
+    Embed texts as normalized float32 vectors. Returns None when no OpenAI API
+    key is configured or the request fails, in which case searches only use BM25.
+    """
+    global _openai_client
+    if not os.getenv('OPENAI_API_KEY'):
+        return None
+    if _openai_client is None:
+        from openai import OpenAI
+
+        _openai_client = OpenAI()
+
+    vectors = []
+    try:
+        for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            batch = texts[i : i + EMBEDDING_BATCH_SIZE]
+            response = _openai_client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
+            vectors.extend(item.embedding for item in response.data)
+    except Exception as e:
+        print(f"Failed to create embeddings, searching by keyword only: {e}")
+        return None
+    matrix = np.array(vectors, dtype=np.float32).reshape(len(texts), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _split_text(text: str) -> list[str]:
+    """Split text into overlapping chunks, preferring to break at line ends."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + CHUNK_SIZE)
+        if end < len(text):
+            newline = text.rfind('\n', start + CHUNK_OVERLAP, end)
+            if newline != -1:
+                end = newline + 1
+        chunk = text[start:end]
+        if chunk.strip():
+            chunks.append(chunk)
+        if end == len(text):
+            break
+        start = end - CHUNK_OVERLAP
+    return chunks
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """Read a file as text, or None for binary and undecodable files."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if b'\x00' in data[:8192]:
+        return None
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+
+def _fts_query(query: str) -> str:
+    """Match any of the words in the query without interpreting FTS5 syntax."""
+    return " OR ".join(f'"{word}"' for word in re.findall(r'\w+', query))
+
+
+class _DirectoryIndex:
+    """The persistent index for one directory, along with its embeddings loaded in memory."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        name = hashlib.sha256(str(directory).encode('utf-8')).hexdigest()[:16]
+        self.db = sqlite3.connect(INDEX_DIR / f"{name}.sqlite", check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.last_scan = 0.0
+        self.chunk_ids: Optional[np.ndarray] = None
+        self.vectors: Optional[np.ndarray] = None
+
+        # embeddings from a different model can't be compared with new ones
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'embedding_model'").fetchone()
+        if row is None or row[0] != EMBEDDING_MODEL:
+            with self.db:
+                self.db.execute("UPDATE chunks SET embedding = NULL")
+                self.db.execute("DELETE FROM query_embeddings")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('embedding_model', ?)", (EMBEDDING_MODEL,))
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        files = {}
+        for root, dirs, filenames in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS]
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if stat.st_size <= MAX_FILE_SIZE:
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def sync(self) -> None:
+        """Update the index with files that were added, changed or removed since the last scan."""
+        if time.monotonic() - self.last_scan < RESCAN_INTERVAL:
+            return
+
+        files = self._scan()
+        indexed = {path: (mtime_ns, size) for path, mtime_ns, size in self.db.execute("SELECT * FROM files")}
+        changed = [path for path, key in files.items() if indexed.get(path) != key]
+        removed = [path for path in indexed if path not in files]
+
+        with self.db:
+            for path in changed + removed:
+                self.db.execute(
+                    "DELETE FROM chunks_fts WHERE rowid IN (SELECT id FROM chunks WHERE path = ?)", (path,)
+                )
+                self.db.execute("DELETE FROM chunks WHERE path = ?", (path,))
+                self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+
+            for path in changed:
+                try:
+                    text = _read_text(Path(path))
+                except OSError:
+                    continue
+                for chunk in _split_text(text) if text else []:
+                    cursor = self.db.execute("INSERT INTO chunks (path, content) VALUES (?, ?)", (path, chunk))
+                    self.db.execute("INSERT INTO chunks_fts (rowid, content) VALUES (?, ?)", (cursor.lastrowid, chunk))
+                self.db.execute("INSERT INTO files VALUES (?, ?, ?)", (path, *files[path]))
+
+        embedded = self._embed_missing()
+        if changed or removed or embedded:
+            self.vectors = None
+        self.last_scan = time.monotonic()
+
+    def _embed_missing(self) -> bool:
+        missing = self.db.execute("SELECT id, content FROM chunks WHERE embedding IS NULL").fetchall()
+        if not missing:
+            return False
+        vectors = _embed([content for _, content in missing])
+        if vectors is None:
+            return False
+        with self.db:
+            self.db.executemany(
+                "UPDATE chunks SET embedding = ? WHERE id = ?",
+                [(vector.tobytes(), chunk_id) for (chunk_id, _), vector in zip(missing, vectors)],
+            )
+        return True
+
+    def _load_vectors(self) -> None:
+        rows = self.db.execute("SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL").fetchall()
+        self.chunk_ids = np.array([chunk_id for chunk_id, _ in rows], dtype=np.int64)
+        self.vectors = np.array(
+            [np.frombuffer(embedding, dtype=np.float32) for _, embedding in rows], dtype=np.float32
+        )
+
+    def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        row = self.db.execute("SELECT embedding FROM query_embeddings WHERE query = ?", (query,)).fetchone()
+        if row:
+            embedding = row[0]
+        else:
+            vectors = _embed([query])
+            if vectors is None:
+                return None
+            embedding = vectors[0].tobytes()
+
+        # rows are re-inserted on every use, so the lowest rowids are the least recently used
+        with self.db:
+            self.db.execute("DELETE FROM query_embeddings WHERE query = ?", (query,))
+            self.db.execute("INSERT INTO query_embeddings VALUES (?, ?)", (query, embedding))
+            self.db.execute(
+                "DELETE FROM query_embeddings WHERE rowid NOT IN "
+                "(SELECT rowid FROM query_embeddings ORDER BY rowid DESC LIMIT ?)",
+                (MAX_QUERY_EMBEDDINGS,),
+            )
+        return np.frombuffer(embedding, dtype=np.float32)
+
+    def _vector_ranking(self, query: str) -> list[int]:
+        if self.vectors is None:
+            self._load_vectors()
+        assert self.vectors is not None and self.chunk_ids is not None
+        if not len(self.vectors):
+            return []
+        query_vector = self._embed_query(query)
+        if query_vector is None:
+            return []
+        scores = self.vectors @ query_vector
+        top = np.argsort(-scores)[:NUM_CANDIDATES]
+        return [int(self.chunk_ids[i]) for i in top]
+
+    def _bm25_ranking(self, query: str) -> list[int]:
+        fts_query = _fts_query(query)
+        if not fts_query:
+            return []
+        rows = self.db.execute(
+            "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+            (fts_query, NUM_CANDIDATES),
+        )
+        return [chunk_id for chunk_id, in rows]
+
+    def search(self, query: str, num_results: int = NUM_RESULTS) -> list[tuple[str, str]]:
+        """Find the chunks most relevant to `query`, as (path, content) pairs."""
+        with self.lock:
+            self.sync()
+            scores: dict[int, float] = {}
+            for ranking in (self._bm25_ranking(query), self._vector_ranking(query)):
+                for rank, chunk_id in enumerate(ranking):
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + 1 / (RRF_K + rank + 1)
+
+            best = sorted(scores, key=scores.__getitem__, reverse=True)[:num_results]
+            results = []
+            for chunk_id in best:
+                path, content = self.db.execute("SELECT path, content FROM chunks WHERE id = ?", (chunk_id,)).fetchone()
+                results.append((path, content))
+            return results
+
+
+_indexes: dict[Path, _DirectoryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_index(directory: str) -> _DirectoryIndex:
+    path = Path(directory).resolve()
+    if not path.is_dir():
+        raise ValueError(f"{directory} is not a directory")
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = _DirectoryIndex(path)
+        return _indexes[path]
 
 
 def search_directory(directory: str, query: str) -> str:
     """
-    Search through files in a directory using embedchain's DirectoryLoader.
+    Search through files in a directory.
+
+    The directory is indexed on first use and only changed files are re-indexed
+    on later searches, so repeated searches of the same directory are fast.
 
     Args:
         directory: Path to directory to search
@@ -17,14 +288,17 @@ def search_directory(directory: str, query: str) -> str:
     Returns:
         str: Search results as a string
     """
-    loader = DirectoryLoader(config=dict(recursive=True))
-    results = loader.search(directory, query)
-    return str(results)
+    results = _get_index(directory).search(query)
+    if not results:
+        return f"No results found for {query} in {directory}"
+
+    root = Path(directory).resolve()
+    return "\n\n".join(f"{os.path.relpath(path, root)}:\n{content.strip()}" for path, content in results)
 
 
 def search_fixed_directory(query: str) -> str:
     """
-    Search through files in a preconfigured directory using embedchain's DirectoryLoader.
+    Search through files in a preconfigured directory.
     Uses DIRECTORY_SEARCH_TOOL_PATH environment variable.
 
     Args:
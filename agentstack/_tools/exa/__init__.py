@@ -1,10 +1,35 @@
 import os
+import time
+import threading
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from exa_py import Exa
+from agentstack.utils import RateLimiter
 
 # Check out our docs for more info! https://docs.exa.ai/
 
 API_KEY = os.getenv('EXA_API_KEY')
 
+# Seconds `search_and_contents_many` waits for all of its searches to finish
+TIMEOUT = 60
+# Number of searches `search_and_contents_many` runs at once
+MAX_CONCURRENT_SEARCHES = 5
+REQUESTS_PER_SECOND = 5
+
+_exa: Optional[Exa] = None
+_exa_lock = threading.Lock()
+
+
+def _get_exa() -> Exa:
+    global _exa
+    with _exa_lock:
+        if _exa is None:
+            _exa = Exa(api_key=API_KEY)
+        return _exa
+
+
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND * 60)
+
 
 def search_and_contents(question: str) -> str:
     """
@@ -14,9 +39,8 @@ def search_and_contents(question: str) -> str:
     Returns:
         Formatted string containing titles, URLs, and highlights from the search results
     """
-    exa = Exa(api_key=API_KEY)
-
-    response = exa.search_and_contents(
+    _rate_limiter.wait()
+    response = _get_exa().search_and_contents(
         question, type="neural", use_autoprompt=True, num_results=3, highlights=True
     )
 
@@ -30,3 +54,37 @@ def search_and_contents(question: str) -> str:
     )
 
     return parsedResult
+
+
+def search_and_contents_many(questions: list[str]) -> str:
+    """
+    Tool using Exa's Python SDK to run several semantic searches at once and return result highlights.
+    Args:
+        questions: The search queries or questions to find information about
+    Returns:
+        Formatted string with each question followed by its results, in the same format as `search_and_contents`
+    """
+    unique_questions = list(dict.fromkeys(questions))
+    if not unique_questions:
+        return 'No questions provided'
+
+    # the SDK doesn't take a timeout, so a stalled search is abandoned rather than waited on
+    executor = ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_SEARCHES, len(unique_questions)))
+    try:
+        futures = [executor.submit(search_and_contents, question) for question in unique_questions]
+        deadline = time.monotonic() + TIMEOUT
+        results = []
+        for question, future in zip(unique_questions, futures):
+            try:
+                results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+            except TimeoutError:
+                results.append(f'Search timed out after {TIMEOUT} seconds')
+            except Exception as e:
+                results.append(f'Search failed: {e}')
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return ''.join(
+        f'<Question id={idx}>{question}</Question>{result}'
+        for idx, (question, result) in enumerate(zip(unique_questions, results))
+    )
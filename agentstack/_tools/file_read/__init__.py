@@ -1,14 +1,115 @@
 """
 Framework-agnostic implementation of file reading functionality.
+
+Large files are read through `mmap`, so only the requested part of a file is
+loaded into memory. Line positions come from a sparse newline index which is
+built once per file and reused until the file changes.
 """
 
-from typing import Optional
+from typing import Iterator, Optional
 from pathlib import Path
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+import mmap
+import os
+import re
+import threading
+
+# Files larger than this are truncated by `read_file`; use the range functions to page through them.
+READ_FILE_MAX_BYTES = 1024 * 1024
+# Upper limit on the amount of text returned by any one call.
+MAX_RESULT_BYTES = 1024 * 1024
+# The newline index stores the number of lines before every chunk of this size.
+INDEX_CHUNK_SIZE = 1024 * 1024
+MAX_CACHED_INDEXES = 16
+
+
+class _LineIndex:
+    """
+    Sparse newline index for a mapped file.
+
+    `line_counts[i]` is the number of newlines before byte `i * INDEX_CHUNK_SIZE`,
+    so finding a line only needs to scan within a single chunk.
+    """
+
+    def __init__(self, buffer: mmap.mmap):
+        self.line_counts = [0]
+        for chunk_start in range(0, len(buffer), INDEX_CHUNK_SIZE):
+            chunk = buffer[chunk_start : chunk_start + INDEX_CHUNK_SIZE]
+            self.line_counts.append(self.line_counts[-1] + chunk.count(b'\n'))
+        self.size = len(buffer)
+
+    def line_start(self, buffer: mmap.mmap, line: int) -> int:
+        """Byte offset of the start of `line` (0-based), or the file size if past the end."""
+        if line <= 0:
+            return 0
+        if line > self.line_counts[-1]:
+            return self.size
+
+        # find the chunk containing the newline that ends line `line - 1`
+        chunk = bisect_left(self.line_counts, line) - 1
+        position = chunk * INDEX_CHUNK_SIZE
+        for _ in range(line - self.line_counts[chunk]):
+            position = buffer.find(b'\n', position) + 1
+        return position
+
+    def line_number(self, buffer: mmap.mmap, offset: int) -> int:
+        """The line (0-based) containing byte `offset`."""
+        chunk = offset // INDEX_CHUNK_SIZE
+        chunk_start = chunk * INDEX_CHUNK_SIZE
+        return self.line_counts[chunk] + buffer[chunk_start:offset].count(b'\n')
+
+
+_index_cache: OrderedDict[tuple[str, int, int], _LineIndex] = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def _get_line_index(path: Path, stat: os.stat_result, buffer: mmap.mmap) -> _LineIndex:
+    """Get the newline index for a file, building it if the file is new or has changed."""
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = _LineIndex(buffer)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > MAX_CACHED_INDEXES:
+            _index_cache.popitem(last=False)
+    return index
+
+
+@contextmanager
+def _map_file(file_path: str) -> Iterator[tuple[Path, os.stat_result, Optional[mmap.mmap]]]:
+    """Map a file read-only. Empty files can't be mapped, so they yield `None`."""
+    path = Path(file_path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"File not found at path {file_path}")
+    if not path.is_file():
+        raise IsADirectoryError(f"Path {file_path} is not a file")
+
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if stat.st_size == 0:
+            yield path, stat, None
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield path, stat, buffer
+
+
+def _decode(data: bytes) -> str:
+    return data[:MAX_RESULT_BYTES].decode("utf-8", errors="replace")
 
 
 def read_file(file_path: str) -> str:
     """Read contents of a file at the given path.
 
+    Files larger than 1 MB are truncated; use `read_file_lines`, `read_file_bytes`,
+    `head_file`, `tail_file` or `grep_file` to read parts of large files.
+
     Args:
         file_path: Path to the file to read
 
@@ -27,7 +128,153 @@ def read_file(file_path: str) -> str:
         if not path.is_file():
             return f"Error: Path {file_path} is not a file"
 
+        size = path.stat().st_size
+        if size > READ_FILE_MAX_BYTES:
+            with _map_file(file_path) as (_, _, buffer):
+                assert buffer is not None
+                content = _decode(buffer[:READ_FILE_MAX_BYTES])
+            return (
+                f"{content}\n\n[Truncated: showing the first {READ_FILE_MAX_BYTES} of {size} bytes. "
+                "Use read_file_lines, read_file_bytes, tail_file or grep_file to read the rest.]"
+            )
+
         with open(path, "r", encoding="utf-8") as file:
             return file.read()
     except (FileNotFoundError, PermissionError, Exception) as e:
         return f"Failed to read file {file_path}. Error: {str(e)}"
+
+
+def read_file_bytes(file_path: str, start: int, length: int = 4096) -> str:
+    """Read a range of bytes from a file, without loading the rest of the file.
+
+    Args:
+        file_path: Path to the file to read
+        start: Byte offset to start reading from; negative values count from the end of the file
+        length: Number of bytes to read (default: 4096, at most 1 MB)
+
+    Returns:
+        str: The bytes in the range decoded as UTF-8
+    """
+    try:
+        with _map_file(file_path) as (_, stat, buffer):
+            if buffer is None:
+                return ""
+            if start < 0:
+                start = max(0, stat.st_size + start)
+            return _decode(buffer[start : start + min(length, MAX_RESULT_BYTES)])
+    except Exception as e:
+        return f"Failed to read file {file_path}. Error: {str(e)}"
+
+
+def read_file_lines(file_path: str, start_line: int, num_lines: int = 100) -> str:
+    """Read a range of lines from a file, without loading the rest of the file.
+
+    Args:
+        file_path: Path to the file to read
+        start_line: Line to start reading from, starting at 1
+        num_lines: Number of lines to read (default: 100)
+
+    Returns:
+        str: The lines in the range
+    """
+    try:
+        with _map_file(file_path) as (path, stat, buffer):
+            if buffer is None:
+                return ""
+            index = _get_line_index(path, stat, buffer)
+            first_line = max(0, start_line - 1)
+            start = index.line_start(buffer, first_line)
+            end = index.line_start(buffer, first_line + max(0, num_lines))
+            return _decode(buffer[start:end])
+    except Exception as e:
+        return f"Failed to read file {file_path}. Error: {str(e)}"
+
+
+def head_file(file_path: str, num_lines: int = 20) -> str:
+    """Read the first lines of a file.
+
+    Args:
+        file_path: Path to the file to read
+        num_lines: Number of lines to read (default: 20)
+
+    Returns:
+        str: The first lines of the file
+    """
+    try:
+        with _map_file(file_path) as (_, _, buffer):
+            if buffer is None:
+                return ""
+            end = 0
+            for _ in range(num_lines):
+                end = buffer.find(b'\n', end) + 1
+                if end == 0:  # no more newlines; include the last line
+                    end = len(buffer)
+                    break
+            return _decode(buffer[:end])
+    except Exception as e:
+        return f"Failed to read file {file_path}. Error: {str(e)}"
+
+
+def tail_file(file_path: str, num_lines: int = 20) -> str:
+    """Read the last lines of a file.
+
+    Args:
+        file_path: Path to the file to read
+        num_lines: Number of lines to read (default: 20)
+
+    Returns:
+        str: The last lines of the file
+    """
+    try:
+        with _map_file(file_path) as (_, _, buffer):
+            if buffer is None or num_lines <= 0:
+                return ""
+            # a trailing newline ends the last line rather than starting a new one
+            position = len(buffer) - 1 if buffer[-1:] == b'\n' else len(buffer)
+            for _ in range(num_lines):
+                position = buffer.rfind(b'\n', 0, position)
+                if position == -1:
+                    break
+            return _decode(buffer[position + 1 :])
+    except Exception as e:
+        return f"Failed to read file {file_path}. Error: {str(e)}"
+
+
+def grep_file(file_path: str, pattern: str, max_matches: int = 50, ignore_case: bool = False) -> str:
+    """Search a file for lines matching a regular expression.
+
+    Args:
+        file_path: Path to the file to search
+        pattern: Regular expression to search for
+        max_matches: Maximum number of matching lines to return (default: 50)
+        ignore_case: Whether to ignore case when matching (default: False)
+
+    Returns:
+        str: Matching lines prefixed with their line number, like `12: matching line`
+    """
+    try:
+        regex = re.compile(pattern.encode("utf-8"), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        with _map_file(file_path) as (path, stat, buffer):
+            if buffer is None:
+                return f"No matches for {pattern} in {file_path}"
+            index = _get_line_index(path, stat, buffer)
+
+            results: list[str] = []
+            position = 0
+            while len(results) < max_matches and position <= len(buffer):
+                match = regex.search(buffer, position)
+                if match is None:
+                    break
+                line_start = buffer.rfind(b'\n', 0, match.start()) + 1
+                line_end = buffer.find(b'\n', match.start())
+                if line_end == -1:
+                    line_end = len(buffer)
+                line_number = index.line_number(buffer, line_start) + 1
+                results.append(f"{line_number}: {_decode(buffer[line_start:line_end]).rstrip()}")
+                position = line_end + 1  # one result per line
+
+            if not results:
+                return f"No matches for {pattern} in {file_path}"
+            return "\n".join(results)
+    except Exception as e:
+        return f"Failed to search file {file_path}. Error: {str(e)}"
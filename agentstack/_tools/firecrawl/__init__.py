@@ -1,8 +1,187 @@
+"""
+Firecrawl scraping and crawling.
+
+Crawls run in the background: `web_crawl` starts the crawl and returns right
+away, while a worker thread polls Firecrawl and appends pages to a local store
+as they complete. `retrieve_web_crawl` reads the stored pages from a cursor, so
+an agent can work through a crawl while it is still running.
+"""
+
+from typing import Any
+from pathlib import Path
 import os
+import json
+import time
+import threading
+import requests
+from appdirs import user_cache_dir
 from firecrawl import FirecrawlApp
 
 app = FirecrawlApp(api_key=os.getenv('FIRECRAWL_API_KEY'))
 
+CRAWL_DIR = Path(os.getenv('FIRECRAWL_CRAWL_DIR') or user_cache_dir('agentstack')) / 'firecrawl'
+CRAWL_LIMIT = 100
+# Polling starts fast and backs off while no new pages arrive.
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+POLL_BACKOFF = 1.5
+# A crawl is marked as failed after this many status checks fail in a row.
+MAX_POLL_ERRORS = 5
+REQUEST_TIMEOUT = (10, 60)
+# Upper limits on the pages returned by one call to `retrieve_web_crawl`.
+MAX_PAGES_PER_RETRIEVE = 10
+MAX_RETRIEVE_CHARS = 100_000
+FINISHED_STATUSES = {'completed', 'failed', 'cancelled'}
+
+
+class _CrawlStore:
+    """
+    The pages of one crawl, stored as JSON lines, and the crawl's status.
+    Pages are written before the status that counts them, so readers never see a partial page.
+    The status also records the size of the counted pages, so anything written after them
+    can be discarded before polling again.
+    """
+
+    def __init__(self, crawl_id: str):
+        self.path = CRAWL_DIR / crawl_id
+        self.pages_path = self.path / 'pages.jsonl'
+        self.state_path = self.path / 'state.json'
+
+    def exists(self) -> bool:
+        return self.state_path.exists()
+
+    def create(self, url: str) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.pages_path.touch()
+        self.write_state(
+            {'url': url, 'status': 'scraping', 'total': None, 'stored': 0, 'pages_size': 0, 'error': None}
+        )
+
+    def read_state(self) -> dict[str, Any]:
+        with open(self.state_path) as file:
+            return json.load(file)
+
+    def write_state(self, state: dict[str, Any]) -> None:
+        temp_path = self.state_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.state_path)
+
+    def append_pages(self, pages: list[dict]) -> int:
+        """Append pages to the store and return the new size of the pages file."""
+        with open(self.pages_path, 'ab') as file:
+            for page in pages:
+                file.write((json.dumps(page) + '\n').encode('utf-8'))
+            return file.tell()
+
+    def truncate_pages(self, size: int) -> None:
+        """Discard pages written after the first `size` bytes."""
+        os.truncate(self.pages_path, size)
+
+    def read_pages(self, cursor: int, count: int) -> list[dict]:
+        pages = []
+        with open(self.pages_path, encoding='utf-8') as file:
+            for i, line in enumerate(file):
+                if i >= cursor + count:
+                    break
+                if i >= cursor:
+                    pages.append(json.loads(line))
+        return pages
+
+
+def _page(document: dict) -> dict:
+    metadata = document.get('metadata') or {}
+    return {
+        'url': metadata.get('sourceURL') or metadata.get('url'),
+        'title': metadata.get('title'),
+        'markdown': document.get('markdown', ''),
+    }
+
+
+class _CrawlJob(threading.Thread):
+    """Polls a crawl until it finishes, storing each batch of completed pages as it arrives."""
+
+    def __init__(self, crawl_id: str, store: _CrawlStore):
+        super().__init__(name=f"firecrawl-{crawl_id}", daemon=True)
+        self.crawl_id = crawl_id
+        self.store = store
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f"Bearer {app.api_key}"})
+
+    def _fetch(self, skip: int) -> dict[str, Any]:
+        response = self.session.get(
+            f"{app.api_url}/v1/crawl/{self.crawl_id}", params={'skip': skip}, timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def poll(self) -> tuple[bool, bool]:
+        """Store any pages completed since the last poll. Returns (new pages stored, crawl finished)."""
+        state = self.store.read_state()
+        # pages past the ones counted were left by a failed poll or a process that exited
+        # before counting them; they are fetched again below
+        self.store.truncate_pages(state['pages_size'])
+        stored = state['stored']
+        while True:
+            # a status response only holds part of the data when there is a lot of it; `next` means there's more
+            status = self._fetch(stored)
+            pages = [_page(document) for document in status.get('data') or []]
+            pages_size = self.store.append_pages(pages)
+            stored += len(pages)
+            if not pages or not status.get('next'):
+                break
+
+        finished = status.get('status') in FINISHED_STATUSES
+        new_pages = stored > state['stored']
+        state.update(
+            status=status.get('status'),
+            total=status.get('total'),
+            stored=stored,
+            pages_size=pages_size,
+            error=status.get('error'),
+        )
+        self.store.write_state(state)
+        return new_pages, finished
+
+    def run(self) -> None:
+        interval = MIN_POLL_INTERVAL
+        errors = 0
+        try:
+            while True:
+                try:
+                    new_pages, finished = self.poll()
+                    errors = 0
+                except requests.RequestException as e:
+                    errors += 1
+                    if errors >= MAX_POLL_ERRORS:
+                        state = self.store.read_state()
+                        state.update(status='failed', error=f"Failed to check crawl status: {e}")
+                        self.store.write_state(state)
+                        return
+                    new_pages, finished = False, False
+
+                if finished:
+                    return
+                interval = MIN_POLL_INTERVAL if new_pages else min(MAX_POLL_INTERVAL, interval * POLL_BACKOFF)
+                time.sleep(interval)
+        finally:
+            self.session.close()
+            with _jobs_lock:
+                _jobs.pop(self.crawl_id, None)
+
+
+_jobs: dict[str, _CrawlJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def _ensure_polling(crawl_id: str, store: _CrawlStore) -> None:
+    """Poll an unfinished crawl, including crawls started by an earlier process."""
+    with _jobs_lock:
+        if crawl_id in _jobs or store.read_state()['status'] in FINISHED_STATUSES:
+            return
+        job = _jobs[crawl_id] = _CrawlJob(crawl_id, store)
+    job.start()
+
 
 def web_scrape(url: str):
     """
@@ -16,25 +195,55 @@ def web_scrape(url: str):
 def web_crawl(url: str):
     """
     Scrape a url and crawl through other links from that page, scraping their contents.
-    This tool returns a crawl_id that you will need to use after waiting for a period of time
-    to retrieve the final contents. You should attempt to accomplish another task while waiting
-    for the crawl to complete.
+    This tool returns a crawl_id right away, and the crawl continues in the background.
+    Use retrieve_web_crawl with the crawl_id to read pages as they are crawled; you can
+    work on another task while the crawl runs.
 
     Crawl will ignore sublinks of a page if they aren’t children of the url you provide.
     So, the website.com/other-parent/blog-1 wouldn’t be returned if you crawled website.com/blogs/.
     """
+    try:
+        response = app.async_crawl_url(url, params={'limit': CRAWL_LIMIT, 'scrapeOptions': {'formats': ['markdown']}})
+    except Exception as e:
+        return f"Failed to start crawl of {url}. Error: {str(e)}"
 
-    crawl_status = app.crawl_url(
-        url, params={'limit': 100, 'scrapeOptions': {'formats': ['markdown']}}, poll_interval=30
-    )
-
-    return crawl_status
+    crawl_id = response['id']
+    store = _CrawlStore(crawl_id)
+    store.create(url)
+    _ensure_polling(crawl_id, store)
+    return f"Started crawl {crawl_id} of {url}. Use retrieve_web_crawl with this crawl_id to read the crawled pages."
 
 
-def retrieve_web_crawl(crawl_id: str):
+def retrieve_web_crawl(crawl_id: str, cursor: int = 0):
     """
-    Retrieve the results of a previously started web crawl. Crawls take time to process
-    so be sure to only use this tool some time after initiating a crawl. The result
-    will tell you if the crawl is finished. If it is not, wait some more time then try again.
+    Retrieve pages from a previously started web crawl, starting at `cursor`. Pages are
+    available as soon as they are crawled, so you can read them while the crawl is running.
+    The result includes the crawl's status and a `next_cursor` to pass in to read the following
+    pages. If there are no new pages and the crawl isn't finished, do something else and try again later.
     """
-    return app.check_crawl_status(crawl_id)
+    store = _CrawlStore(crawl_id)
+    if not store.exists():
+        return f"No crawl found with id {crawl_id}. Start one with web_crawl."
+    _ensure_polling(crawl_id, store)
+
+    state = store.read_state()
+    # `stored` only counts pages that were completely written
+    count = max(0, min(MAX_PAGES_PER_RETRIEVE, state['stored'] - cursor))
+    pages = []
+    size = 0
+    for page in store.read_pages(cursor, count):
+        size += len(page['markdown'])
+        if pages and size > MAX_RETRIEVE_CHARS:
+            break
+        pages.append(page)
+
+    next_cursor = cursor + len(pages)
+    return json.dumps({
+        'status': state['status'],
+        'total': state['total'],
+        'stored': state['stored'],
+        'error': state['error'],
+        'pages': pages,
+        'next_cursor': next_cursor,
+        'done': state['status'] in FINISHED_STATUSES and next_cursor >= state['stored'],
+    }, indent=2)
@@ -1,11 +1,26 @@
 import os
-from ftplib import FTP
+import time
+import threading
+from ftplib import FTP, error_perm, error_temp
+from concurrent.futures import ThreadPoolExecutor
 
 HOST = os.getenv('FTP_HOST')
 USER = os.getenv('FTP_USER')
 PASSWORD = os.getenv("FTP_PASSWORD")
+PORT = int(os.getenv('FTP_PORT') or 21)
+MAX_WORKERS = int(os.getenv('FTP_MAX_WORKERS') or 4)
 PATH = '/'
 
+# Interrupted uploads of files at least this large are resumed from where the
+# server's copy ends instead of starting over.
+RESUME_MIN_SIZE = 1024 * 1024
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 1.0  # seconds, multiplied by the attempt number
+BLOCK_SIZE = 64 * 1024
+
+# errors that are worth reconnecting and trying again for
+RETRY_ERRORS = (error_temp, OSError, EOFError)
+
 
 if not HOST:
     raise Exception(
@@ -21,6 +36,99 @@ if not PASSWORD:
     )
 
 
+class _Sessions:
+    """
+    One logged-in FTP connection per worker thread, reused for every file the
+    worker uploads.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: list[FTP] = []
+
+    def get(self) -> FTP:
+        ftp = getattr(self._local, 'ftp', None)
+        if ftp is None:
+            assert HOST and USER and PASSWORD  # appease type checker
+            ftp = FTP()
+            ftp.connect(HOST, PORT)
+            ftp.login(user=USER, passwd=PASSWORD)
+            ftp.cwd(PATH)
+            ftp.voidcmd('TYPE I')  # binary mode, so SIZE reports bytes
+            print(f"Connected to FTP server: {HOST}")
+            self._local.ftp = ftp
+            with self._lock:
+                self._all.append(ftp)
+        return ftp
+
+    def reset(self) -> None:
+        """Drop this worker's connection so the next `get` reconnects."""
+        ftp = getattr(self._local, 'ftp', None)
+        self._local.ftp = None
+        if ftp is not None:
+            with self._lock:
+                self._all.remove(ftp)
+            ftp.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._all = self._all, []
+        for ftp in sessions:
+            try:
+                ftp.quit()
+            except Exception:
+                ftp.close()
+
+
+def _get_remote_size(ftp: FTP, name: str) -> int:
+    try:
+        return ftp.size(name) or 0
+    except error_perm:  # the file doesn't exist yet
+        return 0
+
+
+def _upload_file(sessions: _Sessions, file_path: str) -> int:
+    """Upload one file, reconnecting and resuming if the transfer is interrupted. Returns bytes sent."""
+    # Open the file in binary mode for reading
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        # bytes of the file this upload has sent; the server's copy is only
+        # resumed from if the data in it came from this upload
+        uploaded = 0
+
+        def on_block(block: bytes) -> None:
+            nonlocal uploaded
+            uploaded += len(block)
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                ftp = sessions.get()
+                offset = 0
+                if size >= RESUME_MIN_SIZE and uploaded:
+                    # the server may not have stored everything that was sent, but a
+                    # larger copy was written by someone else
+                    remote_size = _get_remote_size(ftp, file_path)
+                    if remote_size <= uploaded and remote_size < size:
+                        offset = remote_size
+                    if offset:
+                        print(f"Resuming upload of {file_path} at byte {offset}")
+
+                file.seek(offset)
+                uploaded = offset
+                ftp.storbinary(
+                    f'STOR {file_path}', file, blocksize=BLOCK_SIZE, callback=on_block, rest=offset or None
+                )
+                return size - offset
+            except RETRY_ERRORS as e:
+                sessions.reset()
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                print(f"Upload of {file_path} was interrupted ({e}), retrying")
+                time.sleep(RETRY_DELAY * attempt)
+    raise AssertionError("unreachable")
+
+
 def upload_files(file_paths: list[str]):
     """
     Upload a list of files to the FTP server.
@@ -31,29 +139,34 @@ def upload_files(file_paths: list[str]):
         bool: True if all files were uploaded successfully, False otherwise.
     """
 
-    assert HOST and USER and PASSWORD  # appease type checker
+    sessions = _Sessions()
+    start = time.perf_counter()
 
-    result = True
-    # Loop through each file path in the list
-    for file_path in file_paths:
-        # Establish FTP connection
-        with FTP(HOST) as ftp:
-            try:
-                # Login to the server
-                ftp.login(user=USER, passwd=PASSWORD)
-                print(f"Connected to FTP server: {HOST}")
+    def upload(file_path: str) -> int:
+        try:
+            file_start = time.perf_counter()
+            sent = _upload_file(sessions, file_path)
+            elapsed = time.perf_counter() - file_start
+            print(f"Successfully uploaded {file_path} to {PATH} ({_format_throughput(sent, elapsed)})")
+            return sent
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return -1
 
-                # Change to the desired directory on the server
-                ftp.cwd(PATH)
+    # Upload the files concurrently, each worker reusing its own connection
+    try:
+        workers = max(1, min(MAX_WORKERS, len(file_paths)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(upload, file_paths))
+    finally:
+        sessions.close()
 
-                # Open the file in binary mode for reading
-                with open(file_path, 'rb') as file:
-                    # Upload the file
-                    ftp.storbinary(f'STOR {file_path}', file)
-                    print(f"Successfully uploaded {file_path} to {PATH}")
+    uploaded = [sent for sent in results if sent >= 0]
+    elapsed = time.perf_counter() - start
+    print(f"Uploaded {len(uploaded)} of {len(file_paths)} files ({_format_throughput(sum(uploaded), elapsed)})")
+    return len(uploaded) == len(file_paths)
 
-            except Exception as e:
-                print(f"An error occurred: {e}")
-                result = False
 
-    return result
+def _format_throughput(num_bytes: int, seconds: float) -> str:
+    rate = num_bytes / seconds if seconds > 0 else 0
+    return f"{num_bytes / 1024 / 1024:.2f} MB in {seconds:.2f}s, {rate / 1024 / 1024:.2f} MB/s"
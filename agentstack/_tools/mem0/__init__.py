@@ -1,5 +1,9 @@
 import os
 import json
+import time
+import atexit
+import threading
+from typing import Optional
 from mem0 import MemoryClient
 
 # These functions can be extended by changing the user_id parameter
@@ -9,11 +13,107 @@ from mem0 import MemoryClient
 MEM0_API_KEY = os.getenv('MEM0_API_KEY')
 client = MemoryClient(api_key=MEM0_API_KEY)
 
+USER_ID = 'default'  # configure user
+
+# Writes are buffered and sent in the background, at most this many messages at a time
+FLUSH_BATCH_SIZE = 10
+# Seconds a write waits for more writes to batch with before it is sent
+FLUSH_INTERVAL = 2.0
+MAX_FLUSH_ATTEMPTS = 3
+RETRY_DELAY = 1.0
+# Seconds search results are reused for a repeated query
+READ_CACHE_TTL = 60
+
 # These tools will only save information about the user
 # "Potato is a vegetable" is not a memory
 # "My favorite food is potatoes" IS a memory
 
 
+class _WriteBuffer:
+    """
+    Collects memory writes and sends them to mem0 in batches from a background thread.
+    Flushes are serialized, so each user's messages are sent in the order they were written.
+    """
+
+    def __init__(self):
+        self.pending: dict[str, list[dict]] = {}
+        self.first_pending_time: Optional[float] = None
+        self.condition = threading.Condition()
+        self.flush_lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def add(self, user_id: str, message: dict) -> None:
+        with self.condition:
+            self.pending.setdefault(user_id, []).append(message)
+            if self.first_pending_time is None:
+                self.first_pending_time = time.monotonic()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="mem0-writes", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def _take(self, user_id: Optional[str]) -> dict[str, list[dict]]:
+        with self.condition:
+            if user_id is None:
+                batches, self.pending = self.pending, {}
+            else:
+                batches = {user_id: self.pending.pop(user_id)} if user_id in self.pending else {}
+            if not self.pending:
+                self.first_pending_time = None
+            return batches
+
+    def _send(self, user_id: str, messages: list[dict]) -> None:
+        for attempt in range(MAX_FLUSH_ATTEMPTS):
+            try:
+                client.add(messages, user_id=user_id)
+                return
+            except Exception as e:
+                if attempt + 1 == MAX_FLUSH_ATTEMPTS:
+                    print(f"Failed to write {len(messages)} memories for {user_id}: {e}")
+                    return
+                time.sleep(RETRY_DELAY * 2**attempt)
+
+    def flush(self, user_id: Optional[str] = None) -> None:
+        """Send pending writes, for one user or for everyone, and wait until they are sent."""
+        with self.flush_lock:
+            for batch_user_id, messages in self._take(user_id).items():
+                for i in range(0, len(messages), FLUSH_BATCH_SIZE):
+                    self._send(batch_user_id, messages[i : i + FLUSH_BATCH_SIZE])
+
+    def _flush_due(self) -> bool:
+        if self.first_pending_time is None:
+            return False
+        if sum(len(messages) for messages in self.pending.values()) >= FLUSH_BATCH_SIZE:
+            return True
+        return time.monotonic() >= self.first_pending_time + FLUSH_INTERVAL
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self._flush_due():
+                    timeout = None
+                    if self.first_pending_time is not None:
+                        timeout = max(0.0, self.first_pending_time + FLUSH_INTERVAL - time.monotonic())
+                    self.condition.wait(timeout)
+            self.flush()
+
+
+_write_buffer = _WriteBuffer()
+atexit.register(_write_buffer.flush)
+
+_read_cache: dict[tuple[str, str], tuple[float, str]] = {}
+# Counts each user's writes, so a search that overlaps a write isn't cached
+_write_counts: dict[str, int] = {}
+_read_cache_lock = threading.Lock()
+
+
+def _invalidate_reads(user_id: str) -> None:
+    with _read_cache_lock:
+        _write_counts[user_id] = _write_counts.get(user_id, 0) + 1
+        for key in [key for key in _read_cache if key[0] == user_id]:
+            del _read_cache[key]
+
+
 def write_to_memory(user_message: str) -> str:
     """
     Writes data to the memory store for a user. The tool will decide what
@@ -22,16 +122,34 @@ def write_to_memory(user_message: str) -> str:
     messages = [
         {"role": "user", "content": user_message},
     ]
-    result = client.add(messages, user_id='default')  # configure user
-    return json.dumps(result)
+    # saved in the background; reads wait for pending writes, so they are never missed
+    for message in messages:
+        _write_buffer.add(USER_ID, message)
+    _invalidate_reads(USER_ID)
+    return json.dumps({"status": "queued"})
 
 
 def read_from_memory(query: str) -> str:
     """
     Reads memories related to user based on a query.
     """
-    memories = client.search(query=query, user_id='default')
+    key = (USER_ID, query)
+    with _read_cache_lock:
+        cached = _read_cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        write_count = _write_counts.get(USER_ID, 0)
+
+    # includes writes the background thread is sending right now
+    _write_buffer.flush(USER_ID)
+
+    memories = client.search(query=query, user_id=USER_ID)
     if memories:
-        return "\n".join([mem['memory'] for mem in memories])
+        result = "\n".join([mem['memory'] for mem in memories])
     else:
-        return "No relevant memories found."
+        result = "No relevant memories found."
+
+    with _read_cache_lock:
+        if _write_counts.get(USER_ID, 0) == write_count:
+            _read_cache[key] = (time.monotonic() + READ_CACHE_TTL, result)
+    return result
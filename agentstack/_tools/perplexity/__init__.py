@@ -1,17 +1,46 @@
 import os
+import threading
 import requests
+from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from agentstack.utils import RateLimiter
 
 
 url = "https://api.perplexity.ai/chat/completions"
 api_key = os.getenv("PERPLEXITY_API_KEY")
 
+# (connect, read) timeouts in seconds; online models can take a while to answer
+TIMEOUT = (10, 120)
+# Number of queries `query_perplexity_many` sends at once
+MAX_CONCURRENT_QUERIES = 5
+# Queries are started no faster than this; set it to your account's rate limit
+REQUESTS_PER_MINUTE = int(os.getenv("PERPLEXITY_REQUESTS_PER_MINUTE") or 50)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Get the shared session, which keeps connections to the API open between queries."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_maxsize=MAX_CONCURRENT_QUERIES))
+            _session.headers.update({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+        return _session
+
+
+_rate_limiter = RateLimiter(REQUESTS_PER_MINUTE)
+
 
 def query_perplexity(query: str):
     """
     Use Perplexity to concisely search the internet and answer a query with up-to-date information.
     """
 
-    payload = {
+    payload: dict[str, Any] = {
         "model": "llama-3.1-sonar-small-128k-online",
         "messages": [
             {"role": "system", "content": "Be precise and concise."},
@@ -30,11 +59,40 @@ def query_perplexity(query: str):
         "presence_penalty": 0,
         "frequency_penalty": 1,
     }
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
-    response = requests.request("POST", url, json=payload, headers=headers)
+    _rate_limiter.wait()
+    try:
+        response = _get_session().post(url, json=payload, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Request failed - {e}")
+        return "Failed to query perplexity"
+
     if response.status_code == 200 and response.text:
         return response.text
     else:
         print(f"{response.status_code} - {response.text}")
         return "Failed to query perplexity"
+
+
+def query_perplexity_many(queries: list[str]) -> str:
+    """
+    Use Perplexity to answer several queries at once with up-to-date information from the internet.
+
+    Queries run side by side, but each one still waits for its turn under the
+    REQUESTS_PER_MINUTE limit. At the default of 50 a query starts every 1.2
+    seconds, so large batches are bound by the rate limit rather than latency.
+
+    Args:
+        queries: The queries to answer
+
+    Returns:
+        str: The answer to each query in the same format as `query_perplexity`, headed by the query
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    if not unique_queries:
+        return "No queries provided"
+
+    workers = min(MAX_CONCURRENT_QUERIES, len(unique_queries))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        answers = list(executor.map(query_perplexity, unique_queries))
+    return "\n\n".join(f"{query}:\n{answer}" for query, answer in zip(unique_queries, answers))
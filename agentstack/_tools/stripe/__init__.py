@@ -1,5 +1,9 @@
-from typing import Callable, Optional
+from typing import Any, Callable, Iterator, Optional
 import os, sys
+import json
+import time
+import threading
+import stripe
 from stripe_agent_toolkit.configuration import Configuration, is_tool_allowed
 from stripe_agent_toolkit.api import StripeAPI
 from stripe_agent_toolkit.tools import tools
@@ -10,8 +14,17 @@ __all__ = [
     "list_products",
     "create_price",
     "list_prices",
+    "list_all_products",
+    "list_all_prices",
 ]
 
+# Number of objects fetched per request when paging through a list
+PAGE_SIZE = 100
+# Number of objects returned by one call to a `list_all_*` tool
+MAX_LIST_RESULTS = 100
+# Seconds the catalog snapshot is reused before it is fetched again
+CATALOG_TTL = 300
+
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
 
 if not STRIPE_SECRET_KEY:
@@ -60,7 +73,10 @@ def _create_tool_function(tool: dict) -> Callable:
 
     def func(**kwargs) -> str:
         validated_data = schema(**kwargs)
-        return client.run(tool['method'], **validated_data.dict(exclude_unset=True))
+        result = client.run(tool['method'], **validated_data.dict(exclude_unset=True))
+        if tool['method'].startswith('create_'):
+            invalidate_catalog()
+        return result
 
     func.__name__ = tool['method']
     func.__doc__ = f"{tool['name']}: \n{tool['description']}"
@@ -71,6 +87,116 @@ def _create_tool_function(tool: dict) -> Callable:
     return func
 
 
+def _request_options() -> dict[str, Any]:
+    # the key is passed with each request rather than relying on the global `stripe.api_key`
+    options: dict[str, Any] = {"api_key": STRIPE_SECRET_KEY}
+    context = _configuration.get('context') or {}
+    if context.get("account"):
+        options["stripe_account"] = context["account"]
+    return options
+
+
+def iter_products(**params: Any) -> Iterator[stripe.Product]:
+    """
+    Iterate over all products, fetching them a page at a time so only one page is held in memory.
+    `params` are passed on to `stripe.Product.list`.
+    """
+    products = stripe.Product.list(limit=PAGE_SIZE, **params, **_request_options())
+    yield from products.auto_paging_iter()
+
+
+def iter_prices(product: Optional[str] = None, **params: Any) -> Iterator[stripe.Price]:
+    """
+    Iterate over all prices, or the prices of one product, fetching them a page at a time.
+    `params` are passed on to `stripe.Price.list`.
+    """
+    if product:
+        params["product"] = product
+    prices = stripe.Price.list(limit=PAGE_SIZE, **params, **_request_options())
+    yield from prices.auto_paging_iter()
+
+
+class _CatalogSnapshot:
+    """All products and prices, fetched on first use and kept for `CATALOG_TTL` seconds."""
+
+    def __init__(self):
+        self.lists: dict[str, tuple[float, list]] = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, name: str, fetch: Callable[[], Iterator]) -> list:
+        with self.lock:
+            cached = self.lists.get(name)
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+            generation = self.generation
+
+        objects = list(fetch())
+        with self.lock:
+            # a create while fetching may have been missed, so don't keep this copy
+            if generation == self.generation:
+                self.lists[name] = (time.monotonic() + CATALOG_TTL, objects)
+        return objects
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.generation += 1
+            self.lists.clear()
+
+
+_catalog = _CatalogSnapshot()
+
+
+def invalidate_catalog() -> None:
+    """Discard the catalog snapshot. Called after every `create_*` tool, and by anything else that changes the catalog."""
+    _catalog.invalidate()
+
+
+def _list_page(objects: list, starting_after: Optional[str]) -> str:
+    """Up to `MAX_LIST_RESULTS` of `objects` following the one with ID `starting_after`."""
+    start = 0
+    if starting_after:
+        start = next((i + 1 for i, obj in enumerate(objects) if obj["id"] == starting_after), -1)
+        if start == -1:
+            return f"No object with ID {starting_after} in the catalog. List again without starting_after."
+
+    page = objects[start : start + MAX_LIST_RESULTS]
+    has_more = start + len(page) < len(objects)
+    return json.dumps(
+        {"data": page, "has_more": has_more, "next_starting_after": page[-1]["id"] if has_more else None},
+        # newer versions of `stripe` no longer make objects subclasses of dict
+        default=lambda obj: obj.to_dict(),
+    )
+
+
+def list_all_products(starting_after: Optional[str] = None) -> str:
+    """
+    List all products in the catalog, a page at a time. If `has_more` is true, call again with
+    `starting_after` set to `next_starting_after` to get the next page.
+    Results come from a snapshot of the catalog which is refreshed every few minutes and after creating anything.
+
+    Args:
+        starting_after: The ID of the last product on the previous page (optional)
+    """
+    return _list_page(_catalog.get("products", iter_products), starting_after)
+
+
+def list_all_prices(product: Optional[str] = None, starting_after: Optional[str] = None) -> str:
+    """
+    List all prices in the catalog, or only the prices of one product, a page at a time. If `has_more`
+    is true, call again with `starting_after` set to `next_starting_after` to get the next page.
+    Results come from a snapshot of the catalog which is refreshed every few minutes and after creating anything.
+
+    Args:
+        product: The ID of the product to list prices for (optional)
+        starting_after: The ID of the last price on the previous page (optional)
+    """
+    prices = _catalog.get("prices", iter_prices)
+    if product:
+        prices = [price for price in prices if price["product"] == product]
+    return _list_page(prices, starting_after)
+
+
 # Dynamically create tool functions based on the configuration and add them to the module.
 for tool in tools:
     if not is_tool_allowed(tool, _configuration):
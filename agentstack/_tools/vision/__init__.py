@@ -1,70 +1,174 @@
-"""Vision tool for analyzing images using OpenAI's Vision API."""
+"""
+Vision tool for analyzing images using OpenAI's Vision API.
+
+Local images are downscaled to the size the API tiles them at before they are
+uploaded, so larger images don't cost more bandwidth without adding detail.
+Analyses are cached by the image's content hash and the prompt, and batches of
+images are analyzed concurrently within a request rate limit.
+"""
 
-import base64
 from typing import Optional
-import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import io
+import base64
+import hashlib
+import threading
+from PIL import Image, ImageOps
 from openai import OpenAI
+from agentstack.utils import RateLimiter
 
-__all__ = ["analyze_image"]
+__all__ = ["analyze_image", "analyze_images"]
 
+MODEL = "gpt-4-vision-preview"
+MAX_TOKENS = 300
+# The API fits high detail images within 2048x2048 and then scales the short
+# side down to 768px before splitting them into 512px tiles.
+MAX_DIMENSION = 2048
+MAX_SHORT_SIDE = 768
+JPEG_QUALITY = 85
+# Formats the API accepts as they are; anything else is re-encoded.
+UPLOAD_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp", "GIF": "image/gif"}
+ORIENTATION_TAG = 0x0112
+MAX_CACHED_ANALYSES = 256
+MAX_CONCURRENT_REQUESTS = 4
+REQUESTS_PER_MINUTE = 60
 
-def analyze_image(image_path_url: str) -> str:
-    """
-    Analyze an image using OpenAI's Vision API.
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
 
-    Args:
-        image_path_url: Local path or URL to the image
+_analysis_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_analysis_cache_lock = threading.Lock()
 
-    Returns:
-        str: Description of the image contents
+
+def _get_client() -> OpenAI:
+    """Get the shared client, which reads OPENAI_API_KEY and OPENAI_BASE_URL on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI()
+        return _client
+
+
+_rate_limiter = RateLimiter(REQUESTS_PER_MINUTE)
+
+
+def _is_url(image_path_url: str) -> bool:
+    return image_path_url.startswith(("http://", "https://"))
+
+
+def _prepare_image(data: bytes) -> tuple[bytes, str]:
     """
-    client = OpenAI()
+    Downscale an image to the largest size the API would use, re-encoding it if
+    it was resized or isn't in a format the API accepts. Returns the image and its mime type.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        rotated = original.getexif().get(ORIENTATION_TAG, 1) != 1
+        width, height = original.size
+        scale = min(1.0, MAX_DIMENSION / max(width, height), MAX_SHORT_SIDE / min(width, height))
+        if scale == 1.0 and not rotated and original.format in UPLOAD_FORMATS:
+            return data, UPLOAD_FORMATS[original.format]
 
-    if not image_path_url:
-        return "Image Path or URL is required."
+        image = ImageOps.exif_transpose(original) if rotated else original
+        width, height = image.size
 
-    if "http" in image_path_url:
-        return _analyze_web_image(client, image_path_url)
-    return _analyze_local_image(client, image_path_url)
+        if scale < 1.0:
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = image.resize(size, Image.Resampling.LANCZOS)
 
+        output = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            # keep transparency, which JPEG can't store
+            image.save(output, format="PNG", optimize=True)
+            return output.getvalue(), "image/png"
+        image.convert("RGB").save(output, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+        return output.getvalue(), "image/jpeg"
 
-def _analyze_web_image(client: OpenAI, image_path_url: str) -> str:
-    response = client.chat.completions.create(
-        model="gpt-4-vision-preview",
+
+def _request_analysis(image_url: str, prompt: str) -> str:
+    _rate_limiter.wait()
+    response = _get_client().chat.completions.create(
+        model=MODEL,
         messages=[
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": "What's in this image?"},
-                    {"type": "image_url", "image_url": {"url": image_path_url}},
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": image_url}},
                 ],
             }
         ],
-        max_tokens=300,
+        max_tokens=MAX_TOKENS,
     )
-    return response.choices[0].message.content  # type: ignore[return-value]
+    return response.choices[0].message.content or ""
 
 
-def _analyze_local_image(client: OpenAI, image_path: str) -> str:
-    base64_image = _encode_image(image_path)
-    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {client.api_key}"}
-    payload = {
-        "model": "gpt-4-vision-preview",
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": "What's in this image?"},
-                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}},
-                ],
-            }
-        ],
-        "max_tokens": 300,
-    }
-    response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-    return response.json()["choices"][0]["message"]["content"]
+def _analyze(image_path_url: str, prompt: str) -> str:
+    """Analyze an image, reusing the analysis of an identical image with the same prompt."""
+    if _is_url(image_path_url):
+        # remote images are fetched by the API, so they're cached by URL
+        key = (image_path_url, prompt, MODEL)
+        data = None
+    else:
+        with open(image_path_url, "rb") as image_file:
+            data = image_file.read()
+        key = (hashlib.sha256(data).hexdigest(), prompt, MODEL)
+
+    with _analysis_cache_lock:
+        if key in _analysis_cache:
+            _analysis_cache.move_to_end(key)
+            return _analysis_cache[key]
+
+    if data is None:
+        image_url = image_path_url
+    else:
+        image, mime_type = _prepare_image(data)
+        image_url = f"data:{mime_type};base64,{base64.b64encode(image).decode('utf-8')}"
+    analysis = _request_analysis(image_url, prompt)
+
+    with _analysis_cache_lock:
+        _analysis_cache[key] = analysis
+        while len(_analysis_cache) > MAX_CACHED_ANALYSES:
+            _analysis_cache.popitem(last=False)
+    return analysis
 
 
-def _encode_image(image_path: str) -> str:
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
+def analyze_image(image_path_url: str, prompt: str = "What's in this image?") -> str:
+    """
+    Analyze an image using OpenAI's Vision API.
+
+    Args:
+        image_path_url: Local path or URL to the image
+        prompt: Question or instruction about the image (default: "What's in this image?")
+
+    Returns:
+        str: Description of the image contents
+    """
+    if not image_path_url:
+        return "Image Path or URL is required."
+
+    try:
+        return _analyze(image_path_url, prompt)
+    except Exception as e:
+        return f"Failed to analyze image {image_path_url}. Error: {str(e)}"
+
+
+def analyze_images(image_paths_urls: list[str], prompt: str = "What's in this image?") -> str:
+    """
+    Analyze several images at once using OpenAI's Vision API.
+
+    Args:
+        image_paths_urls: Local paths or URLs of the images
+        prompt: Question or instruction asked about each image (default: "What's in this image?")
+
+    Returns:
+        str: The description of each image, headed by its path or URL
+    """
+    if not image_paths_urls:
+        return "Image Paths or URLs are required."
+
+    unique = list(dict.fromkeys(image_paths_urls))
+    workers = max(1, min(MAX_CONCURRENT_REQUESTS, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        analyses = list(executor.map(lambda image: analyze_image(image, prompt), unique))
+    return "\n\n".join(f"{image}:\n{analysis}" for image, analysis in zip(unique, analyses))
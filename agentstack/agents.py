@@ -7,6 +7,7 @@ from ruamel.yaml.scalarstring import FoldedScalarString
 from agentstack import conf, log
 from agentstack import frameworks
 from agentstack.exceptions import ValidationError
+from agentstack.utils import load_yaml_snapshot, invalidate_yaml_snapshot
 
 
 AGENTS_FILENAME: Path = Path("src/config/agents.yaml")
@@ -56,8 +57,7 @@ class AgentConfig(pydantic.BaseModel):
             filename.touch()
 
         try:
-            with open(filename, 'r') as f:
-                data = yaml.load(f) or {}
+            data = load_yaml_snapshot(filename) or {}
             data = data.get(name, {}) or {}
             super().__init__(**{**{'name': name}, **data})
         except YAMLError as e:
@@ -105,6 +105,7 @@ class AgentConfig(pydantic.BaseModel):
 
         with open(filename, 'w') as f:
             yaml.dump(data, f)
+        invalidate_yaml_snapshot(filename)
 
     def __enter__(self) -> 'AgentConfig':
         return self
@@ -118,8 +119,7 @@ def get_all_agent_names() -> list[str]:
     if not os.path.exists(filename):
         log.debug(f"Project does not have an {AGENTS_FILENAME} file.")
         return []
-    with open(filename, 'r') as f:
-        data = yaml.load(f) or {}
+    data = load_yaml_snapshot(filename) or {}
     return list(data.keys())
 
 
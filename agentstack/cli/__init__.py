@@ -1,7 +1,32 @@
-from .cli import configure_default_model, welcome_message, get_validated_input
-from .init import init_project
-from .wizard import run_wizard
-from .run import run_project
-from .tools import list_tools, add_tool
-from .templates import insert_template, export_template
+from typing import TYPE_CHECKING, Any
+from importlib import import_module
 
+if TYPE_CHECKING:
+    from .cli import configure_default_model, welcome_message, get_validated_input
+    from .init import init_project
+    from .wizard import run_wizard
+    from .run import run_project
+    from .tools import list_tools, add_tool
+    from .templates import insert_template, export_template
+
+# Commands are imported on first access so the CLI only loads what it runs.
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    'configure_default_model': '.cli',
+    'welcome_message': '.cli',
+    'get_validated_input': '.cli',
+    'init_project': '.init',
+    'run_wizard': '.wizard',
+    'run_project': '.run',
+    'list_tools': '.tools',
+    'add_tool': '.tools',
+    'insert_template': '.templates',
+    'export_template': '.templates',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
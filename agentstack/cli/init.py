@@ -1,4 +1,5 @@
 import os, sys
+import time
 from typing import Optional
 from pathlib import Path
 
@@ -46,6 +47,7 @@ def init_project(
     - install dependencies
     - insert Tasks, Agents and Tools
     """
+    start_time = time.perf_counter()
     require_uv()
 
     # TODO prevent the user from passing the --path argument to init
@@ -93,15 +95,18 @@ def init_project(
     # now we can interact with the project and add Agents, Tasks, and Tools
     # we allow dependencies to be installed along with these, so the project must
     # be fully initialized first.
-    for task in template_data.tasks:
-        generation.add_task(**task.model_dump())
+    # dependencies for all agents and tools are resolved with a single `uv add`.
+    with packaging.batch_install():
+        for task in template_data.tasks:
+            generation.add_task(**task.model_dump())
 
-    for agent in template_data.agents:
-        generation.add_agent(**agent.model_dump())
+        for agent in template_data.agents:
+            generation.add_agent(**agent.model_dump())
 
-    for tool in template_data.tools:
-        generation.add_tool(**tool.model_dump())
+        for tool in template_data.tools:
+            generation.add_tool(**tool.model_dump())
 
+    log.info(f"Project initialized in {time.perf_counter() - start_time:.1f}s")
     log.success("🚀 AgentStack project generated successfully!\n")
     log.info(
         "  To get started, activate the virtual environment with:\n"
@@ -58,6 +58,18 @@ class FrameworkModule(Protocol):
         """
         ...
 
+    def add_tool_to_agents(self, tool: ToolConfig, agent_names: list[str]) -> None:
+        """
+        Add a tool to each of the agents in the user's project in a single edit.
+        """
+        ...
+
+    def remove_tool_from_agents(self, tool: ToolConfig, agent_names: list[str]) -> None:
+        """
+        Remove a tool from each of the agents in the user's project in a single edit.
+        """
+        ...
+
     def get_tool_callables(self, tool_name: str) -> list[Callable]:
         """
         Get a tool by name and return it as a list of framework-native callables.
@@ -148,6 +160,21 @@ def remove_tool(tool: ToolConfig, agent_name: str):
     return get_framework_module(get_framework()).remove_tool(tool, agent_name)
 
 
+def add_tool_to_agents(tool: ToolConfig, agent_names: list[str]):
+    """
+    Add a tool to each of the specified agents in the user's project.
+    The entrypoint is read, edited and written once for all of the agents.
+    """
+    return get_framework_module(get_framework()).add_tool_to_agents(tool, agent_names)
+
+
+def remove_tool_from_agents(tool: ToolConfig, agent_names: list[str]):
+    """
+    Remove a tool from each of the specified agents in the user's project.
+    """
+    return get_framework_module(get_framework()).remove_tool_from_agents(tool, agent_names)
+
+
 def get_tool_callables(tool_name: str) -> list[Callable]:
     """
     Get a tool by name and return it as a list of framework-native callables.
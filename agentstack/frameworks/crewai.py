@@ -302,6 +302,26 @@ def remove_tool(tool: ToolConfig, agent_name: str):
         crew_file.remove_agent_tools(agent_name, tool)
 
 
+def add_tool_to_agents(tool: ToolConfig, agent_names: list[str]):
+    """
+    Add a tool to the CrewAI entrypoint for each of the specified agents.
+    The agents should already exist in the crew class and have a keyword argument `tools`.
+    All edits are made in one batch so the entrypoint is only parsed once.
+    """
+    with CrewFile(conf.PATH / ENTRYPOINT) as crew_file, crew_file.batch():
+        for agent_name in dict.fromkeys(agent_names):
+            crew_file.add_agent_tools(agent_name, tool)
+
+
+def remove_tool_from_agents(tool: ToolConfig, agent_names: list[str]):
+    """
+    Remove a tool from the CrewAI entrypoint for each of the specified agents.
+    """
+    with CrewFile(conf.PATH / ENTRYPOINT) as crew_file, crew_file.batch():
+        for agent_name in dict.fromkeys(agent_names):
+            crew_file.remove_agent_tools(agent_name, tool)
+
+
 def get_tool_callables(tool_name: str) -> list[Callable]:
     """
     Get a tool implementations for use directly by a CrewAI agent.
@@ -332,7 +352,7 @@ def get_tool_callables(tool_name: str) -> list[Callable]:
     tool_funcs = []
     tool_config = ToolConfig.from_tool_name(tool_name)
     for tool_func_name in tool_config.tools:
-        tool_func = getattr(tool_config.module, tool_func_name)
+        tool_func = getattr(tool_config.lazy_module, tool_func_name)
 
         assert callable(tool_func), f"Tool function {tool_func_name} is not callable."
         assert tool_func.__doc__, f"Tool function {tool_func_name} is missing a docstring."
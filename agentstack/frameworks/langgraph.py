@@ -283,21 +283,23 @@ class LangGraphFile(asttools.File):
             agent_class_name = PROVIDERS[agent_conf.provider].class_name
             agent_instantiation = asttools.find_method_calls(method, agent_class_name)[0]
             _, pos = self.get_node_range(agent_instantiation)
+            # the tool is rendered into the new call directly, so this also works
+            # inside of a `batch` where the new call can't be looked up yet.
+            tools_node = ast.List(elts=[asttools.create_tool_node(tool.name)], ctx=ast.Load())
             # TODO we could dynamically find the Agent variable name
-            code = """
-        agent = agent.bind_tools([])"""
+            code = f"""
+        agent = agent.bind_tools({asttools.render_node(tools_node)})"""
             self.edit_node_range(pos, pos, code)
+        else:
+            existing_node: ast.List = self.get_agent_tools(agent_name)
+            existing_elts: list[ast.expr] = existing_node.elts
 
-        existing_node: ast.List = self.get_agent_tools(agent_name)
-        existing_elts: list[ast.expr] = existing_node.elts
-
-        new_tool_nodes: list[ast.expr] = []
-        if not tool.name in self.get_agent_tool_names(agent_name):
-            existing_elts.append(asttools.create_tool_node(tool.name))
+            if not tool.name in self.get_agent_tool_names(agent_name):
+                existing_elts.append(asttools.create_tool_node(tool.name))
 
-        new_node = ast.List(elts=existing_elts, ctx=ast.Load())
-        start, end = self.get_node_range(existing_node)
-        self.edit_node_range(start, end, new_node)
+            new_node = ast.List(elts=existing_elts, ctx=ast.Load())
+            start, end = self.get_node_range(existing_node)
+            self.edit_node_range(start, end, new_node)
 
         # add the tool to the global tools list
         existing_global_node: ast.List = self.get_global_tools()
@@ -745,6 +747,26 @@ def remove_tool(tool: ToolConfig, agent_name: str):
         entrypoint.remove_agent_tools(agent_name, tool)
 
 
+def add_tool_to_agents(tool: ToolConfig, agent_names: list[str]):
+    """
+    Add a tool to the LangGraph entrypoint for each of the specified agents.
+    The agents should already exist in the base class.
+    All edits are made in one batch so the entrypoint is only parsed once.
+    """
+    with LangGraphFile(conf.PATH / ENTRYPOINT) as entrypoint, entrypoint.batch():
+        for agent_name in dict.fromkeys(agent_names):
+            entrypoint.add_agent_tools(agent_name, tool)
+
+
+def remove_tool_from_agents(tool: ToolConfig, agent_names: list[str]):
+    """
+    Remove a tool from the LangGraph entrypoint for each of the specified agents.
+    """
+    with LangGraphFile(conf.PATH / ENTRYPOINT) as entrypoint, entrypoint.batch():
+        for agent_name in dict.fromkeys(agent_names):
+            entrypoint.remove_agent_tools(agent_name, tool)
+
+
 def get_tool_callables(tool_name: str) -> list[Callable]:
     """
     Get a tool by name and return it as a list of framework-native callables.
@@ -767,7 +789,7 @@ def get_tool_callables(tool_name: str) -> list[Callable]:
         return wrapped_method
 
     for tool_func_name in tool_config.tools:
-        tool_func = getattr(tool_config.module, tool_func_name)
+        tool_func = getattr(tool_config.lazy_module, tool_func_name)
 
         assert callable(tool_func), f"Tool function {tool_func_name} is not callable."
         assert tool_func.__doc__, f"Tool function {tool_func_name} is missing a docstring."
@@ -9,8 +9,9 @@ unwieldy, but since our use-cases are well-defined, we can provide a set of
 functions that are useful for the specific tasks we need to accomplish.
 """
 
-from typing import TypeVar, Optional, Union, Iterable, Any
+from typing import TypeVar, Optional, Union, Iterable, Iterator, Any
 from pathlib import Path
+from contextlib import contextmanager
 import re
 import ast
 import astor
@@ -40,12 +41,21 @@ class File:
 
     In cases where we are constructing new AST nodes, we use `astor` to render
     the node as source code.
+
+    Every edit re-parses the source so the tree stays in sync with it. When making
+    many edits at once, use `batch` to collect them and re-parse a single time:
+    ```python
+    with File(filename) as f, f.batch():
+        for start, end, new_node in edits:
+            f.edit_node_range(start, end, new_node)
+    ```
     """
 
     filename: Path
     source: str
     atok: asttokens.ASTTokens
     tree: ast.Module
+    _pending: Optional[list[tuple[int, int, str]]] = None
 
     def __init__(self, filename: Path):
         self.filename = filename
@@ -69,21 +79,77 @@ class File:
         return self.atok.get_text_range(node)
 
     def edit_node_range(self, start: int, end: int, node: Union[str, ast.AST]):
-        """Splice a new node or string into the source code at the given range."""
-        if isinstance(node, ast.expr):
-            module = ast.Module(body=[ast.Expr(value=node)], type_ignores=[])
-            _node = astor.to_source(module).strip()
-        else:
-            _node = node
+        """
+        Splice a new node or string into the source code at the given range.
+
+        Inside of `batch` the edit is queued and applied when the batch ends.
+        """
+        source = render_node(node) if isinstance(node, ast.AST) else node
+
+        if self._pending is not None:
+            self._queue_edit(start, end, source)
+            return
 
-        self.source = self.source[:start] + _node + self.source[end:]
         # In order to continue accurately modifying the AST, we need to re-parse the source.
-        self.atok = asttokens.ASTTokens(self.source, parse=True)
+        self._parse(self.source[:start] + source + self.source[end:])
 
-        if self.atok.tree:
-            self.tree = self.atok.tree
-        else:
+    def _parse(self, source: str):
+        """Parse edited source and replace the current source and tree with it."""
+        try:
+            atok = asttokens.ASTTokens(source, parse=True)
+        except SyntaxError as e:
+            raise ValidationError(f"Failed to parse {self.filename} after edit\n{e}")
+
+        if not atok.tree:
             raise ValidationError(f"Failed to parse {self.filename} after edit")
+        self.source, self.atok, self.tree = source, atok, atok.tree
+
+    def _queue_edit(self, start: int, end: int, text: str):
+        """
+        Queue an edit made against the source as it was when the batch started.
+
+        Lookups inside a batch see the unmodified source, so editing the same node
+        twice produces the same range; the latest edit replaces the earlier one.
+        Insertions at the same position are kept in the order they were made.
+        """
+        assert self._pending is not None
+        for i, (_start, _end, _) in enumerate(self._pending):
+            if (_start, _end) == (start, end) and start != end:
+                self._pending[i] = (start, end, text)
+                return
+            if start < _end and _start < end:
+                raise ValidationError(
+                    f"Overlapping edits to {self.filename} at {start}:{end} and {_start}:{_end}"
+                )
+        self._pending.append((start, end, text))
+
+    @contextmanager
+    def batch(self: FileT) -> Iterator[FileT]:
+        """
+        Collect edits and apply them in a single pass, re-parsing the source once.
+
+        Node ranges are read from the tree as it was when the batch started, so
+        edits can be made in any order. If an exception is raised, no edits from
+        the batch are applied.
+        """
+        if self._pending is not None:  # already batching; the outer batch applies the edits
+            yield self
+            return
+
+        self._pending = []
+        try:
+            yield self
+            edits = self._pending
+        finally:
+            self._pending = None
+
+        if not edits:
+            return
+        # apply edits from the end of the file so earlier offsets stay valid
+        source = self.source
+        for start, end, text in sorted(reversed(edits), key=lambda edit: edit[:2], reverse=True):
+            source = source[:start] + text + source[end:]
+        self._parse(source)
 
     def remove_node(self, node: ast.AST) -> None:
         """Remove a node from the source code."""
@@ -97,6 +163,13 @@ class File:
         self.write()
 
 
+def render_node(node: ast.AST) -> str:
+    """Render a node as source code."""
+    if isinstance(node, ast.expr):
+        node = ast.Module(body=[ast.Expr(value=node)], type_ignores=[])
+    return astor.to_source(node).strip()
+
+
 def get_all_imports(tree: ast.Module) -> list[ast.ImportFrom]:
     """Find all import statements in an AST."""
     imports = []
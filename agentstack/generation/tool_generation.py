@@ -1,4 +1,5 @@
 import os, sys
+import functools
 from typing import Optional
 from agentstack import conf, log
 from agentstack.conf import ConfigFile
@@ -19,8 +20,9 @@ def add_tool(name: str, agents: Optional[list[str]] = []):
         log.notify(f'Tool {name} is already installed')
     else:  # handle install
         if tool.dependencies:
-            for dependency in tool.dependencies:
-                packaging.install(dependency)
+            with packaging.batch_install():
+                for dependency in tool.dependencies:
+                    packaging.install(dependency)
 
         if tool.env:  # add environment variables which don't exist
             with EnvFile() as env:
@@ -30,8 +32,8 @@ def add_tool(name: str, agents: Optional[list[str]] = []):
                 for var, value in tool.env.items():
                     env.append_if_new(var, value)
 
-        if tool.post_install:
-            os.system(tool.post_install)
+        if tool.post_install:  # after the dependencies it may rely on are installed
+            packaging.after_install(functools.partial(os.system, tool.post_install))
 
         with agentstack_config as config:
             config.tools.append(tool.name)
@@ -39,8 +41,7 @@ def add_tool(name: str, agents: Optional[list[str]] = []):
     # Edit the framework entrypoint file to include the tool in the agent definition
     if not agents:  # If no agents are specified, add the tool to all agents
         agents = frameworks.get_agent_method_names()
-    for agent_name in agents:
-        frameworks.add_tool(tool, agent_name)
+    frameworks.add_tool_to_agents(tool, agents)
 
     log.success(f'🔨 Tool {tool.name} added to agentstack project successfully!')
     if tool.cta:
@@ -62,8 +63,7 @@ def remove_tool(name: str, agents: Optional[list[str]] = []):
     # Edit the framework entrypoint file to exclude the tool in the agent definition
     if not agents:  # If no agents are specified, remove the tool from all agents
         agents = frameworks.get_agent_method_names()
-    for agent_name in agents:
-        frameworks.remove_tool(tool, agent_name)
+    frameworks.remove_tool_from_agents(tool, agents)
 
     if tool.post_remove:
         os.system(tool.post_remove)
@@ -5,6 +5,7 @@ from ruamel.yaml import YAML, YAMLError
 from ruamel.yaml.scalarstring import FoldedScalarString
 from agentstack import conf, log
 from agentstack.exceptions import ValidationError
+from agentstack.utils import load_yaml_snapshot, invalidate_yaml_snapshot
 
 
 INPUTS_FILENAME: Path = Path("src/config/inputs.yaml")
@@ -37,8 +38,7 @@ class InputsConfig:
             filename.touch()
 
         try:
-            with open(filename, 'r') as f:
-                self._attributes = yaml.load(f) or {}
+            self._attributes = dict(load_yaml_snapshot(filename) or {})
         except YAMLError as e:
             # TODO format MarkedYAMLError lines/messages
             raise ValidationError(f"Error parsing inputs file: {filename}\n{e}")
@@ -65,6 +65,7 @@ class InputsConfig:
         log.debug(f"Writing inputs to {INPUTS_FILENAME}")
         with open(conf.PATH / INPUTS_FILENAME, 'w') as f:
             yaml.dump(self.model_dump(), f)
+        invalidate_yaml_snapshot(conf.PATH / INPUTS_FILENAME)
 
     def __enter__(self) -> 'InputsConfig':
         return self
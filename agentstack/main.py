@@ -1,21 +1,11 @@
 import sys
 import argparse
-import webbrowser
 
+# Command implementations are imported inside the branch that runs them; importing
+# all of `agentstack.cli` up front pulls in cookiecutter, inquirer, requests etc.
+# and makes every invocation (even `--version`) pay for it.
 from agentstack import conf, log
-from agentstack import auth
-from agentstack.cli import (
-    init_project,
-    add_tool,
-    list_tools,
-    configure_default_model,
-    run_project,
-    export_template,
-)
-from agentstack.telemetry import track_cli_command, update_telemetry
-from agentstack.utils import get_version, term_color
-from agentstack import generation
-from agentstack.update import check_for_updates
+from agentstack.utils import get_version
 
 
 def _main():
@@ -160,6 +150,9 @@ def _main():
         log.info(f"AgentStack CLI version: {get_version()}")
         return
 
+    from agentstack.telemetry import track_cli_command, update_telemetry
+    from agentstack.update import check_for_updates
+
     telemetry_id = track_cli_command(args.command, " ".join(sys.argv[1:]))
     check_for_updates(update_requested=args.command in ('update', 'u'))
 
@@ -167,36 +160,57 @@ def _main():
     try:
         # outside of project
         if args.command in ["docs"]:
+            import webbrowser
+
             webbrowser.open("https://docs.agentstack.sh/")
         elif args.command in ["quickstart"]:
+            import webbrowser
+
             webbrowser.open("https://docs.agentstack.sh/quickstart")
         elif args.command in ["templates"]:
+            import webbrowser
+
             webbrowser.open("https://docs.agentstack.sh/quickstart")
         elif args.command in ["init", "i"]:
+            from agentstack.cli import init_project
+
             init_project(args.slug_name, args.template, args.framework, args.wizard)
         elif args.command in ["tools", "t"]:
             if args.tools_command in ["list", "l"]:
+                from agentstack.cli import list_tools
+
                 list_tools()
             elif args.tools_command in ["add", "a"]:
+                from agentstack.cli import add_tool
+
                 conf.assert_project()
                 agents = [args.agent] if args.agent else None
                 agents = args.agents.split(",") if args.agents else agents
                 add_tool(args.name, agents)
             elif args.tools_command in ["remove", "r"]:
+                from agentstack import generation
+
                 conf.assert_project()
                 generation.remove_tool(args.name)
             else:
                 tools_parser.print_help()
         elif args.command in ['login']:
+            from agentstack import auth
+
             auth.login()
         elif args.command in ['update', 'u']:
             pass  # Update check already done
 
         # inside project dir commands only
         elif args.command in ["run", "r"]:
+            from agentstack.cli import run_project
+
             conf.assert_project()
             run_project(command=args.function, cli_args=extra_args)
         elif args.command in ['generate', 'g']:
+            from agentstack import generation
+            from agentstack.cli import configure_default_model
+
             conf.assert_project()
             if args.generate_command in ['agent', 'a']:
                 if not args.llm:
@@ -209,6 +223,8 @@ def _main():
             else:
                 generate_parser.print_help()
         elif args.command in ['export', 'e']:
+            from agentstack.cli import export_template
+
             conf.assert_project()
             export_template(args.filename)
         else:
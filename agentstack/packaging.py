@@ -1,6 +1,7 @@
 import os, sys
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterator
 from pathlib import Path
+from contextlib import contextmanager
 import re
 import subprocess
 import select
@@ -14,6 +15,11 @@ VENV_DIR_NAME: Path = Path(".venv")
 # filter uv output by these words to only show useful progress messages
 RE_UV_PROGRESS = re.compile(r'^(Resolved|Prepared|Installed|Uninstalled|Audited)')
 
+# packages queued by `install` inside of `batch_install`, keyed by requirement name and marker
+_pending_installs: Optional[dict[tuple[str, str], str]] = None
+# callbacks queued by `after_install` inside of `batch_install`
+_pending_callbacks: list[Callable[[], object]] = []
+
 
 # When calling `uv` we explicitly specify the --python executable to use so that
 # the packages are installed into the correct virtual environment.
@@ -22,7 +28,43 @@ RE_UV_PROGRESS = re.compile(r'^(Resolved|Prepared|Installed|Uninstalled|Audited)
 
 
 def install(package: str):
-    """Install a package with `uv` and add it to pyproject.toml."""
+    """
+    Install a package with `uv` and add it to pyproject.toml.
+
+    Inside of `batch_install` the package is queued and installed along with
+    the rest of the batch. If the same package is queued more than once, the
+    requirements are combined so all of their version constraints apply.
+    """
+    if _pending_installs is not None:
+        requirement = Requirement(package)
+        key = (requirement.name, str(requirement.marker or ''))
+        if key not in _pending_installs:
+            _pending_installs[key] = package
+        elif _pending_installs[key] != package:
+            _pending_installs[key] = _merge_requirements(_pending_installs[key], package)
+        return
+
+    install_many([package])
+
+
+def _merge_requirements(package: str, other: str) -> str:
+    """Combine two requirements for the same package into one that satisfies both."""
+    requirement, other_requirement = Requirement(package), Requirement(other)
+    if requirement.url or other_requirement.url:
+        # a direct reference can't be combined with another source
+        if requirement.url != other_requirement.url:
+            log.warning(f"Ignoring `{other}`, `{package}` is already queued for install")
+        return package
+
+    requirement.extras |= other_requirement.extras
+    requirement.specifier &= other_requirement.specifier
+    return str(requirement)
+
+
+def install_many(packages: list[str]):
+    """Install packages with a single call to `uv` and add them to pyproject.toml."""
+    if not packages:
+        return
 
     def on_progress(line: str):
         if RE_UV_PROGRESS.match(line):
@@ -32,12 +74,60 @@ def install(package: str):
         log.error(f"uv: [error]\n {line.strip()}")
 
     _wrap_command_with_callbacks(
-        [get_uv_bin(), 'add', '--python', '.venv/bin/python', package],
+        [get_uv_bin(), 'add', '--python', '.venv/bin/python', *packages],
         on_progress=on_progress,
         on_error=on_error,
     )
 
 
+def after_install(callback: Callable[[], object]):
+    """
+    Run `callback` once the packages passed to `install` have been installed:
+    at the end of the current `batch_install`, or right away outside of one.
+    """
+    if _pending_installs is not None:
+        _pending_callbacks.append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def batch_install() -> Iterator[None]:
+    """
+    Collect the packages passed to `install` and install them all at once.
+
+    Every `uv add` resolves the whole project, so adding several tools with
+    their own dependencies is much faster as a single call:
+    ```python
+    with packaging.batch_install():
+        for tool in tools:
+            generation.add_tool(tool)
+    ```
+    Nested batches are installed by the outermost one, followed by the
+    callbacks passed to `after_install`. If an exception is raised nothing is
+    installed and no callbacks are run.
+    """
+    global _pending_installs, _pending_callbacks
+    if _pending_installs is not None:
+        yield
+        return
+
+    _pending_installs = {}
+    try:
+        yield
+        packages = list(_pending_installs.values())
+        callbacks = _pending_callbacks
+    finally:
+        _pending_installs = None
+        _pending_callbacks = []
+
+    if packages:
+        log.info(f"Installing {len(packages)} dependencies: {', '.join(packages)}")
+    install_many(packages)
+    for callback in callbacks:
+        callback()
+
+
 def install_project():
     """Install all dependencies for the user's project."""
 
@@ -6,6 +6,7 @@ from ruamel.yaml import YAML, YAMLError
 from ruamel.yaml.scalarstring import FoldedScalarString
 from agentstack import conf, log
 from agentstack.exceptions import ValidationError
+from agentstack.utils import load_yaml_snapshot, invalidate_yaml_snapshot
 
 
 TASKS_FILENAME: Path = Path("src/config/tasks.yaml")
@@ -54,8 +55,7 @@ class TaskConfig(pydantic.BaseModel):
             filename.touch()
 
         try:
-            with open(filename, 'r') as f:
-                data = yaml.load(f) or {}
+            data = load_yaml_snapshot(filename) or {}
             data = data.get(name, {}) or {}
             super().__init__(**{**{'name': name}, **data})
         except YAMLError as e:
@@ -94,6 +94,7 @@ class TaskConfig(pydantic.BaseModel):
 
         with open(filename, 'w') as f:
             yaml.dump(data, f)
+        invalidate_yaml_snapshot(filename)
 
     def __enter__(self) -> 'TaskConfig':
         return self
@@ -107,8 +108,7 @@ def get_all_task_names() -> list[str]:
     if not os.path.exists(filename):
         log.debug(f"Project does not have an {TASKS_FILENAME} file.")
         return []
-    with open(filename, 'r') as f:
-        data = yaml.load(f) or {}
+    data = load_yaml_snapshot(filename) or {}
     return list(data.keys())
 
 
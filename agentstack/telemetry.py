@@ -23,19 +23,29 @@
 # - braelyn
 import json
 import os
+import sys
+import time
 import platform
 import socket
 import uuid
 from pathlib import Path
 from typing import Optional
 import psutil
-import requests
 from agentstack import conf
-from agentstack.auth import get_stored_token
-from agentstack.utils import get_telemetry_opt_out, get_framework, get_version, get_base_dir
+from agentstack.utils import get_telemetry_opt_out, get_version, get_base_dir, run_in_background
+
+# Events are appended to a local spool file and sent by a detached background
+# process (`python -m agentstack.telemetry flush`), so the CLI never waits on
+# the network. Events that can't be sent stay in the spool for the next flush.
 
 TELEMETRY_URL = 'https://api.agentstack.sh/telemetry'
 USER_GUID_FILE_PATH = get_base_dir() / ".cli-user-guid"
+SPOOL_FILE_PATH = get_base_dir() / ".cli-telemetry-spool.jsonl"
+FLUSH_DEADLINE = 10  # seconds a background flush may spend sending
+REQUEST_TIMEOUT = (2, 3)  # connect, read
+MAX_SPOOLED_EVENTS = 500
+MAX_EVENT_AGE = 7 * 24 * 3600  # drop events that couldn't be sent for a week
+ORPHAN_AGE = 60  # seconds before an unfinished flush's batch is picked up again
 
 
 def collect_machine_telemetry(command: str):
@@ -61,49 +71,230 @@ def collect_machine_telemetry(command: str):
     if telemetry_data['framework'] is None:
         telemetry_data['framework'] = "n/a"
 
-    # Attempt to get general location based on public IP
+    return telemetry_data
+
+
+def collect_location_telemetry() -> dict:
+    """
+    Attempt to get general location based on public IP.
+    Only called from the background flush.
+    """
+    import requests
+
     try:
-        response = requests.get('https://ipinfo.io/json')
+        response = requests.get('https://ipinfo.io/json', timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             location_data = response.json()
-            telemetry_data.update(
-                {
-                    'ip': location_data.get('ip'),
-                    'city': location_data.get('city'),
-                    'region': location_data.get('region'),
-                    'country': location_data.get('country'),
-                }
-            )
+            return {
+                'ip': location_data.get('ip'),
+                'city': location_data.get('city'),
+                'region': location_data.get('region'),
+                'country': location_data.get('country'),
+            }
     except requests.RequestException as e:
-        telemetry_data['location_error'] = str(e)
-
-    return telemetry_data
+        return {'location_error': str(e)}
+    return {}
 
 
-def track_cli_command(command: str, args: Optional[str] = None):
+def track_cli_command(command: str, args: Optional[str] = None) -> Optional[str]:
+    """
+    Record a CLI command. Returns an event id to pass to `update_telemetry`,
+    or None if nothing was recorded.
+    """
     if bool(os.getenv('AGENTSTACK_IS_TEST_ENV')):
-        return
+        return None
 
     try:
         data = collect_machine_telemetry(command)
-        headers = {}
-        token = get_stored_token()
-        if token:
-            headers['Authorization'] = f'Bearer {token}'
-
-        return requests.post(TELEMETRY_URL, json={"command": command, "args":args, **data}, headers=headers).json().get('id')
+        if data is None:
+            return None
+        event_id = str(uuid.uuid4())
+        _spool_event({'type': 'command', 'event_id': event_id, 'data': {"command": command, "args": args, **data}})
+        return event_id
     except Exception:
-        pass
+        return None
 
-def update_telemetry(id: int, result: int, message: Optional[str] = None):
-    if bool(os.getenv('AGENTSTACK_IS_TEST_ENV')):
+
+def update_telemetry(id: Optional[str], result: int, message: Optional[str] = None):
+    """
+    Record the result of a command tracked with `track_cli_command` and send
+    everything spooled so far in the background.
+    """
+    if bool(os.getenv('AGENTSTACK_IS_TEST_ENV')) or id is None:
         return
 
     try:
-        requests.put(TELEMETRY_URL, json={"id": id, "result": result, "message": message})
+        _spool_event({'type': 'result', 'event_id': id, 'result': result, 'message': message})
+        run_in_background('agentstack.telemetry', 'flush')
     except Exception:
         pass
 
+
+def _spool_event(event: dict):
+    """Append an event to the spool file."""
+    event.setdefault('created_at', time.time())
+    try:
+        SPOOL_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(SPOOL_FILE_PATH, 'a') as f:
+            f.write(json.dumps(event) + "\n")
+    except (OSError, PermissionError):
+        pass
+
+
+def _read_events(path: Path) -> list[dict]:
+    events = []
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # partially written line
+    except (OSError, PermissionError):
+        pass
+    return events
+
+
+def _claim_spool() -> list[dict]:
+    """
+    Move the spool (and batches left behind by flushes that died) aside so
+    concurrent flushes and new events don't interfere, and return their events.
+    """
+    events = []
+    batch_path = SPOOL_FILE_PATH.with_name(f"{SPOOL_FILE_PATH.name}.{os.getpid()}")
+    try:
+        os.replace(SPOOL_FILE_PATH, batch_path)
+        events.extend(_read_events(batch_path))
+        os.remove(batch_path)
+    except (OSError, PermissionError):
+        pass
+
+    for orphan in SPOOL_FILE_PATH.parent.glob(f"{SPOOL_FILE_PATH.name}.*"):
+        try:
+            if time.time() - orphan.stat().st_mtime < ORPHAN_AGE:
+                continue  # another flush is still working on it
+            events.extend(_read_events(orphan))
+            os.remove(orphan)
+        except (OSError, PermissionError):
+            pass
+    return events
+
+
+def _server_ids_path() -> Path:
+    return SPOOL_FILE_PATH.with_name(f"{SPOOL_FILE_PATH.stem}-ids.json")
+
+
+def _load_server_ids() -> dict[str, dict]:
+    """
+    Server ids of commands sent by earlier flushes whose results haven't been
+    sent yet, as {event_id: {'id': server_id, 'sent_at': timestamp}}.
+    """
+    try:
+        with open(_server_ids_path(), 'r') as f:
+            server_ids = json.load(f)
+        return server_ids if isinstance(server_ids, dict) else {}
+    except (OSError, PermissionError, ValueError):
+        return {}
+
+
+def _save_server_ids(added: dict[str, dict], finished: set[str]):
+    """Merge this flush's changes into the stored ids; other flushes may have changed them meanwhile."""
+    now = time.time()
+    server_ids = {**_load_server_ids(), **added}
+    server_ids = {
+        event_id: entry
+        for event_id, entry in server_ids.items()
+        if event_id not in finished and isinstance(entry, dict) and now - entry.get('sent_at', 0) < MAX_EVENT_AGE
+    }
+    path = _server_ids_path()
+    try:
+        if not server_ids:
+            path.unlink(missing_ok=True)
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}")
+        with open(tmp_path, 'w') as f:
+            json.dump(server_ids, f)
+        os.replace(tmp_path, path)
+    except (OSError, PermissionError):
+        pass
+
+
+def flush_spool(deadline: float = FLUSH_DEADLINE):
+    """
+    Send spooled events, pairing results with the id the server assigned to
+    their command. The ids are kept on disk, so a result spooled after another
+    process already sent its command is still paired; a result whose command
+    hasn't been sent yet waits in the spool. Gives up at the first network
+    error or after `deadline` seconds and spools whatever is left for the next flush.
+    """
+    import requests
+    from agentstack.auth import get_stored_token
+
+    events = _claim_spool()
+    if not events:
+        return
+
+    started = time.monotonic()
+    now = time.time()
+    events = [e for e in events if now - e.get('created_at', now) < MAX_EVENT_AGE]
+    events = events[-MAX_SPOOLED_EVENTS:]
+
+    headers = {}
+    token = get_stored_token()
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+
+    location: Optional[dict] = None
+    server_ids = _load_server_ids()
+    added: dict[str, dict] = {}
+    finished: set[str] = set()
+    unsent: list[dict] = []
+    offline = False
+    for event in events:
+        if offline or time.monotonic() - started > deadline:
+            unsent.append(event)
+            continue
+        try:
+            if event['type'] == 'command':
+                if location is None:
+                    location = collect_location_telemetry()
+                response = requests.post(
+                    TELEMETRY_URL, json={**event['data'], **location}, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+                try:
+                    server_id = response.json().get('id')
+                except ValueError:
+                    server_id = None  # sent, but no id to report the result against
+                server_ids[event['event_id']] = added[event['event_id']] = {'id': server_id, 'sent_at': time.time()}
+            elif event['type'] == 'result':
+                server_id = event.get('id')
+                if server_id is None:
+                    if event['event_id'] not in server_ids:
+                        unsent.append(event)  # its command hasn't been sent yet
+                        continue
+                    server_id = server_ids[event['event_id']].get('id')
+                    if server_id is None:
+                        finished.add(event['event_id'])
+                        continue
+                event['id'] = server_id
+                requests.put(
+                    TELEMETRY_URL,
+                    json={"id": server_id, "result": event['result'], "message": event['message']},
+                    timeout=REQUEST_TIMEOUT,
+                )
+                finished.add(event['event_id'])
+        except requests.RequestException:
+            offline = True
+            unsent.append(event)
+        except Exception:
+            continue  # malformed event or response; drop it
+
+    if added or finished:
+        _save_server_ids(added, finished)
+    for event in unsent:
+        _spool_event(event)
+
+
 def _get_cli_user_guid() -> str:
     if Path(USER_GUID_FILE_PATH).exists():
         try:
@@ -123,4 +314,10 @@ def _get_cli_user_guid() -> str:
         return guid
     except (OSError, PermissionError):
         # Silently fail in CI or when we can't write
-        return "unknown"
\ No newline at end of file
+        return "unknown"
+
+
+if __name__ == "__main__":
+    # Entry point for the background sender started by `update_telemetry`.
+    if sys.argv[1:] == ['flush']:
+        flush_spool()
@@ -1,15 +1,24 @@
 import os
 import json
+import atexit
+import threading
 import weaviate
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
+from concurrent.futures import ThreadPoolExecutor
 from weaviate.classes.config import Configure
 from weaviate.classes.init import Auth
+from weaviate.exceptions import WeaviateClosedClientError, WeaviateConnectionError
 
 # Required environment variables
 url = os.getenv("WEAVIATE_URL")
 api_key = os.getenv("WEAVIATE_API_KEY")
 openai_key = os.getenv("WEAVIATE_OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
 
+# Number of queries `search_collection_many` runs at once over the shared client
+MAX_CONCURRENT_QUERIES = 8
+# Number of objects `insert_objects` sends to the cluster per request
+INSERT_BATCH_SIZE = 100
+
 if not url:
     raise Exception((
         "Weaviate URL has not been provided.\n"
@@ -28,6 +37,62 @@ if not openai_key:
         "Did you set either WEAVIATE_OPENAI_API_KEY or OPENAI_API_KEY in your project's .env file?"
     ))
 
+T = TypeVar('T')
+
+_client: Optional[weaviate.WeaviateClient] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> weaviate.WeaviateClient:
+    """Get the shared client, connecting on first use or after the connection was lost."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            assert url and api_key and openai_key  # appease type checker
+            _client = weaviate.connect_to_weaviate_cloud(
+                cluster_url=url,
+                auth_credentials=Auth.api_key(api_key),
+                headers={"X-OpenAI-Api-Key": openai_key},
+            )
+        return _client
+
+
+def _reset_client(client: weaviate.WeaviateClient) -> None:
+    """Drop a client whose connection failed so the next call reconnects."""
+    global _client
+    with _client_lock:
+        if _client is client:
+            _client = None
+    try:
+        client.close()
+    except Exception:
+        pass
+
+
+def _with_client(func: Callable[[weaviate.WeaviateClient], T], retry: bool = True) -> T:
+    """
+    Run `func` with the shared client. If the connection was lost the client is
+    dropped so the next call reconnects, and `func` is retried once if `retry`.
+    """
+    client = _get_client()
+    try:
+        return func(client)
+    except (WeaviateConnectionError, WeaviateClosedClientError):
+        _reset_client(client)
+        if not retry:
+            raise
+        return func(_get_client())
+
+
+def _close_client() -> None:
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+
+
+atexit.register(_close_client)
+
+
 def search_collection(
     collection_name: str,
     query: str,
@@ -40,37 +105,90 @@ def search_collection(
         collection_name: Name of the collection to search
         query: The search query
         limit: Maximum number of results (default: 3)
-        model: Text embedding model to use (default: nomic-embed-text)
+        model: Unused; queries are embedded with the model the collection was created with
 
     Returns:
         str: JSON string containing search results
     """
-    headers = {"X-OpenAI-Api-Key": openai_key}
-    vectorizer = Configure.Vectorizer.text2vec_openai(model=model)
+    def search(client: weaviate.WeaviateClient) -> list[dict]:
+        # `get` doesn't make a request; a missing collection fails the query itself
+        collection = client.collections.get(collection_name)
+        response = collection.query.near_text(query=query, limit=limit)
+        return [obj.properties for obj in response.objects]
 
-    client = weaviate.connect_to_weaviate_cloud(
-        cluster_url=url,
-        auth_credentials=Auth.api_key(api_key),
-        headers=headers
-    )
+    return json.dumps(_with_client(search), indent=2)
 
-    try:
+
+def search_collection_many(
+    collection_name: str,
+    queries: list[str],
+    limit: int = 3
+) -> str:
+    """Search a Weaviate collection with several near-text queries at once.
+
+    Args:
+        collection_name: Name of the collection to search
+        queries: The search queries
+        limit: Maximum number of results per query (default: 3)
+
+    Returns:
+        str: JSON string mapping each query to its search results, or to an
+            object with an "error" message if that query failed
+    """
+    def search(client: weaviate.WeaviateClient) -> dict[str, Any]:
         collection = client.collections.get(collection_name)
-        if not collection:
+
+        def near_text(query: str) -> Any:
+            try:
+                response = collection.query.near_text(query=query, limit=limit)
+            except (WeaviateConnectionError, WeaviateClosedClientError):
+                raise  # reconnect and retry the whole search
+            except Exception as e:
+                return {"error": str(e)}
+            return [obj.properties for obj in response.objects]
+
+        unique_queries = list(dict.fromkeys(queries))
+        workers = max(1, min(MAX_CONCURRENT_QUERIES, len(unique_queries)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(unique_queries, executor.map(near_text, unique_queries)))
+
+    return json.dumps(_with_client(search), indent=2)
+
+
+def insert_objects(
+    collection_name: str,
+    objects: list[dict]
+) -> str:
+    """Insert objects into a Weaviate collection in batches.
+
+    Objects are sent `INSERT_BATCH_SIZE` at a time, one request per batch.
+
+    Args:
+        collection_name: Name of the collection to insert into
+        objects: The properties of each object to insert
+
+    Returns:
+        str: JSON string with the number of objects inserted and an error
+            message for each object that failed, prefixed with its index
+    """
+    def insert(client: weaviate.WeaviateClient) -> dict[str, Any]:
+        if not client.collections.exists(collection_name):
             raise ValueError(f"Collection {collection_name} not found")
 
-        response = collection.query.near_text(
-            query=query,
-            limit=limit
-        )
+        collection = client.collections.get(collection_name)
+        inserted, failed = 0, []
+        for start in range(0, len(objects), INSERT_BATCH_SIZE):
+            batch = objects[start : start + INSERT_BATCH_SIZE]
+            response = collection.data.insert_many(batch)
+            inserted += len(batch) - len(response.errors)
+            for index, error in sorted(response.errors.items()):
+                failed.append(f"object {start + index}: {error.message}")
 
-        results = []
-        for obj in response.objects:
-            results.append(obj.properties)
+        return {"inserted": inserted, "failed": failed}
+
+    # a retry could insert objects from the failed attempt a second time
+    return json.dumps(_with_client(insert, retry=False), indent=2)
 
-        return json.dumps(results, indent=2)
-    finally:
-        client.close()
 
 def create_collection(
     collection_name: str,
@@ -85,24 +203,14 @@ def create_collection(
     Returns:
         str: Success message
     """
-    headers = {"X-OpenAI-Api-Key": openai_key}
-    vectorizer = Configure.Vectorizer.text2vec_openai(model=model)
-
-    client = weaviate.connect_to_weaviate_cloud(
-        cluster_url=url,
-        auth_credentials=Auth.api_key(api_key),
-        headers=headers
-    )
-
-    try:
-        collection = client.collections.get(collection_name)
-        if collection:
+    def create(client: weaviate.WeaviateClient) -> str:
+        if client.collections.exists(collection_name):
             return f"Collection {collection_name} already exists"
 
         client.collections.create(
             name=collection_name,
-            vectorizer_config=vectorizer
+            vectorizer_config=Configure.Vectorizer.text2vec_openai(model=model)
         )
         return f"Created collection {collection_name}"
-    finally:
-        client.close()
+
+    return _with_client(create)
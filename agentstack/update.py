@@ -1,12 +1,11 @@
+from typing import Optional
 import json
 import os, sys
 import time
 from pathlib import Path
-from packaging.version import parse as parse_version, Version
-import inquirer
+from packaging.version import parse as parse_version, Version, InvalidVersion
 from agentstack import log
-from agentstack.utils import term_color, get_version, get_framework, get_base_dir
-from agentstack import packaging
+from agentstack.utils import term_color, get_version, get_framework, get_base_dir, run_in_background
 
 
 AGENTSTACK_PACKAGE = 'agentstack'
@@ -25,6 +24,8 @@ USER_GUID_FILE_PATH = get_base_dir() / ".cli-user-guid"
 INSTALL_PATH = Path(sys.executable).parent.parent
 ENDPOINT_URL = "https://pypi.org/simple"
 CHECK_EVERY = 3600  # hour
+REQUEST_TIMEOUT = 5  # seconds, for the background check
+LATEST_VERSION_KEY = 'latest_version'
 
 
 def _is_ci_environment():
@@ -32,12 +33,14 @@ def _is_ci_environment():
     return any(os.getenv(var) for var in CI_ENV_VARS)
 
 
-def get_latest_version(package: str) -> Version:
+def get_latest_version(package: str, timeout: Optional[float] = None) -> Version:
     """Get version information from PyPi to save a full package manager invocation"""
     import requests  # defer import until we know we need it
 
     response = requests.get(
-        f"{ENDPOINT_URL}/{package}/", headers={"Accept": "application/vnd.pypi.simple.v1+json"}
+        f"{ENDPOINT_URL}/{package}/",
+        headers={"Accept": "application/vnd.pypi.simple.v1+json"},
+        timeout=timeout,
     )
     if response.status_code != 200:
         raise Exception(f"Failed to fetch package data from pypi.")
@@ -75,8 +78,19 @@ def should_update() -> bool:
     return time.time() - float(last_check) > CHECK_EVERY
 
 
-def record_update_check():
-    """Save current timestamp for this installation"""
+def get_cached_latest_version() -> Optional[Version]:
+    """The latest version found by the last update check, if any."""
+    latest_version = load_update_data().get(LATEST_VERSION_KEY)
+    if not latest_version:
+        return None
+    try:
+        return parse_version(latest_version)
+    except InvalidVersion:
+        return None
+
+
+def record_update_check(latest_version: Optional[Version] = None):
+    """Save current timestamp for this installation, and the latest version if it was fetched"""
     # Don't record updates in CI
     if _is_ci_environment():
         return
@@ -84,6 +98,8 @@ def record_update_check():
     try:
         data = load_update_data()
         data[str(INSTALL_PATH)] = time.time()
+        if latest_version is not None:
+            data[LATEST_VERSION_KEY] = str(latest_version)
 
         # Create directory if it doesn't exist
         LAST_CHECK_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -95,20 +111,48 @@ def record_update_check():
         pass
 
 
+def refresh_latest_version():
+    """Fetch the latest version from PyPI and record it for the next CLI invocation."""
+    try:
+        latest_version = get_latest_version(AGENTSTACK_PACKAGE, timeout=REQUEST_TIMEOUT)
+    except Exception:
+        # Offline or PyPI unavailable; keep the previous result and retry after CHECK_EVERY
+        record_update_check()
+        return
+    record_update_check(latest_version)
+
+
 def check_for_updates(update_requested: bool = False):
     """
     `update_requested` indicates the user has explicitly requested an update.
-    """
-    if not update_requested and not should_update():
-        return
 
-    try:
-        latest_version: Version = get_latest_version(AGENTSTACK_PACKAGE)
-    except Exception as e:
-        raise Exception(f"Failed to retrieve package index: {e}")
+    Otherwise no network request is made here: when a check is due we compare
+    against the version found by the previous check and fetch a fresh one in the
+    background for next time.
+    """
+    if update_requested:
+        try:
+            latest_version: Version = get_latest_version(AGENTSTACK_PACKAGE)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve package index: {e}")
+    else:
+        # Nowhere to keep the result in CI, and nobody to prompt
+        if not should_update() or _is_ci_environment():
+            return
+        cached_version = get_cached_latest_version()
+        # Count the check as done now, so a refresh that never finishes isn't restarted on every invocation
+        record_update_check()
+        run_in_background('agentstack.update', 'refresh')
+        if cached_version is None:
+            return
+        latest_version = cached_version
 
     installed_version: Version = parse_version(get_version(AGENTSTACK_PACKAGE))
     if latest_version > installed_version:
+        # only needed to prompt and upgrade; too slow to import on every invocation
+        import inquirer
+        from agentstack import packaging
+
         log.info('')  # newline
         if inquirer.confirm(
             f"New version of {AGENTSTACK_PACKAGE} available: {latest_version}! Do you want to install?"
@@ -118,4 +162,11 @@ def check_for_updates(update_requested: bool = False):
         else:
             log.info("Skipping update. Run `agentstack update` to install the latest version.")
 
-    record_update_check()
+    if update_requested:
+        record_update_check(latest_version)
+
+
+if __name__ == "__main__":
+    # Entry point for the background check started by `check_for_updates`.
+    if sys.argv[1:] == ['refresh']:
+        refresh_latest_version()
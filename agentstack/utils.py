@@ -1,13 +1,15 @@
+from typing import Any, Optional, Union
 import os
 import sys
 import json
-from ruamel.yaml import YAML
 import re
+import time
+import threading
+from types import MappingProxyType
 from importlib.metadata import version
 from pathlib import Path
 import importlib.resources
 from agentstack import conf
-from inquirer import errors as inquirer_errors
 from appdirs import user_data_dir
 
 
@@ -76,6 +78,8 @@ def open_json_file(path) -> dict:
 
 
 def open_yaml_file(path) -> dict:
+    from ruamel.yaml import YAML
+
     yaml = YAML()
     yaml.preserve_quotes = True  # Preserve quotes in existing data
 
@@ -84,6 +88,52 @@ def open_yaml_file(path) -> dict:
     return data
 
 
+# Parsed YAML files keyed by path, with the (mtime, size) they were parsed at.
+_yaml_snapshots: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+
+def _freeze(data: Any) -> Any:
+    """Make parsed YAML read-only so cached snapshots can be shared safely."""
+    if isinstance(data, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(value) for value in data)
+    return data
+
+
+def load_yaml_snapshot(path: Union[str, Path]) -> Any:
+    """
+    Read-only view of a YAML file, parsed once and reused until the file's mtime
+    or size changes. Mappings are returned as `MappingProxyType` and sequences as
+    tuples. Uses the C-accelerated safe loader when available; use
+    `open_yaml_file` for data that will be edited and written back.
+    """
+    from ruamel.yaml import YAML
+
+    path = Path(path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _yaml_snapshots.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        data = _freeze(YAML(typ='safe').load(f))
+    _yaml_snapshots[path] = (version, data)
+    return data
+
+
+def invalidate_yaml_snapshot(path: Optional[Union[str, Path]] = None):
+    """
+    Drop the cached snapshot of `path`, or of every file if no path is given.
+    Call after writing a file, since a rewrite can leave mtime and size unchanged.
+    """
+    if path is None:
+        _yaml_snapshots.clear()
+    else:
+        _yaml_snapshots.pop(Path(path), None)
+
+
 def clean_input(input_string):
     special_char_pattern = re.compile(r'[^a-zA-Z0-9\s_]')
     return re.sub(special_char_pattern, '', input_string).lower().replace(' ', '_').replace('-', '_')
@@ -112,6 +162,8 @@ def is_snake_case(string: str):
 
 def validator_not_empty(min_length=1):
     def validator(_, answer):
+        from inquirer import errors as inquirer_errors
+
         if len(answer) < min_length:
             raise inquirer_errors.ValidationError(
                 '', reason=f"This field must be at least {min_length} characters long."
@@ -131,4 +183,51 @@ def get_base_dir():
     except (RuntimeError, OSError, PermissionError):
         # In CI or when directory is not writable, use temp directory
         base_dir = Path(os.getenv('TEMP', '/tmp'))
-    return base_dir
\ No newline at end of file
+    return base_dir
+
+
+def run_in_background(module: str, *args: str):
+    """
+    Run `python -m <module> <args>` in a detached process that can outlive the
+    CLI. Its output is discarded and failures to start it are ignored.
+    """
+    import subprocess
+
+    kwargs: dict = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+
+    try:
+        subprocess.Popen(
+            [sys.executable, '-m', module, *args],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **kwargs,
+        )
+    except OSError:
+        pass
+
+
+class RateLimiter:
+    """
+    Spaces out calls to `wait` so no more than `per_minute` return in any
+    minute. Threads sharing a limiter take turns in the order they call it.
+    """
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next request may start."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
@@ -36,6 +36,7 @@ class Execution(BaseModel):
     active: bool
     subscribers: set[WebSocket]
     steps: list[AnalysisStep]
+    sections: dict[str, str] = {}
     start_time: datetime
     last_update_time: datetime
 
@@ -96,6 +97,14 @@ class AgentExecutionManager:
             # Send historical steps immediately to the new subscriber
             logger.info(f"[{submission_id}] Broadcasting {len(self.executions[submission_id].steps)} historical steps to client {client_id}")
             await self.broadcast_state(submission_id, specific_client=websocket)
+
+            # Replay sections streamed so far so late subscribers catch up
+            for section_name, text in list(self.executions[submission_id].sections.items()):
+                await self.broadcast_message(
+                    submission_id,
+                    self._section_delta_message(section_name, text, 0, True),
+                    specific_client=websocket,
+                )
             return True
             
         except Exception as e:
@@ -124,6 +133,33 @@ class AgentExecutionManager:
             logger.info(f"[{submission_id}] Broadcasting new step to {subscribers_count} subscribers")
             asyncio.create_task(self.broadcast_state(submission_id))
 
+    @staticmethod
+    def _section_delta_message(section_name: str, delta: str, offset: int, reset: bool) -> str:
+        return json.dumps({
+            "type": "section_delta",
+            "section": section_name,
+            "delta": delta,
+            "offset": offset,
+            "reset": reset,
+        })
+
+    def add_section_delta(self, submission_id: str, section_name: str, delta: str, reset: bool = False):
+        """Append streamed report content to a section and push it to subscribers.
+
+        Messages are JSON objects with type "section_delta"; `offset` is the position of `delta`
+        in the section text and `reset` tells clients to discard what they have for the section.
+        """
+        if submission_id in self.executions:
+            sections = self.executions[submission_id].sections
+            if reset:
+                sections[section_name] = ""
+            offset = len(sections.get(section_name, ""))
+            sections[section_name] = sections.get(section_name, "") + delta
+            self.executions[submission_id].last_update_time = datetime.now()
+
+            message = self._section_delta_message(section_name, delta, offset, reset)
+            asyncio.create_task(self.broadcast_message(submission_id, message))
+
     async def broadcast_state(self, submission_id: str, specific_client: WebSocket = None):
         """Broadcast current execution state to all subscribed clients to a particular execution"""
         if submission_id in self.executions:
@@ -131,12 +167,18 @@ class AgentExecutionManager:
             
             # Convert all steps to dict format and send as a list
             steps_data = [step.model_dump() for step in execution.steps]
-            message = json.dumps(steps_data)
+            logger.info(f"[{submission_id}] Broadcasting {len(steps_data)} steps")
+            await self.broadcast_message(submission_id, json.dumps(steps_data), specific_client=specific_client)
+
+    async def broadcast_message(self, submission_id: str, message: str, specific_client: WebSocket = None):
+        """Send a raw text message to all subscribed clients of an execution"""
+        if submission_id in self.executions:
+            execution = self.executions[submission_id]
             
-            target_clients = [specific_client] if specific_client else execution.subscribers
+            target_clients = [specific_client] if specific_client else list(execution.subscribers)
             client_count = len(target_clients)
             
-            logger.info(f"[{submission_id}] Broadcasting {len(steps_data)} steps to {client_count} clients")
+            logger.debug(f"[{submission_id}] Sending message to {client_count} clients")
 
             disconnected = set()
             success_count = 0
@@ -146,7 +188,7 @@ class AgentExecutionManager:
                 try:
                     await websocket.send_text(message)
                     success_count += 1
-                    logger.info(f"[{submission_id}] Successfully sent update to client {client_id}")
+                    logger.debug(f"[{submission_id}] Successfully sent update to client {client_id}")
                 except WebSocketDisconnect:
                     logger.warning(f"[{submission_id}] Client {client_id} disconnected during broadcast")
                     disconnected.add(websocket)
@@ -159,7 +201,7 @@ class AgentExecutionManager:
             for websocket in disconnected:
                 self.unsubscribe_client(websocket, submission_id)
                 
-            logger.info(f"[{submission_id}] Broadcast summary: {success_count} successful, {len(disconnected)} failed")
+            logger.debug(f"[{submission_id}] Broadcast summary: {success_count} successful, {len(disconnected)} failed")
 
     def unsubscribe_client(self, websocket: WebSocket, submission_id: str):
         """Unsubscribe a client"""
@@ -316,8 +358,14 @@ async def langgraph_agent(submission_id: str, company_url: str = "", target_url:
         else:
             # Initialize and run B2bresearcherGraph
             logger.info(f"[{submission_id}] Initializing B2bresearcherGraph with user_url={company_url} and target_url={target_url}")
+            loop = asyncio.get_running_loop()
+
+            # The graph runs in a worker thread, so hop back onto the event loop to broadcast
+            def on_section_delta(section_name: str, delta: str, reset: bool):
+                loop.call_soon_threadsafe(manager.add_section_delta, submission_id, section_name, delta, reset)
+
             try:
-                graph = B2bresearcherGraph(enable_db_save=True)
+                graph = B2bresearcherGraph(enable_db_save=True, on_section_delta=on_section_delta)
                 logger.info(f"[{submission_id}] B2bresearcherGraph initialized successfully")
             except Exception as e:
                 logger.error(f"[{submission_id}] Failed to initialize B2bresearcherGraph: {str(e)}")
@@ -495,12 +543,12 @@ async def langgraph_agent(submission_id: str, company_url: str = "", target_url:
             
             # Run the graph with progress tracking
             try:
-                # Create a wrapper for the on_node_progress callback that doesn't require async
+                # Create a wrapper for the on_node_progress callback that schedules it from the worker thread
                 def on_step_wrapper(state, node_name, description):
-                    asyncio.create_task(on_node_progress(state, node_name, description))
+                    asyncio.run_coroutine_threadsafe(on_node_progress(state, node_name, description), loop)
                 
-                # Use the built-in progress tracking instead of manual state inspection
-                final_state = graph.run_with_progress_tracking(inputs, on_step_wrapper)
+                # Run the blocking graph off the event loop so streamed sections reach clients while it runs
+                final_state = await asyncio.to_thread(graph.run_with_progress_tracking, inputs, on_step_wrapper)
                 
                 # Ensure we reach the final step
                 while current_step_idx < total_steps:
@@ -45,6 +45,12 @@ async def listen_to_websocket(submission_id):
                         print("\nReceived update:")
                         # Parse and pretty print the JSON message
                         updates = json.loads(message)
+                        # Streamed report sections arrive as single objects rather than step lists
+                        if isinstance(updates, dict) and updates.get("type") == "section_delta":
+                            if updates["reset"]:
+                                print(f"\n[{updates['section']}] (reset)")
+                            print(updates["delta"], end="", flush=True)
+                            continue
                         for update in updates:
                             print(f"\nStep {update['idx']}:")
                             print(f"Message: {update['message']}")
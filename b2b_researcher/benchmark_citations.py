@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark citation post-processing on a synthetic 20k-word report with 200 sources.
+"""
+
+import io
+import re
+import sys
+import time
+import random
+import contextlib
+from src.functions.fix_citation_sequence import fix_citation_sequence
+
+WORDS = 20000
+SOURCES = 200
+RUNS = 20
+
+
+def build_report(words: int = WORDS, sources: int = SOURCES, seed: int = 42):
+    """Build a report with single, list and range citations plus the full Citations section."""
+    rng = random.Random(seed)
+    source_metadata = {
+        f"https://example.com/source/{i}": {"index": i, "title": f"Source {i}"}
+        for i in range(1, sources + 1)
+    }
+    vocabulary = ["revenue", "growth", "2024", "platform", "customers", "12", "market", "data", "team", "cloud"]
+
+    # Leave part of the sources uncited so the Citations section gets compacted
+    cited_range = sources * 3 // 4
+
+    tokens = []
+    for position in range(words):
+        tokens.append(rng.choice(vocabulary))
+        if position % 25 == 0:
+            first = rng.randint(1, cited_range - 3)
+            tokens.append(rng.choice([
+                f"[{first}]",
+                f"[{first}, {rng.randint(1, cited_range)}]",
+                f"[{first}-{first + 3}]",
+                f"[{rng.randint(1, cited_range)}, {first}-{first + 2}]",
+            ]))
+        if position % 200 == 0:
+            tokens.append("\n\n")
+
+    citations = "<br>\n".join(
+        f"[{data['index']}]. [{data['title']}]({url}) - {url}" for url, data in source_metadata.items()
+    ) + "<br>"
+    report = f"# Company Intelligence Report\n\n{' '.join(tokens)}\n\n## Citations\n{citations}\n"
+    return report, source_metadata
+
+
+def main():
+    report, source_metadata = build_report()
+    print(f"Report: {len(report.split())} words, {len(report)} characters, {len(source_metadata)} sources")
+
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fix_citation_sequence(report, source_metadata)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(f"fix_citation_sequence: median {timings[len(timings) // 2] * 1000:.2f}ms, "
+          f"best {timings[0] * 1000:.2f}ms over {RUNS} runs")
+
+    # Sanity checks: numbering is contiguous and the Citations section lists exactly the cited sources
+    body, citations = result.split("## Citations\n", 1)
+    cited = {int(n) for n in re.findall(r'target="_blank">\[(\d+)\]</a>', body)}
+    listed = re.findall(r'^<a href="[^"]+" target="_blank">\[(\d+)\]</a>', citations, re.MULTILINE)
+    assert cited == set(range(1, len(cited) + 1)), "citation numbers are not contiguous"
+    assert [int(n) for n in listed] == sorted(cited), "Citations section does not match the report body"
+    print(f"{len(cited)} sources cited, Citations section compacted to {len(listed)} entries")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
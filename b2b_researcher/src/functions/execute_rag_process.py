@@ -6,9 +6,7 @@ from langchain.text_splitter import CharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from src.types import GraphState
 import json
-from src.utils.openrouter_client import OpenRouterClient
-from src.utils.deepseek_client import DeepseekClient
-from src.utils.fireworks_client import FireworksClient
+from src.utils.client_registry import get_deepseek_client, get_fireworks_client
 import os
 import tiktoken
 import re
@@ -382,48 +380,31 @@ Sources:
         # Use Deepseek R1 model if specified
         if model == "deepseek-r1":
             try:
-                # First try with Deepseek API
+                # Race Deepseek and Fireworks through the provider router, hedging a slow primary
+                providers = []
                 api_key = os.getenv("DEEPSEEK_API_KEY")
-                
                 if api_key:
-                    # Try up to 2 times with Deepseek API
-                    attempts = 0
-                    max_attempts = 2
-                    last_error = None
-                    
-                    while attempts < max_attempts:
-                        try:
-                            # Initialize Deepseek client
-                            deepseek_client = DeepseekClient(api_key=api_key)
-                            
-                            # Get completion from Deepseek
-                            report = deepseek_client.chat_completion(messages, model="deepseek-reasoner")
-                            print(f"INFO [[execute_rag_process]]: Used Deepseek R1 model via Deepseek for {branch} report (attempt {attempts+1})")
-                            return report, source_metadata
-                        except Exception as e:
-                            last_error = e
-                            attempts += 1
-                            print(f"WARNING [[execute_rag_process]]: Error with Deepseek API (attempt {attempts}): {str(e)}")
-                            if attempts < max_attempts:
-                                print(f"INFO [[execute_rag_process]]: Retrying with Deepseek API...")
-                    
-                    print(f"WARNING [[execute_rag_process]]: All Deepseek API attempts failed. Last error: {str(last_error)}")
+                    providers.append((
+                        "deepseek",
+                        lambda attempt: get_deepseek_client(api_key).chat_completion(messages, model="deepseek-reasoner")
+                    ))
                 else:
                     print(f"WARNING [[execute_rag_process]]: Deepseek API key not configured")
                 
-                # Fall back to Fireworks if Deepseek failed or key not available
                 fireworks_api_key = os.getenv("FIREWORKS_API_KEY")
                 if fireworks_api_key:
+                    providers.append((
+                        "fireworks",
+                        lambda attempt: get_fireworks_client(fireworks_api_key).chat_completion(messages)
+                    ))
+                
+                if providers:
                     try:
-                        # Initialize Fireworks client
-                        fireworks_client = FireworksClient(api_key=fireworks_api_key)
-                        
-                        # Get completion from Fireworks
-                        report = fireworks_client.chat_completion(messages)
-                        print(f"INFO [[execute_rag_process]]: Used Deepseek R1 model via Fireworks.ai as fallback for {branch} report")
+                        provider, report = self.provider_router.complete(providers)
+                        print(f"INFO [[execute_rag_process]]: Used Deepseek R1 model via {provider} for {branch} report")
                         return report, source_metadata
                     except Exception as e:
-                        print(f"ERROR [[execute_rag_process]]: Error with Fireworks.ai fallback: {str(e)}")
+                        print(f"ERROR [[execute_rag_process]]: All Deepseek R1 providers failed. Last error: {str(e)}")
                         print("Falling back to default model")
                 else:
                     print(f"WARNING [[execute_rag_process]]: Neither Deepseek nor Fireworks API keys configured, falling back to default model")
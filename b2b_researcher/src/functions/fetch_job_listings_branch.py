@@ -1,4 +1,3 @@
-import os
 import re
 import agentstack
 import requests
@@ -8,6 +7,7 @@ from bs4 import BeautifulSoup
 from typing import Dict, Any, List, Optional, Tuple, Set
 from src.types import GraphState
 from exa_py import Exa
+from src.utils.client_registry import get_exa_client
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -1647,7 +1647,7 @@ def fetch_job_listings_branch(self, state: GraphState, branch: str) -> GraphStat
     
     try:
         # Set up Exa client
-        exa = Exa(api_key=os.getenv("EXA_API_KEY"))
+        exa = get_exa_client()
         
         # Create fetcher instance
         fetcher = JobListingFetcher(branch, state, exa)
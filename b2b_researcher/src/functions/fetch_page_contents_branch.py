@@ -1,12 +1,11 @@
 import agentstack
 from typing import Dict, Any, List
-from exa_py import Exa
+from src.utils.client_registry import get_exa_client
 from exa_py.api import Result
 from src.types import GraphState, SourceDocument
 from langchain.schema import SystemMessage
 from src.tools.exa import get_contents
 import json
-import os
 from datetime import datetime, timedelta
 import time
 import requests
@@ -69,7 +68,7 @@ def fetch_page_contents_branch(self, state: GraphState, branch: str) -> GraphSta
         
         # Set up Exa client
         try:
-            exa = Exa(api_key=os.getenv("EXA_API_KEY"))
+            exa = get_exa_client()
         except Exception as e:
             print(f"DEBUG [{branch}] [[fetch_page_contents_branch]]: Error setting up Exa client: {str(e)}")
             return state
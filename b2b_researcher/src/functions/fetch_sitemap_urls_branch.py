@@ -1,13 +1,11 @@
-import os
 import agentstack
 from typing import Dict, Any, List, Optional
 from src.types import GraphState
-import requests
 from bs4 import BeautifulSoup
 import xml.etree.ElementTree as ET
 from urllib.parse import urljoin
 import json
-from exa_py import Exa
+from src.utils.client_registry import get_exa_client, get_http_session
 
 @agentstack.task
 def fetch_sitemap_urls_branch(self, state: GraphState, branch: str) -> GraphState:
@@ -34,7 +32,7 @@ def fetch_sitemap_urls_branch(self, state: GraphState, branch: str) -> GraphStat
         try_url = urljoin(url, path)
         print(f"DEBUG [{branch}] [[fetch_sitemap_urls_branch]]: Trying sitemap at: {try_url}")
         
-        response = requests.get(try_url)
+        response = get_http_session().get(try_url)
         if response.status_code == 200:
             sitemap_content = response.text
             sitemap_url = try_url
@@ -76,7 +74,7 @@ def fetch_sitemap_urls_branch(self, state: GraphState, branch: str) -> GraphStat
             print(f"DEBUG [{branch}] [[fetch_sitemap_urls_branch]]: Chosen sitemap from index: {chosen_sitemap}")
             
             # Fetch the chosen sitemap
-            response = requests.get(chosen_sitemap)
+            response = get_http_session().get(chosen_sitemap)
             if response.status_code != 200:
                 raise ValueError(f"Failed to fetch chosen sitemap: {chosen_sitemap}")
             
@@ -89,7 +87,7 @@ def fetch_sitemap_urls_branch(self, state: GraphState, branch: str) -> GraphStat
         print(f"DEBUG [{branch}] [[fetch_sitemap_urls_branch]]: Failed to fetch sitemap. Using Exa fallback to get links from homepage.")
         try:
             # Fallback: Use Exa to get links from the homepage
-            exa = Exa(api_key=os.getenv("EXA_API_KEY"))
+            exa = get_exa_client()
 
             exa_response = exa.get_contents(
                 urls=[url],
@@ -1,97 +1,117 @@
-from typing import Dict, Any, Union
+from typing import Dict, List, Union
 import re
 
+# One bracketed citation group: [3], [1, 3-5], [2,4], [Citation: 7]
+_CITATION_GROUP_PATTERN = re.compile(
+    r'\[(?:Citation:\s*)?(\d+(?:\s*[-–]\s*\d+)?(?:\s*,\s*\d+(?:\s*[-–]\s*\d+)?)*)\](?!\()'
+)
+_CITATION_ITEM_PATTERN = re.compile(r'(\d+)(?:\s*[-–]\s*(\d+))?')
+_CITATIONS_HEADING_PATTERN = re.compile(r'^## Citations[ \t]*$', re.MULTILINE)
+_NEXT_HEADING_PATTERN = re.compile(r'^## ', re.MULTILINE)
+
+# Ranges longer than this are treated as text (e.g. "[1-2024]") rather than expanded
+_MAX_RANGE_SPAN = 50
+
+
+def _expand_citation_group(group: str) -> List[int]:
+    """Expand the inside of a citation group like "1, 3-5" into [1, 3, 4, 5]."""
+    indices = []
+    for start, end in _CITATION_ITEM_PATTERN.findall(group):
+        first = int(start)
+        last = int(end) if end else first
+        if last < first or last - first > _MAX_RANGE_SPAN:
+            indices.append(first)
+            continue
+        indices.extend(range(first, last + 1))
+    return indices
+
+
 def fix_citation_sequence(report: str, source_metadata: Dict[str, Dict[str, Union[str, int]]]) -> str:
     """Post-process report to fix citation numbering and formatting.
-    
+
+    Citations used in the report body are renumbered 1..n in order of their original index,
+    each number is linked to its source, and the Citations section is rebuilt with only the
+    sources that were actually cited. Groups like "[1, 3-5]" are expanded to one link per source.
+
     Args:
         report: The full report text
         source_metadata: Dictionary mapping URLs to metadata including citation indices
-        
+
     Returns:
         Updated report with fixed citation sequence
     """
     try:
         print(f"DEBUG [[fix_citation_sequence]]: Starting citation renumbering")
-        
-        # Step 1: Find all citation numbers used in the report
-        # Update regex to match [X] or X format citations
-        citation_pattern = r'\[(\d+)\]'
-        used_citations = re.findall(citation_pattern, report)
-        
-        # Check for potential citations without brackets
-        alternate_pattern = r'(?<!\[)(\d+)(?!\])'
-        potential_citations = re.findall(alternate_pattern, report)
-        
-        # Filter out false positives that are likely not citations
-        # (only include if they match known source indices)
-        valid_indices = {data["index"] for data in source_metadata.values()}
-        additional_citations = [c for c in potential_citations 
-                              if int(c) in valid_indices]
-        
-        # Combine all citations
-        used_citations.extend(additional_citations)
-        used_citation_indices = set([int(c) for c in used_citations])
-        
+
+        # Step 1: Build the index -> (url, metadata) lookup once
+        sources_by_index = {}
+        for url, data in source_metadata.items():
+            index = data.get("index")
+            if isinstance(index, int) and index not in sources_by_index:
+                sources_by_index[index] = (url, data)
+
+        # Only the body is scanned; the existing Citations section lists every source
+        heading = _CITATIONS_HEADING_PATTERN.search(report)
+        if heading:
+            body = report[:heading.start()]
+            next_heading = _NEXT_HEADING_PATTERN.search(report, heading.end())
+            tail = report[next_heading.start():] if next_heading else ""
+        else:
+            body, tail = report, ""
+
+        # Step 2: Tokenize the body in one pass, keeping text and citation groups in order
+        pieces: List[Union[str, List[int]]] = []
+        used_citation_indices = set()
+        position = 0
+        for match in _CITATION_GROUP_PATTERN.finditer(body):
+            indices = [i for i in _expand_citation_group(match.group(1)) if i in sources_by_index]
+            if not indices:
+                continue  # Not a known citation, leave the text untouched
+            pieces.append(body[position:match.start()])
+            pieces.append(indices)
+            used_citation_indices.update(indices)
+            position = match.end()
+        pieces.append(body[position:])
+
         print(f"DEBUG [[fix_citation_sequence]]: Found {len(used_citation_indices)} unique citations in report")
-        
-        # Step 2: Create mapping from old to new citation numbers
-        citation_map = {old_idx: new_idx + 1 
+
+        # Step 3: Map old to new citation numbers and render linked citations
+        citation_map = {old_idx: new_idx + 1
                         for new_idx, old_idx in enumerate(sorted(used_citation_indices))}
-        
-        # Step 3: Replace in-text citations with new numbers and make them hyperlinks
-        def replace_citation(match):
-            old_num = int(match.group(1))
-            if old_num not in citation_map:
-                return match.group(0)  # Return the original if not in our map
-            
-            new_num = citation_map[old_num]
-            
-            # Find the URL for this citation
-            source_url = "#"
-            for url, data in source_metadata.items():
-                if data.get("index") == old_num:
-                    source_url = url
-                    break
-                    
-            return f'<a href="{source_url}" target="_blank">[{new_num}]</a>'
-        
-        text_with_fixed_citations = re.sub(citation_pattern, replace_citation, report)
-        
+
+        output = []
+        for piece in pieces:
+            if isinstance(piece, str):
+                output.append(piece)
+                continue
+            seen = set()
+            for old_num in piece:
+                if old_num in seen:
+                    continue
+                seen.add(old_num)
+                source_url = sources_by_index[old_num][0]
+                output.append(f'<a href="{source_url}" target="_blank">[{citation_map[old_num]}]</a>')
+
         # Step 4: Create new Citations section with only used sources
-        citations_section = re.search(r'## Citations\n(.*?)(?=##|\Z)', text_with_fixed_citations, re.DOTALL)
-        if citations_section:
-            # Extract current Citations section
-            old_citations = citations_section.group(0)
-            
-            # Create new Citations section
-            new_citations = "## Citations\n"
-            # Add sources used count
-            new_citations += f"{len(used_citation_indices)} sources used out of {len(source_metadata)} total sources.\n\n"
-            
-            # Add each used citation with new numbering
-            used_source_metadata = sorted(
-                [(url, data) for url, data in source_metadata.items() 
-                 if data["index"] in used_citation_indices],
-                key=lambda x: citation_map[x[1]["index"]]
-            )
-            
-            for url, metadata in used_source_metadata:
-                new_num = citation_map[metadata["index"]]
+        if heading:
+            citation_lines = ["## Citations\n",
+                              f"{len(used_citation_indices)} sources used out of {len(source_metadata)} total sources.\n\n"]
+            for old_num in sorted(used_citation_indices):
+                url, metadata = sources_by_index[old_num]
                 title = metadata.get("title", "Source")
                 # Format citation: only hyperlink the number, followed by title and then hyperlinked URL
-                new_citations += f'<a href="{url}" target="_blank">[{new_num}]</a> {title} - <a href="{url}" target="_blank">{url}</a><br>\n'
-            
-            # Replace old Citations section with new one
-            text_with_fixed_citations = text_with_fixed_citations.replace(old_citations, new_citations)
-            
+                citation_lines.append(
+                    f'<a href="{url}" target="_blank">[{citation_map[old_num]}]</a> {title} - <a href="{url}" target="_blank">{url}</a><br>\n'
+                )
+            output.extend(citation_lines)
+            output.append(tail)
             print(f"DEBUG [[fix_citation_sequence]]: Successfully replaced Citations section")
         else:
             print(f"WARNING [[fix_citation_sequence]]: Could not find Citations section in report")
-        
-        return text_with_fixed_citations
-        
+
+        return "".join(output)
+
     except Exception as e:
         print(f"ERROR [[fix_citation_sequence]]: Error fixing citations: {str(e)}")
         # Return original report if something goes wrong
-        return report
\ No newline at end of file
+        return report
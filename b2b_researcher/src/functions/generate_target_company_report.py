@@ -4,8 +4,9 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from langchain.docstore.document import Document
 from src.types import GraphState
-from src.utils.fireworks_client import FireworksClient
-from src.utils.deepseek_client import DeepseekClient
+from src.utils.client_registry import get_deepseek_client, get_fireworks_client, get_openai_client
+from src.utils.provider_router import HedgeAttempt, HedgeCancelled
+from src.utils.streaming import strip_code_fences_stream
 from src.prompts.target_report_templates import (
     COMPANY_OVERVIEW_TEMPLATE,
     OPEN_POSITIONS_TEMPLATE,
@@ -16,13 +17,50 @@ from src.prompts.target_report_templates import (
     TARGET_FOCUS_AREAS
 )
 
+def _complete_section(
+    self,
+    client,
+    messages: List[Dict[str, str]],
+    section_name: str,
+    attempt: Optional[HedgeAttempt] = None
+) -> str:
+    """Get a section completion, forwarding content deltas to self.on_section_delta if it is set.
+    
+    When racing other providers, the stream claims the race on its first delta so only one provider
+    ever reaches the listener, and stops as soon as it is cancelled. If it fails after that, the router's
+    `on_failover` tells listeners to discard the partial section. Code fence markers are removed from
+    the deltas, as they are from the finished section.
+    """
+    on_section_delta = getattr(self, "on_section_delta", None)
+    if on_section_delta is None:
+        return client.chat_completion(messages)
+    
+    parts = []
+    stream = client.chat_completion_stream(messages)
+    try:
+        for delta in strip_code_fences_stream(stream):
+            if attempt is not None and (attempt.cancelled.is_set() or (not parts and not attempt.claim())):
+                raise HedgeCancelled(f"{section_name} stream cancelled")
+            parts.append(delta)
+            on_section_delta(section_name, delta, False)
+    except HedgeCancelled:
+        raise
+    except Exception:
+        # Outside a race nothing else tells listeners to discard the partial section
+        if parts and attempt is None:
+            on_section_delta(section_name, "", True)
+        raise
+    finally:
+        # Closing the generator closes the underlying HTTP stream
+        stream.close()
+    return "".join(parts)
+
 def generate_section_with_deepseek(self, prompt: str, section_name: str) -> str:
     """Generate a report section using the Deepseek API directly or via Fireworks.ai."""
     # Import required modules at function level to prevent UnboundLocalError
     import os
     import re
     import tiktoken
-    from openai import OpenAI
     
     try:
         # Create output directory if it doesn't exist
@@ -77,55 +115,57 @@ def generate_section_with_deepseek(self, prompt: str, section_name: str) -> str:
             }
         ]
         
-        # First try with Deepseek API
+        # Reuse a section generated for the same prompt on an earlier run when the completion cache is enabled
+        completion_cache = getattr(self, "completion_cache", None)
+        if completion_cache is not None:
+            cached = completion_cache.get("deepseek-r1", "deepseek-reasoner", messages)
+            if cached is not None:
+                print(f"INFO [[generate_section_with_deepseek]]: Using cached {section_name} section")
+                cached = self._strip_markdown_code_blocks(cached)
+                on_section_delta = getattr(self, "on_section_delta", None)
+                if on_section_delta is not None:
+                    on_section_delta(section_name, cached, False)
+                return cached
+        
+        # Race DeepSeek and Fireworks through the provider router, hedging a slow primary
+        providers = []
         api_key = os.getenv("DEEPSEEK_API_KEY")
         if api_key:
-            # Try up to 2 times with Deepseek API
-            attempts = 0
-            max_attempts = 2
-            last_error = None
-            
-            while attempts < max_attempts:
-                try:
-                    # Initialize Deepseek client
-                    deepseek_client = DeepseekClient(api_key=api_key)
-                    
-                    # Get completion from Deepseek
-                    section_content = deepseek_client.chat_completion(messages)
-                    print(f"INFO [[generate_section_with_deepseek]]: Generated {section_name} section using DeepSeek API (attempt {attempts+1})")
-                    
-                    # Strip markdown code block markers if present
-                    section_content = self._strip_markdown_code_blocks(section_content)
-                    
-                    return section_content
-                except Exception as e:
-                    last_error = e
-                    attempts += 1
-                    print(f"WARNING [[generate_section_with_deepseek]]: Error with DeepSeek API (attempt {attempts}): {str(e)}")
-                    if attempts < max_attempts:
-                        print(f"INFO [[generate_section_with_deepseek]]: Retrying with DeepSeek API...")
-            
-            print(f"WARNING [[generate_section_with_deepseek]]: All DeepSeek API attempts failed. Last error: {str(last_error)}")
+            providers.append((
+                "deepseek",
+                lambda attempt: _complete_section(self, get_deepseek_client(api_key), messages, section_name, attempt)
+            ))
         else:
             print(f"WARNING [[generate_section_with_deepseek]]: DeepSeek API key not configured")
         
-        # Fall back to Fireworks if DeepSeek attempts failed or key not available
         fireworks_api_key = os.getenv("FIREWORKS_API_KEY")
         if fireworks_api_key:
+            providers.append((
+                "fireworks",
+                lambda attempt: _complete_section(self, get_fireworks_client(fireworks_api_key), messages, section_name, attempt)
+            ))
+        
+        on_failover = None
+        on_section_delta = getattr(self, "on_section_delta", None)
+        if on_section_delta is not None:
+            # The next provider streams the section from the start, so listeners drop what they received so far
+            on_failover = lambda provider: on_section_delta(section_name, "", True)
+        
+        if providers:
             try:
-                # Initialize Fireworks client
-                fireworks_client = FireworksClient(api_key=fireworks_api_key)
+                provider, section_content = self.provider_router.complete(providers, on_failover=on_failover)
+                print(f"INFO [[generate_section_with_deepseek]]: Generated {section_name} section using {provider}")
                 
-                # Get completion from Fireworks
-                section_content = fireworks_client.chat_completion(messages)
-                print(f"INFO [[generate_section_with_deepseek]]: Generated {section_name} section using Fireworks.ai as fallback")
+                # Both providers serve the same model, so the answer is cached under the model rather than the provider
+                if completion_cache is not None:
+                    completion_cache.set("deepseek-r1", "deepseek-reasoner", messages, section_content)
                 
                 # Strip markdown code block markers if present
                 section_content = self._strip_markdown_code_blocks(section_content)
                 
                 return section_content
             except Exception as e:
-                print(f"WARNING [[generate_section_with_deepseek]]: Error with Fireworks.ai fallback: {str(e)}")
+                print(f"WARNING [[generate_section_with_deepseek]]: All DeepSeek/Fireworks providers failed. Last error: {str(e)}")
                 print(f"INFO [[generate_section_with_deepseek]]: Falling back to default model")
         else:
             print(f"WARNING [[generate_section_with_deepseek]]: Neither DeepSeek nor Fireworks API keys configured")
@@ -133,8 +173,8 @@ def generate_section_with_deepseek(self, prompt: str, section_name: str) -> str:
         
         # Fall back to default model if both Deepseek and Fireworks fail or keys not available
         try:
-            # Use OpenAI client directly
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            # Use the shared OpenAI client
+            client = get_openai_client()
             
             # Format messages for OpenAI API - keep original roles (including "developer")
             api_messages = []
@@ -12,7 +12,7 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Any, Union, Optional, Tuple
+from typing import List, Dict, Any, Union, Optional, Tuple, Callable
 from typing_extensions import TypedDict, Annotated
 from dataclasses import dataclass
 from langchain.docstore.document import Document
@@ -38,6 +38,9 @@ import agentstack
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
+from src.utils.provider_router import ProviderRouter
+from src.utils.client_registry import get_openai_client
+from src.utils.completion_cache import CompletionCache
 
 # Import report templates
 from src.prompts.user_report_templates import (
@@ -97,11 +100,14 @@ from src.functions.generate_target_company_report import generate_section_with_d
 # Define the main graph class.
 ###############################################################################
 class B2bresearcherGraph:
-    def __init__(self, enable_db_save: bool = True):
+    def __init__(self, enable_db_save: bool = True, on_section_delta: Optional[Callable[[str, str, bool], None]] = None):
         """Initialize the B2bresearcherGraph with current date and token tracking.
         
         Args:
             enable_db_save (bool): Whether to save data to the database. Defaults to True.
+            on_section_delta (Callable, optional): Called as (section_name, delta, reset) while report sections
+                stream in. `reset` is True when a provider failed mid-stream and the partial section should be discarded.
+                When None, sections are generated without streaming.
         """
         from datetime import datetime
         self.analysis_date = datetime.now().strftime("%Y-%m-%d")
@@ -109,6 +115,15 @@ class B2bresearcherGraph:
         self._state = None
         self._error = None
         self.enable_db_save = enable_db_save
+        self.on_section_delta = on_section_delta
+        
+        # Hedged routing between Deepseek R1 providers; PROVIDER_HEDGE_DELAY pins the hedge delay in seconds,
+        # otherwise the primary's observed p95 latency is used
+        hedge_delay = os.getenv("PROVIDER_HEDGE_DELAY")
+        self.provider_router = ProviderRouter(hedge_delay=float(hedge_delay) if hedge_delay else None)
+        
+        # Opt-in completion cache (LLM_CACHE=on|replay) so reruns skip prompts that were already answered
+        self.completion_cache = CompletionCache.from_env()
         
         if not enable_db_save:
             logging.info("Database saving is disabled. No data will be saved to the database.")
@@ -227,13 +242,10 @@ class B2bresearcherGraph:
 
     def track_chat_completion(self, branch: str, messages: list) -> str:
         """Track tokens for chat completion and return response"""
-        # Import OpenAI
-        import os
         import tiktoken
-        from openai import OpenAI
         
-        # Use OpenAI client directly
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Use the shared OpenAI client so connections are kept alive between calls
+        client = get_openai_client()
         
         # Format messages for OpenAI API - keep original roles (including "developer")
         api_messages = []
@@ -363,6 +375,15 @@ class B2bresearcherGraph:
         costs = self.calculate_costs()
         print("\nGRAND TOTAL:                 ${costs['total']:.4f}")
         
+        if self.completion_cache is not None:
+            cache_stats = self.completion_cache.stats()
+            print("\nCompletion Cache:")
+            print(f"  Mode:      {cache_stats['mode']}")
+            print(f"  Hits:      {cache_stats['hits']:,}")
+            print(f"  Misses:    {cache_stats['misses']:,}")
+            print(f"  Hit Rate:  {cache_stats['hit_rate']:.1%}")
+            print(f"  Entries:   {cache_stats['entries']:,}")
+        
         print("\n" + "=" * 80)
     
     # ----- Tasks for each branch -----
@@ -1139,13 +1160,10 @@ class B2bresearcherGraph:
         """Format job listings into a readable summary."""
         return format_job_listings(self, job_listings)
 
-    def chat_completion(self, messages: List[Dict[str, str]]) -> str:
-        """Get chat completion from OpenAI."""
-        import os
-        from openai import OpenAI
-        
-        # Use OpenAI client directly
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def chat_completion(self, messages: List[Dict[str, str]], model: str = "o3-mini", **params) -> str:
+        """Get chat completion from OpenAI. Extra keyword arguments are passed to the API as request parameters."""
+        # Use the shared OpenAI client so connections are kept alive between calls
+        client = get_openai_client()
         
         # Format messages for OpenAI API - keep original roles (including "developer")
         api_messages = []
@@ -1156,23 +1174,33 @@ class B2bresearcherGraph:
         if not api_messages:
             api_messages = [{"role": "user", "content": messages[-1]["content"]}]
         
+        # Answer repeated prompts from the completion cache when it is enabled
+        if self.completion_cache is not None:
+            cached = self.completion_cache.get("openai", model, api_messages, params)
+            if cached is not None:
+                return cached
+        
         # For token counting
         import tiktoken
         encoder = tiktoken.get_encoding("cl100k_base")
         input_text = " ".join([m["content"] for m in api_messages])
         input_tokens = len(encoder.encode(input_text))
         
-        # Call API without temperature parameter
+        # Call API without temperature parameter unless the caller sets one
         response = client.chat.completions.create(
-            model="o3-mini",
+            model=model,
             messages=api_messages,
+            **params,
         )
         
         content = response.choices[0].message.content
         output_tokens = len(encoder.encode(content))
         
         # Track tokens
-        self.track_tokens("target", "o3-mini", input_tokens, output_tokens)
+        self.track_tokens("target", model, input_tokens, output_tokens)
+        
+        if self.completion_cache is not None:
+            self.completion_cache.set("openai", model, api_messages, content, params)
         
         return content
 
@@ -1,5 +1,5 @@
 import os
-import requests
+from src.utils.client_registry import get_http_session
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
@@ -18,7 +18,7 @@ def fetch_sitemap_urls(url_to_fetch: str) -> str:
         sitemap_url = urljoin(url_to_fetch, path)
         print(f"Trying sitemap at: {sitemap_url}")  # Debug print
         
-        response = requests.get(sitemap_url)
+        response = get_http_session().get(sitemap_url)
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, "xml")
             urls = [loc.text for loc in soup.find_all("loc")]
@@ -1,6 +1,6 @@
 import os
 import sys
-from exa_py import Exa
+from src.utils.client_registry import get_exa_client
 from typing import List, Dict, Optional, Union, Any
 import logging
 from .retry import retry_on_error
@@ -48,7 +48,7 @@ def search_and_contents(
     Returns a dictionary with keys like "data" where the raw API response is stored.
     """
     logger.debug(f"Initializing Exa with query: {question}")
-    exa = Exa(api_key=API_KEY)
+    exa = get_exa_client(API_KEY)
 
     # Build parameters dictionary
     params = {
@@ -132,7 +132,7 @@ def search(
     """
     Perform a search using Exa's search endpoint with comprehensive options.
     """
-    exa = Exa(api_key=API_KEY)
+    exa = get_exa_client(API_KEY)
     
     # Build parameters with proper API field names
     params = {
@@ -211,7 +211,7 @@ def get_contents(
     """
     Fetch content from URLs using Exa's contents endpoint with comprehensive options.
     """
-    exa = Exa(api_key=API_KEY)
+    exa = get_exa_client(API_KEY)
     
     if isinstance(urls, str):
         # Split by comma and clean up each URL
@@ -271,7 +271,7 @@ def find_similar(
     """
     Find similar links using Exa's findSimilar endpoint with comprehensive options.
     """
-    exa = Exa(api_key=API_KEY)
+    exa = get_exa_client(API_KEY)
     
     # Build parameters
     params = {
@@ -335,7 +335,7 @@ def answer(
     """
     Get an AI-generated answer using Exa's answer endpoint with comprehensive options.
     """
-    exa = Exa(api_key=API_KEY)
+    exa = get_exa_client(API_KEY)
     
     # Build parameters
     params = {
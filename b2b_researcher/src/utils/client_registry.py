@@ -0,0 +1,171 @@
+"""
+Process-wide registry of provider clients.
+Clients are created once per (provider, api key) and shared across threads so TCP/TLS connections
+are pooled and kept alive between calls instead of being re-established for every request.
+
+Timeouts and pool sizes can be configured with environment variables:
+- LLM_HTTP_TIMEOUT: read timeout in seconds for LLM calls (default 90)
+- LLM_CONNECT_TIMEOUT: connect timeout in seconds (default 10)
+- LLM_HTTP_POOL_SIZE: max pooled connections per host (default 20)
+"""
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import os
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()  # Factories may fetch other shared clients while holding it
+_clients: Dict[Tuple[str, Hashable], Any] = {}
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+
+def get_timeout() -> float:
+    """Read timeout in seconds for LLM calls."""
+    return _env_float("LLM_HTTP_TIMEOUT", 90.0)
+
+
+def get_connect_timeout() -> float:
+    """Connect timeout in seconds for LLM calls."""
+    return _env_float("LLM_CONNECT_TIMEOUT", 10.0)
+
+
+def get_pool_size() -> int:
+    """Maximum number of pooled connections kept per host."""
+    return int(_env_float("LLM_HTTP_POOL_SIZE", 20))
+
+
+def _get_or_create(kind: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the cached client for (kind, key), creating it under the registry lock on first use."""
+    cache_key = (kind, key)
+    client = _clients.get(cache_key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            client = factory()
+            _clients[cache_key] = client
+            logger.info(f"Created shared {kind} client")
+        return client
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the shared requests session.
+    Its connection pool is thread-safe and keeps connections alive between requests.
+    """
+    def factory() -> requests.Session:
+        session = requests.Session()
+        pool_size = get_pool_size()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return _get_or_create("http", None, factory)
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    Get a shared OpenAI client.
+
+    Args:
+        api_key (str, optional): API key. Defaults to OPENAI_API_KEY.
+        base_url (str, optional): Base URL for OpenAI-compatible providers.
+    """
+    import httpx
+    from openai import OpenAI
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+
+    def factory():
+        pool_size = get_pool_size()
+        http_client = httpx.Client(
+            timeout=httpx.Timeout(get_timeout(), connect=get_connect_timeout()),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+    return _get_or_create("openai", (api_key, base_url), factory)
+
+
+def get_deepseek_client(api_key: Optional[str] = None):
+    """Get a shared DeepseekClient backed by a pooled OpenAI client."""
+    from src.utils.deepseek_client import DeepseekClient
+
+    api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
+    return _get_or_create(
+        "deepseek",
+        api_key,
+        lambda: DeepseekClient(
+            api_key=api_key,
+            client=get_openai_client(api_key=api_key, base_url=DeepseekClient.BASE_URL),
+        ),
+    )
+
+
+def get_fireworks_client(api_key: Optional[str] = None):
+    """Get a shared FireworksClient using the pooled HTTP session."""
+    from src.utils.fireworks_client import FireworksClient
+
+    api_key = api_key or os.getenv("FIREWORKS_API_KEY")
+    return _get_or_create(
+        "fireworks",
+        api_key,
+        lambda: FireworksClient(
+            api_key=api_key,
+            session=get_http_session(),
+            timeout=(get_connect_timeout(), get_timeout()),
+        ),
+    )
+
+
+def get_openrouter_client(api_key: Optional[str] = None, site_url: Optional[str] = None, site_name: Optional[str] = None):
+    """Get a shared OpenRouterClient using the pooled HTTP session."""
+    from src.utils.openrouter_client import OpenRouterClient
+
+    api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+    return _get_or_create(
+        "openrouter",
+        (api_key, site_url, site_name),
+        lambda: OpenRouterClient(
+            api_key=api_key,
+            site_url=site_url,
+            site_name=site_name,
+            session=get_http_session(),
+            timeout=(get_connect_timeout(), get_timeout()),
+        ),
+    )
+
+
+def get_exa_client(api_key: Optional[str] = None):
+    """Get a shared Exa client."""
+    from exa_py import Exa
+
+    api_key = api_key or os.getenv("EXA_API_KEY")
+    return _get_or_create("exa", api_key, lambda: Exa(api_key=api_key))
+
+
+def reset_clients():
+    """Drop all cached clients, closing pooled connections where possible."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Error closing client: {str(e)}")
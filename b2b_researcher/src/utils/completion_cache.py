@@ -0,0 +1,222 @@
+"""
+Opt-in SQLite cache for LLM completions.
+Entries are keyed by a hash of (provider, model, normalized messages, params), expire after a TTL and are
+evicted least-recently-used once the cache grows past its size limit.
+
+Configured with environment variables:
+- LLM_CACHE: "off" (default), "on" to read and write, or "replay" to answer only from the cache
+  and raise CompletionCacheMiss on a miss (for deterministic test runs)
+- LLM_CACHE_PATH: SQLite file path (default .cache/llm_cache.sqlite in the project root)
+- LLM_CACHE_TTL: entry lifetime in seconds (default 7 days)
+- LLM_CACHE_MAX_ENTRIES: maximum number of entries kept (default 5000)
+"""
+from typing import Any, Callable, Dict, List, Optional
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache", "llm_cache.sqlite"
+)
+
+
+class CompletionCacheMiss(Exception):
+    """Raised in replay mode when a prompt has no cached completion."""
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Reduce messages to role and content, ignoring trailing whitespace and line ending differences."""
+    normalized = []
+    for msg in messages:
+        content = str(msg.get("content", "")).replace("\r\n", "\n")
+        content = re.sub(r"[ \t]+\n", "\n", content).strip()
+        normalized.append({"role": msg.get("role", "user"), "content": content})
+    return normalized
+
+
+def make_cache_key(provider: str, model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable hash of a completion request."""
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "messages": normalize_messages(messages),
+            "params": params or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """SQLite-backed completion cache shared by all threads of the process."""
+
+    MODES = ("on", "replay")
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        mode: str = "on",
+    ):
+        """
+        Args:
+            path (str): SQLite file path, or ":memory:".
+            ttl (float): Seconds before an entry expires.
+            max_entries (int): Entries kept before least-recently-used ones are evicted.
+            mode (str): "on" to read and write, "replay" to only read and raise on misses.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown completion cache mode: {mode}")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_last_access ON completions (last_access)")
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["CompletionCache"]:
+        """Build a cache from LLM_CACHE* environment variables, or return None when caching is off."""
+        mode = os.getenv("LLM_CACHE", "off").lower()
+        if mode in ("", "off", "0", "false"):
+            return None
+        if mode in ("1", "true"):
+            mode = "on"
+        return cls(
+            path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+            ttl=float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600)),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000)),
+            mode=mode,
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": entries,
+            "mode": self.mode,
+        }
+
+    def get(self, provider: str, model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Look up a cached completion.
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss.
+
+        Raises:
+            CompletionCacheMiss: On a miss in replay mode.
+        """
+        key = make_cache_key(provider, model, messages, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM completions WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE completions SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if row is not None:
+            logger.info(f"Completion cache hit for {provider}/{model}")
+            return row[0]
+        if self.mode == "replay":
+            raise CompletionCacheMiss(f"No cached completion for {provider}/{model} (key {key[:12]})")
+        return None
+
+    def set(self, provider: str, model: str, messages: List[Dict[str, Any]], response: str, params: Optional[Dict[str, Any]] = None):
+        """Store a completion. Empty responses and replay mode are ignored."""
+        if self.mode == "replay" or not response:
+            return
+        key = make_cache_key(provider, model, messages, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, provider, model, response, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, now, now + self.ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used ones beyond max_entries. Caller holds the lock."""
+        self._conn.execute("DELETE FROM completions WHERE expires_at <= ?", (now,))
+        count = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM completions WHERE key IN (SELECT key FROM completions ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def get_or_compute(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        compute: Callable[[], str],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Return the cached completion, or call `compute` and cache its result."""
+        cached = self.get(provider, model, messages, params)
+        if cached is not None:
+            return cached
+        response = compute()
+        self.set(provider, model, messages, response, params)
+        return response
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
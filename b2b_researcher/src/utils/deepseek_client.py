@@ -2,31 +2,37 @@
 DeepSeek R1 client utility for accessing DeepSeek's API using the OpenAI client library.
 Uses the 'deepseek-reasoner' model by default and automatically handles role translation and message processing.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 import os
 import logging
 import time
 from openai import OpenAI
+from src.utils.streaming import stream_with_retries, strip_think_stream
 
 
 class DeepseekClient:
     """Client for accessing DeepSeek R1 API with automatic role translation and message processing."""
     
-    def __init__(self, api_key=None):
+    BASE_URL = "https://api.deepseek.com"
+    
+    def __init__(self, api_key=None, client: Optional[OpenAI] = None, timeout: float = 90.0):
         """
         Initialize the Deepseek client.
         
         Args:
             api_key (str, optional): Deepseek API key. Defaults to environment variable.
+            client (OpenAI, optional): Pre-configured OpenAI client pointed at the Deepseek API, e.g. a pooled
+                client from `src.utils.client_registry`. Defaults to a new client.
+            timeout (float, optional): Request timeout in seconds when creating a new client. Defaults to 90.
         """
         self.api_key = api_key or os.environ.get("DEEPSEEK_API_KEY")
         if not self.api_key or self.api_key == "<DEEPSEEK_API_KEY>":
             raise ValueError("Valid Deepseek API key is required. Set DEEPSEEK_API_KEY environment variable, pass api_key parameter, or configure in inputs.yaml.")
         
-        self.client = OpenAI(
+        self.client = client or OpenAI(
             api_key=self.api_key,
-            base_url="https://api.deepseek.com",
-            timeout=90.0  # Add 90-second timeout
+            base_url=self.BASE_URL,
+            timeout=timeout
         )
         logging.info("Initialized Deepseek client")
     
@@ -157,4 +163,54 @@ class DeepseekClient:
                     raise
         
         # If we've exhausted all retries and still have empty responses
-        raise Exception(f"Failed to get non-empty response after {max_retries} attempts")
\ No newline at end of file
+        raise Exception(f"Failed to get non-empty response after {max_retries} attempts")
+    
+    def _iter_stream_deltas(self, params: Dict[str, Any]) -> Iterator[str]:
+        """Yield raw content deltas from a streamed chat completion."""
+        stream = self.client.chat.completions.create(**params)
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+    
+    def chat_completion_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str = "deepseek-reasoner",
+        max_retries: int = 4,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        process_messages: bool = True
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion from Deepseek API, yielding content deltas as they arrive.
+        <think> blocks are stripped incrementally. Retries only happen before the first delta is yielded.
+        
+        Args:
+            messages (List[Dict[str, Any]]): List of message dictionaries.
+            model (str, optional): Model to use. Defaults to "deepseek-reasoner".
+            max_retries (int, optional): Maximum number of connection attempts. Defaults to 4.
+            temperature (float, optional): Sampling temperature. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to None.
+            process_messages (bool, optional): Whether to automatically process messages. Defaults to True.
+            
+        Yields:
+            str: Response content deltas.
+        """
+        logging.info(f"Sending streaming request to Deepseek API with model: {model}")
+        
+        processed_messages = self._process_messages(messages) if process_messages else messages
+        
+        params = {
+            "model": model,
+            "messages": processed_messages,
+            "temperature": temperature,
+            "stream": True
+        }
+        
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        
+        yield from stream_with_retries(lambda: strip_think_stream(self._iter_stream_deltas(params)), max_retries)
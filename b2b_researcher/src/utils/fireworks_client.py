@@ -2,30 +2,36 @@
 Fireworks.ai client utility for accessing DeepSeek R1 (reasoner) via Fireworks.ai API.
 Uses the 'accounts/fireworks/models/deepseek-r1' model by default and automatically handles role translation and message processing.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 import os
 import logging
 import time
 import json
 import requests
 import re
+from src.utils.streaming import iter_sse_content, stream_with_retries, strip_think_stream
 
 
 class FireworksClient:
     """Client for accessing DeepSeek R1 via Fireworks.ai API with automatic role translation and message processing."""
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, session: Optional[requests.Session] = None, timeout=(10.0, 90.0)):
         """
         Initialize the Fireworks client.
         
         Args:
             api_key (str, optional): Fireworks API key. Defaults to environment variable.
+            session (requests.Session, optional): Session whose connection pool is reused across calls, e.g. the
+                shared session from `src.utils.client_registry`. Defaults to a new session.
+            timeout (float or tuple, optional): requests timeout, as seconds or (connect, read). Defaults to (10, 90).
         """
         self.api_key = api_key or os.environ.get("FIREWORKS_API_KEY")
         if not self.api_key or self.api_key == "<FIREWORKS_API_KEY>":
             raise ValueError("Valid Fireworks API key is required. Set FIREWORKS_API_KEY environment variable, pass api_key parameter, or configure in inputs.yaml.")
         
         self.base_url = "https://api.fireworks.ai/inference/v1/chat/completions"
+        self.session = session or requests.Session()
+        self.timeout = timeout
         logging.info("Initialized Fireworks client")
     
     def _process_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
@@ -148,10 +154,11 @@ class FireworksClient:
                     logging.debug(f"Request parameters: {payload}")
                 
                 # Make the API call
-                response = requests.post(
+                response = self.session.post(
                     self.base_url, 
                     headers=headers, 
-                    data=json.dumps(payload)
+                    data=json.dumps(payload),
+                    timeout=self.timeout
                 )
                 response.raise_for_status()  # Raise an exception for HTTP errors
                 
@@ -191,3 +198,63 @@ class FireworksClient:
         
         # If we've exhausted all retries and still have empty responses
         raise Exception(f"Failed to get non-empty response after {max_retries} attempts")
+    
+    def chat_completion_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str = "accounts/fireworks/models/deepseek-r1",
+        max_retries: int = 4,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 20480,
+        process_messages: bool = True
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion from Fireworks API, yielding content deltas as they arrive.
+        <think> blocks are stripped incrementally. Retries only happen before the first delta is yielded.
+        
+        Args:
+            messages (List[Dict[str, Any]]): List of message dictionaries.
+            model (str, optional): Model to use. Defaults to "accounts/fireworks/models/deepseek-r1".
+            max_retries (int, optional): Maximum number of connection attempts. Defaults to 4.
+            temperature (float, optional): Sampling temperature. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 20480.
+            process_messages (bool, optional): Whether to automatically process messages. Defaults to True.
+            
+        Yields:
+            str: Response content deltas.
+        """
+        logging.info(f"Sending streaming request to Fireworks API with model: {model}")
+        
+        processed_messages = self._process_messages(messages) if process_messages else messages
+        
+        payload = {
+            "model": model,
+            "messages": processed_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": 1,
+            "top_k": 40,
+            "presence_penalty": 0,
+            "frequency_penalty": 0,
+            "stream": True
+        }
+        
+        headers = {
+            "Accept": "text/event-stream",
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        
+        def open_stream() -> Iterator[str]:
+            with self.session.post(
+                self.base_url,
+                headers=headers,
+                data=json.dumps(payload),
+                stream=True,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                lines = response.iter_lines(decode_unicode=True)
+                yield from strip_think_stream(iter_sse_content(lines))
+        
+        yield from stream_with_retries(open_stream, max_retries)
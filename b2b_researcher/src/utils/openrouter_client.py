@@ -1,18 +1,19 @@
 """
 OpenRouter client utility for accessing the Deepseek R1 model using requests.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 import requests
 import json
 import os
 import logging
 import time
+from src.utils.streaming import iter_sse_content, stream_with_retries, strip_think_stream
 
 
 class OpenRouterClient:
     """Client for accessing OpenRouter API with Deepseek R1 model."""
     
-    def __init__(self, api_key=None, site_url=None, site_name=None):
+    def __init__(self, api_key=None, site_url=None, site_name=None, session: Optional[requests.Session] = None, timeout=(10.0, 90.0)):
         """
         Initialize the OpenRouter client.
         
@@ -20,6 +21,9 @@ class OpenRouterClient:
             api_key (str, optional): OpenRouter API key. Defaults to environment variable.
             site_url (str, optional): Site URL for rankings. Defaults to None.
             site_name (str, optional): Site name for rankings. Defaults to None.
+            session (requests.Session, optional): Session whose connection pool is reused across calls, e.g. the
+                shared session from `src.utils.client_registry`. Defaults to a new session.
+            timeout (float or tuple, optional): requests timeout, as seconds or (connect, read). Defaults to (10, 90).
         """
         self.api_key = api_key or os.environ.get("OPENROUTER_API_KEY")
         if not self.api_key or self.api_key == "<OPENROUTER_API_KEY>":
@@ -28,6 +32,8 @@ class OpenRouterClient:
         self.site_url = site_url
         self.site_name = site_name
         self.base_url = "https://openrouter.ai/api/v1"
+        self.session = session or requests.Session()
+        self.timeout = timeout
         logging.info(f"Initialized OpenRouter client with site: {self.site_name}")
     
     def chat_completion(self, messages: List[Dict[str, str]], model: str = "deepseek/deepseek-r1:free", max_retries: int = 10) -> str:
@@ -73,10 +79,11 @@ class OpenRouterClient:
                 logging.info(f"Headers: {headers}") if attempts == 1 else None
                 logging.info(f"Payload: {payload}") if attempts == 1 else None
                 
-                response = requests.post(
+                response = self.session.post(
                     url=f"{self.base_url}/chat/completions",
                     headers=headers,
-                    data=json.dumps(payload)
+                    data=json.dumps(payload),
+                    timeout=self.timeout
                 )
                 
                 # Check for successful response
@@ -116,6 +123,54 @@ class OpenRouterClient:
         # If we've exhausted all retries and still have empty responses
         raise Exception(f"Failed to get non-empty response after {max_retries} attempts")
 
+    def chat_completion_stream(self, messages: List[Dict[str, str]], model: str = "deepseek/deepseek-r1:free", max_retries: int = 10) -> Iterator[str]:
+        """
+        Stream a chat completion from OpenRouter, yielding content deltas as they arrive.
+        <think> blocks are stripped incrementally. Retries only happen before the first delta is yielded.
+        
+        Args:
+            messages (List[Dict[str, str]]): List of message dictionaries.
+            model (str, optional): Model to use. Defaults to "deepseek/deepseek-r1:free".
+            max_retries (int, optional): Maximum number of connection attempts. Defaults to 10.
+            
+        Yields:
+            str: Response content deltas.
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        if self.site_url:
+            headers["HTTP-Referer"] = self.site_url
+        if self.site_name:
+            headers["X-Title"] = self.site_name
+        
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+                for msg in messages
+            ],
+            "stream": True
+        }
+        
+        logging.info(f"Sending streaming request to OpenRouter with model: {model}")
+        
+        def open_stream() -> Iterator[str]:
+            with self.session.post(
+                url=f"{self.base_url}/chat/completions",
+                headers=headers,
+                data=json.dumps(payload),
+                stream=True,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                lines = response.iter_lines(decode_unicode=True)
+                yield from strip_think_stream(iter_sse_content(lines))
+        
+        yield from stream_with_retries(open_stream, max_retries)
+
     def handle_error(self, response):
         """
         Handle error responses from the API.
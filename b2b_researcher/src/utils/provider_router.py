@@ -0,0 +1,254 @@
+"""Provider router that hedges LLM calls across providers and picks the primary from observed metrics."""
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from src.utils.monitoring import MetricsRegistry
+from src.utils.circuit_breaker import CircuitBreakerRegistry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgeCancelled(Exception):
+    """Raised by a provider call that noticed it lost the race."""
+
+
+class HedgeAttempt:
+    """Handle passed to each provider call in a race.
+
+    Streaming calls should `claim()` before emitting their first delta and stop
+    (raising HedgeCancelled) once `cancelled` is set. Plain calls can ignore it;
+    the router claims on their behalf when they return.
+    """
+
+    def __init__(self, race: "_Race", provider: str):
+        self.provider = provider
+        self.cancelled = threading.Event()
+        self._race = race
+
+    def claim(self) -> bool:
+        """Try to become the winner of the race. Returns False if another provider already won."""
+        return self._race.claim(self)
+
+
+class _Race:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._attempts: List[HedgeAttempt] = []
+        self.winner: Optional[HedgeAttempt] = None
+
+    def new_attempt(self, provider: str) -> HedgeAttempt:
+        attempt = HedgeAttempt(self, provider)
+        with self._lock:
+            self._attempts.append(attempt)
+        return attempt
+
+    def claim(self, attempt: HedgeAttempt) -> bool:
+        with self._lock:
+            if self.winner is None and not attempt.cancelled.is_set():
+                self.winner = attempt
+                for other in self._attempts:
+                    if other is not attempt:
+                        other.cancelled.set()
+            return self.winner is attempt
+
+    def release(self, attempt: HedgeAttempt):
+        """Give up the win after the winner failed mid-stream so other providers can take over."""
+        with self._lock:
+            if self.winner is attempt:
+                self.winner = None
+
+    def cancel_all(self):
+        with self._lock:
+            for attempt in self._attempts:
+                if attempt is not self.winner:
+                    attempt.cancelled.set()
+
+
+class ProviderRouter:
+    """Run a call against an ordered set of providers, hedging slow primaries.
+
+    The primary is started first. If it has not finished after the hedge delay
+    (its observed p95 latency, or a fixed `hedge_delay`), the next provider is
+    started too and whichever succeeds first wins; the others are cancelled.
+    A failure starts the next provider immediately. Latency and outcome of every
+    finished call are recorded in MetricsRegistry under "llm_provider.<name>",
+    and the primary is chosen from those metrics once enough samples exist.
+    """
+
+    def __init__(
+        self,
+        hedge_delay: Optional[float] = None,
+        default_hedge_delay: float = 30.0,
+        min_hedge_delay: float = 2.0,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Args:
+            hedge_delay (float, optional): Fixed seconds to wait before hedging. Defaults to the primary's p95 latency.
+            default_hedge_delay (float): Delay used until a provider has `min_samples` recorded calls.
+            min_hedge_delay (float): Lower bound for the p95-derived delay.
+            min_samples (int): Calls needed before a provider's metrics are trusted.
+            max_error_rate (float): Providers failing more often than this are demoted.
+            registry (MetricsRegistry, optional): Defaults to the process-wide registry.
+        """
+        self.hedge_delay = hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.registry = registry or MetricsRegistry.get_instance()
+
+    @staticmethod
+    def component(provider: str) -> str:
+        return f"llm_provider.{provider}"
+
+    def _samples(self, provider: str) -> int:
+        metrics = self.registry.metrics.get(self.component(provider))
+        return metrics.total_calls if metrics else 0
+
+    def _is_unhealthy(self, provider: str) -> bool:
+        if self._samples(provider) < self.min_samples:
+            return False
+        metrics = self.registry.metrics[self.component(provider)]
+        return (1.0 - metrics.success_rate) > self.max_error_rate
+
+    def rank(self, providers: Sequence[str]) -> List[str]:
+        """
+        Order providers by expected performance.
+
+        Once every provider has enough samples they are sorted by p95 latency divided by success rate.
+        Before that the given preference order is kept. Unhealthy providers and those with an open
+        circuit breaker always go last.
+        """
+        breakers = CircuitBreakerRegistry.get_instance()
+        order = {name: idx for idx, name in enumerate(providers)}
+        have_history = all(self._samples(name) >= self.min_samples for name in providers)
+
+        def expected_cost(name: str) -> float:
+            if not have_history:
+                return float(order[name])
+            metrics = self.registry.metrics[self.component(name)]
+            return metrics.p95_latency / max(metrics.success_rate, 0.05)
+
+        def key(name: str):
+            blocked = not breakers.get_breaker(self.component(name)).should_allow_request()
+            return (blocked or self._is_unhealthy(name), expected_cost(name), order[name])
+
+        return sorted(providers, key=key)
+
+    def hedge_delay_for(self, provider: str) -> float:
+        """Seconds to wait on `provider` before starting the next one."""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if self._samples(provider) < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.registry.metrics[self.component(provider)].p95_latency, self.min_hedge_delay)
+
+    def _record(self, provider: str, success: bool, latency: float, error: Optional[Exception] = None):
+        self.registry.record_api_call(
+            self.component(provider),
+            success,
+            latency,
+            error_type=error.__class__.__name__ if error else None,
+        )
+        breaker = CircuitBreakerRegistry.get_instance().get_breaker(self.component(provider))
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def complete(
+        self,
+        providers: Sequence[Tuple[str, Callable[[HedgeAttempt], T]]],
+        on_failover: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[str, T]:
+        """
+        Run `providers` as a hedged race.
+
+        Args:
+            providers: (name, call) pairs in preference order. Each call receives a HedgeAttempt.
+            on_failover (Callable, optional): Called with the provider's name when a provider that claimed the
+                race fails, before any other provider is started or resumed. Streaming callers use it to tell
+                listeners to discard the partial output, since the next provider starts over.
+
+        Returns:
+            Tuple[str, T]: Name of the winning provider and its result.
+
+        Raises:
+            Exception: The last provider error when every provider failed.
+        """
+        if not providers:
+            raise ValueError("At least one provider is required")
+
+        calls = dict(providers)
+        queue = self.rank(list(calls))
+        primary = queue[0]
+        race = _Race()
+        pending: Dict[Future, Tuple[str, float, HedgeAttempt]] = {}
+        standby: List[str] = []  # Cancelled providers that can take over if the winner fails mid-stream
+        last_error: Optional[Exception] = None
+        executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="provider-hedge")
+
+        def launch():
+            name = queue.pop(0)
+            logger.info(f"Starting provider {name}")
+            attempt = race.new_attempt(name)
+            pending[executor.submit(calls[name], attempt)] = (name, time.time(), attempt)
+            return time.time()
+
+        try:
+            last_launch = launch()
+            while pending:
+                timeout = None
+                if queue and race.winner is None:
+                    timeout = max(0.0, last_launch + self.hedge_delay_for(primary) - time.time())
+
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"Provider {primary} exceeded hedge delay, hedging with {queue[0]}")
+                    last_launch = launch()
+                    continue
+
+                for future in done:
+                    name, started, attempt = pending.pop(future)
+                    latency = time.time() - started
+                    try:
+                        result = future.result()
+                    except HedgeCancelled:
+                        # If the winner that cancelled it has failed since, it can take over right away
+                        (queue if race.winner is None else standby).append(name)
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Provider {name} failed after {latency:.2f}s: {str(e)}")
+                        self._record(name, False, latency, e)
+                        last_error = e
+                        if race.winner is attempt:
+                            if on_failover is not None:
+                                on_failover(name)
+                            race.release(attempt)
+                            queue[:0] = standby
+                            standby.clear()
+                        continue
+
+                    if race.claim(attempt):
+                        self._record(name, True, latency)
+                        logger.info(f"Provider {name} won in {latency:.2f}s")
+                        return name, result
+                    standby.append(name)
+
+                # Fail over immediately instead of waiting for the hedge delay
+                if not pending and queue:
+                    last_launch = launch()
+
+            raise last_error or Exception("All providers were cancelled")
+        finally:
+            race.cancel_all()
+            # Losing non-streaming calls cannot be interrupted mid-request; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,275 @@
+"""
+Streaming helpers shared by the LLM provider clients.
+Parses server-sent event (SSE) chat completion streams, strips <think> blocks and markdown code fences
+incrementally, and retries streams that fail before producing any content.
+"""
+from typing import Callable, Iterable, Iterator, Optional
+import json
+import time
+import logging
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    """Length of the longest suffix of `text` that is a proper prefix of `tag`."""
+    for length in range(min(len(text), len(tag) - 1), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+class ThinkBlockFilter:
+    """Incrementally removes <think>...</think> blocks from a stream of text deltas.
+
+    Tags may be split across deltas, so any trailing text that could be the start
+    of a tag is held back until the next delta arrives. Leading whitespace of the
+    visible output is dropped to match the non-streaming `.strip()` behaviour.
+    """
+
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._in_think = False
+        self._started = False
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            if text:
+                self._started = True
+        return text
+
+    def feed(self, delta: str) -> str:
+        """
+        Add a delta to the filter.
+
+        Args:
+            delta (str): Raw content delta from the provider.
+
+        Returns:
+            str: Visible content that can be safely emitted now.
+        """
+        self._buffer += delta
+        output = []
+
+        while self._buffer:
+            if self._in_think:
+                end = self._buffer.find(self.CLOSE_TAG)
+                if end == -1:
+                    # Discard thinking text but keep a possible partial closing tag
+                    keep = _partial_tag_length(self._buffer, self.CLOSE_TAG)
+                    self._buffer = self._buffer[len(self._buffer) - keep:]
+                    break
+                self._buffer = self._buffer[end + len(self.CLOSE_TAG):]
+                self._in_think = False
+            else:
+                start = self._buffer.find(self.OPEN_TAG)
+                if start == -1:
+                    keep = _partial_tag_length(self._buffer, self.OPEN_TAG)
+                    output.append(self._buffer[:len(self._buffer) - keep])
+                    self._buffer = self._buffer[len(self._buffer) - keep:]
+                    break
+                output.append(self._buffer[:start])
+                self._buffer = self._buffer[start + len(self.OPEN_TAG):]
+                self._in_think = True
+
+        return self._emit("".join(output))
+
+    def flush(self) -> str:
+        """
+        Release any held-back text at the end of the stream.
+
+        Returns:
+            str: Remaining visible content. Unterminated thinking is discarded.
+        """
+        remaining = "" if self._in_think else self._buffer
+        self._buffer = ""
+        return self._emit(remaining)
+
+
+def strip_think_stream(deltas: Iterable[str]) -> Iterator[str]:
+    """
+    Filter <think> blocks out of a stream of content deltas.
+
+    Args:
+        deltas (Iterable[str]): Raw content deltas.
+
+    Yields:
+        str: Non-empty visible content deltas.
+    """
+    think_filter = ThinkBlockFilter()
+    for delta in deltas:
+        visible = think_filter.feed(delta)
+        if visible:
+            yield visible
+    tail = think_filter.flush()
+    if tail:
+        yield tail
+
+
+class CodeFenceFilter:
+    """Incrementally removes ```markdown and ``` fence markers from a stream of text deltas.
+
+    This matches what `B2bresearcherGraph._strip_markdown_code_blocks` does to a full response, so
+    streamed sections look like the final ones. Text that could be the start of a marker is held back.
+    """
+
+    FENCE = "```"
+    MARKDOWN_FENCE = "```markdown"
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, delta: str) -> str:
+        """
+        Add a delta to the filter.
+
+        Args:
+            delta (str): Content delta.
+
+        Returns:
+            str: Content without fence markers that can be safely emitted now.
+        """
+        self._buffer += delta
+        output = []
+
+        while True:
+            start = self._buffer.find(self.FENCE)
+            if start == -1:
+                keep = _partial_tag_length(self._buffer, self.FENCE)
+                output.append(self._buffer[:len(self._buffer) - keep])
+                self._buffer = self._buffer[len(self._buffer) - keep:]
+                break
+            output.append(self._buffer[:start])
+            rest = self._buffer[start:]
+            if rest.startswith(self.MARKDOWN_FENCE):
+                self._buffer = rest[len(self.MARKDOWN_FENCE):]
+            elif self.MARKDOWN_FENCE.startswith(rest):
+                # The fence may still turn out to be ```markdown
+                self._buffer = rest
+                break
+            else:
+                self._buffer = rest[len(self.FENCE):]
+
+        return "".join(output)
+
+    def flush(self) -> str:
+        """
+        Release any held-back text at the end of the stream.
+
+        Returns:
+            str: Remaining content without fence markers.
+        """
+        remaining = self._buffer
+        self._buffer = ""
+        return remaining.replace(self.MARKDOWN_FENCE, "").replace(self.FENCE, "")
+
+
+def strip_code_fences_stream(deltas: Iterable[str]) -> Iterator[str]:
+    """
+    Filter markdown code fence markers out of a stream of content deltas.
+
+    Args:
+        deltas (Iterable[str]): Content deltas.
+
+    Yields:
+        str: Non-empty content deltas without fence markers.
+    """
+    fence_filter = CodeFenceFilter()
+    for delta in deltas:
+        visible = fence_filter.feed(delta)
+        if visible:
+            yield visible
+    tail = fence_filter.flush()
+    if tail:
+        yield tail
+
+
+def stream_with_retries(open_stream: Callable[[], Iterator[str]], max_retries: int) -> Iterator[str]:
+    """
+    Yield content deltas from `open_stream()`, opening a new stream when one fails or comes back empty.
+    Retries only happen before the first delta is yielded, since retrying after that would duplicate content.
+
+    Args:
+        open_stream (Callable): Starts a request and returns an iterator over its content deltas.
+        max_retries (int): Maximum number of attempts.
+
+    Yields:
+        str: Content deltas from the first stream that produces any.
+    """
+    attempts = 0
+    while attempts < max_retries:
+        attempts += 1
+        yielded = False
+
+        if attempts > 1:
+            logging.info(f"Retry attempt {attempts} of {max_retries}")
+
+        try:
+            deltas = open_stream()
+            try:
+                for delta in deltas:
+                    yielded = True
+                    yield delta
+            finally:
+                # Closes the underlying HTTP stream when the caller stops early
+                close = getattr(deltas, "close", None)
+                if close is not None:
+                    close()
+
+            if yielded:
+                return
+            logging.warning(f"Received empty stream (attempt {attempts} of {max_retries})")
+        except Exception as e:
+            # Once content has been delivered a retry would duplicate it
+            if yielded:
+                raise
+            logging.error(f"Error during attempt {attempts}: {str(e)}")
+            if attempts >= max_retries:
+                raise
+
+        if attempts < max_retries:
+            sleep_time = min(1 * attempts, 5)  # Start with 1s, max 5s
+            logging.info(f"Waiting {sleep_time}s before retry")
+            time.sleep(sleep_time)
+
+    raise Exception(f"Failed to get non-empty response after {max_retries} attempts")
+
+
+def iter_sse_content(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Extract content deltas from an OpenAI-compatible SSE chat completion stream.
+
+    Args:
+        lines (Iterable[str]): Decoded lines of the response body, e.g. `response.iter_lines(decode_unicode=True)`.
+
+    Yields:
+        str: Content deltas in arrival order.
+    """
+    for line in lines:
+        # Skip keep-alive blank lines and SSE comments (e.g. ": OPENROUTER PROCESSING")
+        if not line or line.startswith(":"):
+            continue
+        if not line.startswith("data:"):
+            continue
+
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            logging.warning(f"Skipping malformed stream chunk: {data[:100]}")
+            continue
+
+        if "error" in chunk:
+            raise Exception(f"Stream error: {chunk['error']}")
+
+        choices = chunk.get("choices") or []
+        if not choices:
+            continue
+        content: Optional[str] = (choices[0].get("delta") or {}).get("content")
+        if content:
+            yield content
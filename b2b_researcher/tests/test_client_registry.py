@@ -0,0 +1,89 @@
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+
+from src.utils import client_registry
+
+
+class ClientRegistryTest(unittest.TestCase):
+    def setUp(self):
+        client_registry.reset_clients()
+        self.addCleanup(client_registry.reset_clients)
+        patcher = mock.patch.dict(os.environ, {
+            'FIREWORKS_API_KEY': 'fireworks-key',
+            'OPENROUTER_API_KEY': 'openrouter-key',
+            'OPENAI_API_KEY': 'openai-key',
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ('LLM_HTTP_TIMEOUT', 'LLM_CONNECT_TIMEOUT', 'LLM_HTTP_POOL_SIZE'):
+            os.environ.pop(name, None)
+
+    def test_http_session_reused(self):
+        session = client_registry.get_http_session()
+        assert client_registry.get_http_session() is session
+
+    def test_provider_clients_reused_per_key(self):
+        fireworks = client_registry.get_fireworks_client()
+        assert client_registry.get_fireworks_client() is fireworks
+        assert client_registry.get_fireworks_client("other-key") is not fireworks
+        # every requests-based client posts through the one pooled session
+        assert client_registry.get_openrouter_client().session is fireworks.session
+
+    def test_openai_client_reused_per_base_url(self):
+        client = client_registry.get_openai_client()
+        assert client_registry.get_openai_client() is client
+        assert client_registry.get_openai_client(base_url="https://api.deepseek.com") is not client
+
+    def test_concurrent_first_use_creates_one_client(self):
+        created = []
+
+        def factory():
+            time.sleep(0.05)
+            created.append(object())
+            return created[-1]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client_registry._get_or_create("test", None, factory)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(created) == 1
+        assert all(result is created[0] for result in results)
+
+    def test_reset_clients(self):
+        session = client_registry.get_http_session()
+        with mock.patch.object(session, 'close') as close:
+            client_registry.reset_clients()
+        close.assert_called_once()
+        assert client_registry.get_http_session() is not session
+
+    def test_default_settings(self):
+        assert client_registry.get_timeout() == 90.0
+        assert client_registry.get_connect_timeout() == 10.0
+        assert client_registry.get_pool_size() == 20
+
+    def test_settings_from_env(self):
+        env = {'LLM_HTTP_TIMEOUT': '30', 'LLM_CONNECT_TIMEOUT': '2.5', 'LLM_HTTP_POOL_SIZE': '5'}
+        with mock.patch.dict(os.environ, env):
+            assert client_registry.get_timeout() == 30.0
+            assert client_registry.get_connect_timeout() == 2.5
+            assert client_registry.get_pool_size() == 5
+
+            assert client_registry.get_fireworks_client().timeout == (2.5, 30.0)
+            adapter = client_registry.get_http_session().get_adapter("https://api.fireworks.ai")
+            assert adapter._pool_maxsize == 5
+
+    def test_invalid_settings_ignored(self):
+        env = {'LLM_HTTP_TIMEOUT': 'slow', 'LLM_CONNECT_TIMEOUT': '', 'LLM_HTTP_POOL_SIZE': 'many'}
+        with mock.patch.dict(os.environ, env), self.assertLogs(client_registry.logger, 'WARNING') as logs:
+            assert client_registry.get_timeout() == 90.0
+            assert client_registry.get_connect_timeout() == 10.0
+            assert client_registry.get_pool_size() == 20
+        assert len(logs.output) == 2
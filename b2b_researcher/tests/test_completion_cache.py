@@ -0,0 +1,93 @@
+import os
+import unittest
+from unittest import mock
+
+from src.utils.completion_cache import CompletionCache, CompletionCacheMiss, make_cache_key
+
+MESSAGES = [{"role": "user", "content": "Which industry is example.com in?"}]
+
+
+class CompletionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('src.utils.completion_cache.time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_cache(self, **kwargs) -> CompletionCache:
+        cache = CompletionCache(path=":memory:", **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_get_and_set(self):
+        cache = self.make_cache()
+        assert cache.get("openai", "o3-mini", MESSAGES) is None
+        cache.set("openai", "o3-mini", MESSAGES, "Software")
+        assert cache.get("openai", "o3-mini", MESSAGES) == "Software"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.hit_rate == 0.5
+
+    def test_key_includes_model_and_params(self):
+        cache = self.make_cache()
+        cache.set("openai", "o3-mini", MESSAGES, "Software", {"reasoning_effort": "low"})
+        assert cache.get("openai", "o3-mini", MESSAGES, {"reasoning_effort": "low"}) == "Software"
+        assert cache.get("openai", "o3-mini", MESSAGES, {"reasoning_effort": "high"}) is None
+        assert cache.get("openai", "o3-mini", MESSAGES) is None
+        assert cache.get("openai", "gpt-4", MESSAGES, {"reasoning_effort": "low"}) is None
+
+    def test_key_ignores_whitespace_differences(self):
+        messages = [{"role": "user", "content": "Which industry is example.com in?  \r\n"}]
+        assert make_cache_key("openai", "o3-mini", messages) == make_cache_key("openai", "o3-mini", MESSAGES)
+
+    def test_entries_expire(self):
+        cache = self.make_cache(ttl=60)
+        cache.set("openai", "o3-mini", MESSAGES, "Software")
+        self.now += 59
+        assert cache.get("openai", "o3-mini", MESSAGES) == "Software"
+        self.now += 1
+        assert cache.get("openai", "o3-mini", MESSAGES) is None
+
+    def test_least_recently_used_evicted(self):
+        cache = self.make_cache(max_entries=2)
+        for i in range(2):
+            cache.set("openai", "o3-mini", [{"role": "user", "content": f"prompt {i}"}], f"answer {i}")
+            self.now += 1
+        # reading prompt 0 makes prompt 1 the least recently used
+        assert cache.get("openai", "o3-mini", [{"role": "user", "content": "prompt 0"}]) == "answer 0"
+        self.now += 1
+        cache.set("openai", "o3-mini", [{"role": "user", "content": "prompt 2"}], "answer 2")
+
+        assert cache.stats()["entries"] == 2
+        assert cache.get("openai", "o3-mini", [{"role": "user", "content": "prompt 0"}]) == "answer 0"
+        assert cache.get("openai", "o3-mini", [{"role": "user", "content": "prompt 1"}]) is None
+        assert cache.get("openai", "o3-mini", [{"role": "user", "content": "prompt 2"}]) == "answer 2"
+
+    def test_empty_response_not_cached(self):
+        cache = self.make_cache()
+        cache.set("openai", "o3-mini", MESSAGES, "")
+        assert cache.stats()["entries"] == 0
+
+    def test_replay_miss_raises(self):
+        cache = self.make_cache(mode="replay")
+        with self.assertRaises(CompletionCacheMiss):
+            cache.get("openai", "o3-mini", MESSAGES)
+        # replay mode never writes
+        cache.set("openai", "o3-mini", MESSAGES, "Software")
+        assert cache.stats()["entries"] == 0
+
+    def test_get_or_compute(self):
+        cache = self.make_cache()
+        compute = mock.Mock(return_value="Software")
+        assert cache.get_or_compute("openai", "o3-mini", MESSAGES, compute) == "Software"
+        assert cache.get_or_compute("openai", "o3-mini", MESSAGES, compute) == "Software"
+        compute.assert_called_once()
+
+    def test_from_env(self):
+        with mock.patch.dict(os.environ, {"LLM_CACHE": "off"}):
+            assert CompletionCache.from_env() is None
+        env = {"LLM_CACHE": "replay", "LLM_CACHE_PATH": ":memory:", "LLM_CACHE_TTL": "30", "LLM_CACHE_MAX_ENTRIES": "10"}
+        with mock.patch.dict(os.environ, env):
+            cache = CompletionCache.from_env()
+        self.addCleanup(cache.close)
+        assert (cache.mode, cache.ttl, cache.max_entries) == ("replay", 30.0, 10)
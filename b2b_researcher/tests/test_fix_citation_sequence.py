@@ -0,0 +1,87 @@
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from src.functions.fix_citation_sequence import fix_citation_sequence
+
+SOURCES = {
+    f"https://example.com/{i}": {"index": i, "title": f"Source {i}"}
+    for i in range(1, 8)
+}
+
+
+def link(url_index: int, number: int) -> str:
+    return f'<a href="https://example.com/{url_index}" target="_blank">[{number}]</a>'
+
+
+def citation_line(url_index: int, number: int) -> str:
+    url = f"https://example.com/{url_index}"
+    return f'{link(url_index, number)} Source {url_index} - <a href="{url}" target="_blank">{url}</a><br>\n'
+
+
+def fix(report: str, sources: dict = SOURCES) -> str:
+    with redirect_stdout(StringIO()):
+        return fix_citation_sequence(report, sources)
+
+
+class FixCitationSequenceTest(unittest.TestCase):
+    def test_renumbered_in_order_of_original_index(self):
+        report = "Growth [5] and churn [2].\n\n## Citations\n[2] old\n[5] old\n"
+        result = fix(report)
+        assert result.startswith(f"Growth {link(5, 2)} and churn {link(2, 1)}.\n\n")
+
+    def test_ranges_expanded(self):
+        result = fix("Several studies [3-5] and [1, 6–7].\n")
+        # source 2 isn't cited, so the sources after it move up a number
+        expected = "".join(link(i, n) for i, n in [(3, 2), (4, 3), (5, 4)])
+        assert f"studies {expected} and " in result
+        assert result.endswith(f"{link(1, 1)}{link(6, 5)}{link(7, 6)}.\n")
+
+    def test_long_ranges_not_expanded(self):
+        sources = {f"https://example.com/{i}": {"index": i, "title": f"Source {i}"} for i in range(1, 60)}
+        # a span over 50 is more likely a year range than a list of sources, so only its start is cited
+        result = fix("Trends [2-53] and [1-52].\n", sources)
+        assert result == f"Trends {link(2, 2)} and {link(1, 1)}.\n"
+
+        result = fix("Trends [1-51].\n", sources)
+        assert result.count("<a href=") == 51
+
+    def test_unknown_citations_left_alone(self):
+        assert fix("See [99] and [Note].\n") == "See [99] and [Note].\n"
+
+    def test_bare_numbers_not_matched(self):
+        result = fix("Revenue grew 3 percent in 5 regions [4].\n")
+        assert result == f"Revenue grew 3 percent in 5 regions {link(4, 1)}.\n"
+
+    def test_markdown_links_not_matched(self):
+        assert fix("Read [2](https://example.com/2).\n") == "Read [2](https://example.com/2).\n"
+
+    def test_only_body_scanned(self):
+        report = (
+            "Intro [6].\n\n"
+            "## Citations\n[1] Source 1\n[6] Source 6\n[7] Source 7\n"
+            "## Appendix\nMore [7].\n"
+        )
+        result = fix(report)
+        # citations listed in the old section don't count as used; the section after it is kept as is
+        assert "1 sources used out of 7 total sources." in result
+        assert citation_line(6, 1) in result
+        assert "Source 7" not in result
+        assert result.endswith("## Appendix\nMore [7].\n")
+
+    def test_citations_section_rebuilt(self):
+        report = "A [3]. B [1, 3].\n\n## Citations\n[1] stale entry\n[2] unused\n[3] stale entry\n"
+        result = fix(report)
+        assert result == (
+            f"A {link(3, 2)}. B {link(1, 1)}{link(3, 2)}.\n\n"
+            "## Citations\n"
+            "2 sources used out of 7 total sources.\n\n"
+            + citation_line(1, 1)
+            + citation_line(3, 2)
+        )
+
+    def test_missing_citations_section(self):
+        report = "A [2] and [4].\n"
+        result = fix(report)
+        assert result == f"A {link(2, 1)} and {link(4, 2)}.\n"
+        assert "## Citations" not in result
@@ -0,0 +1,118 @@
+import time
+import threading
+import unittest
+from unittest import mock
+
+from src.utils.circuit_breaker import CircuitBreakerRegistry
+from src.utils.monitoring import MetricsRegistry
+from src.utils.provider_router import HedgeAttempt, HedgeCancelled, ProviderRouter
+
+
+def stream(attempt: HedgeAttempt, deltas: list[str], events: list[str]) -> str:
+    """A streaming provider call: claims the race on its first delta and emits deltas like _complete_section."""
+    for i, delta in enumerate(deltas):
+        if attempt.cancelled.is_set() or (i == 0 and not attempt.claim()):
+            raise HedgeCancelled(f"{attempt.provider} cancelled")
+        events.append(f"{attempt.provider}:{delta}")
+    return "".join(deltas)
+
+
+class ProviderRouterTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        patcher = mock.patch.object(CircuitBreakerRegistry, "_instance", CircuitBreakerRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def router(self, hedge_delay: float) -> ProviderRouter:
+        return ProviderRouter(hedge_delay=hedge_delay, registry=self.registry)
+
+    def test_primary_wins(self):
+        calls = []
+        result = self.router(10).complete([
+            ("deepseek", lambda attempt: calls.append("deepseek") or "report"),
+            ("fireworks", lambda attempt: calls.append("fireworks") or "other"),
+        ])
+        assert result == ("deepseek", "report")
+        assert calls == ["deepseek"]
+        assert self.registry.metrics["llm_provider.deepseek"].successful_calls == 1
+
+    def test_slow_primary_hedged(self):
+        attempts = {}
+
+        def slow(attempt):
+            attempts["deepseek"] = attempt
+            attempt.cancelled.wait(5)
+            raise HedgeCancelled("deepseek cancelled")
+
+        start = time.monotonic()
+        result = self.router(0.05).complete([("deepseek", slow), ("fireworks", lambda attempt: "fast")])
+        assert result == ("fireworks", "fast")
+        assert time.monotonic() - start < 2
+        assert attempts["deepseek"].cancelled.is_set()
+
+    def test_failover_on_error(self):
+        def failing(attempt):
+            raise ConnectionError("deepseek unavailable")
+
+        start = time.monotonic()
+        # The hedge delay is long, so a quick result means the failure started the next provider at once
+        result = self.router(30).complete([("deepseek", failing), ("fireworks", lambda attempt: "report")])
+        assert result == ("fireworks", "report")
+        assert time.monotonic() - start < 2
+        metrics = self.registry.metrics["llm_provider.deepseek"]
+        assert metrics.failed_calls == 1
+        assert metrics.error_counts["ConnectionError"] == 1
+
+    def test_all_providers_fail(self):
+        def failing(attempt):
+            raise ConnectionError(f"{attempt.provider} unavailable")
+
+        with self.assertRaisesRegex(ConnectionError, "fireworks unavailable"):
+            self.router(30).complete([("deepseek", failing), ("fireworks", failing)])
+
+    def test_streaming_winner_fails_mid_stream(self):
+        events = []
+        standby_cancelled = threading.Event()
+
+        def primary(attempt):
+            stream(attempt, ["Intro", " and"], events)
+            # fail only after the hedged provider has lost the race and is on standby
+            standby_cancelled.wait(5)
+            time.sleep(0.05)
+            raise ConnectionError("stream dropped")
+
+        def secondary(attempt):
+            try:
+                return stream(attempt, ["Intro", " again"], events)
+            except HedgeCancelled:
+                standby_cancelled.set()
+                raise
+
+        result = self.router(0.05).complete(
+            [("deepseek", primary), ("fireworks", secondary)],
+            on_failover=lambda provider: events.append(f"reset:{provider}"),
+        )
+        assert result == ("fireworks", "Intro again")
+        # listeners are told to drop the partial section before the standby streams it again
+        assert events == ["deepseek:Intro", "deepseek: and", "reset:deepseek", "fireworks:Intro", "fireworks: again"]
+
+    def test_failure_without_deltas_skips_failover(self):
+        failovers = []
+
+        def failing(attempt):
+            raise ConnectionError("deepseek unavailable")
+
+        self.router(30).complete(
+            [("deepseek", failing), ("fireworks", lambda attempt: "report")],
+            on_failover=failovers.append,
+        )
+        assert failovers == []
+
+    def test_rank_prefers_faster_provider(self):
+        router = ProviderRouter(registry=self.registry, min_samples=2)
+        for _ in range(2):
+            self.registry.record_api_call("llm_provider.deepseek", True, 20.0)
+            self.registry.record_api_call("llm_provider.fireworks", True, 5.0)
+        assert router.rank(["deepseek", "fireworks"]) == ["fireworks", "deepseek"]
+        assert router.hedge_delay_for("fireworks") == 5.0
@@ -0,0 +1,167 @@
+import unittest
+from unittest import mock
+
+from src.utils.streaming import (
+    CodeFenceFilter,
+    ThinkBlockFilter,
+    iter_sse_content,
+    stream_with_retries,
+    strip_code_fences_stream,
+    strip_think_stream,
+)
+
+
+def feed_all(stream_filter, deltas: list[str]) -> str:
+    return "".join(stream_filter.feed(delta) for delta in deltas) + stream_filter.flush()
+
+
+class ThinkBlockFilterTest(unittest.TestCase):
+    def test_removes_think_block(self):
+        assert feed_all(ThinkBlockFilter(), ["<think>planning</think>\n\n## Overview"]) == "## Overview"
+
+    def test_tags_split_across_chunks(self):
+        deltas = ["<th", "ink>plan", "ning</thi", "nk>## Over", "view <", "b>bold</b>"]
+        assert feed_all(ThinkBlockFilter(), deltas) == "## Overview <b>bold</b>"
+
+    def test_partial_tag_held_back(self):
+        think_filter = ThinkBlockFilter()
+        assert think_filter.feed("Hello <thi") == "Hello "
+        assert think_filter.feed("s is not a tag") == "<this is not a tag"
+
+    def test_unterminated_think_discarded(self):
+        think_filter = ThinkBlockFilter()
+        assert think_filter.feed("Answer <think>still thinking") == "Answer "
+        assert think_filter.feed("</thin") == ""
+        assert think_filter.flush() == ""
+
+    def test_strip_think_stream_skips_empty_deltas(self):
+        deltas = list(strip_think_stream(["<think>", "x", "</think>", "a", "b"]))
+        assert deltas == ["a", "b"]
+
+
+class CodeFenceFilterTest(unittest.TestCase):
+    def test_removes_fences(self):
+        assert feed_all(CodeFenceFilter(), ["```markdown\n## Overview\n```"]) == "\n## Overview\n"
+
+    def test_fences_split_across_chunks(self):
+        deltas = ["`", "``mark", "down\n## Over", "view\n``", "`"]
+        assert feed_all(CodeFenceFilter(), deltas) == "\n## Overview\n"
+
+    def test_matches_full_response_stripping(self):
+        text = "```markdown\n# A\n```\nSome `code` and ```python\nx = 1\n```\n````"
+        expected = text.replace("```markdown", "").replace("```", "")
+        for size in (1, 2, 3, 5, 8):
+            deltas = [text[i : i + size] for i in range(0, len(text), size)]
+            assert "".join(strip_code_fences_stream(deltas)) == expected
+
+    def test_possible_markdown_fence_held_back(self):
+        fence_filter = CodeFenceFilter()
+        assert fence_filter.feed("Intro ```mark") == "Intro "
+        assert fence_filter.feed("et") == "market"
+
+
+class IterSseContentTest(unittest.TestCase):
+    def test_content_deltas(self):
+        lines = [
+            ": OPENROUTER PROCESSING",
+            "",
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            "event: ping",
+            'data: {"choices": [{"delta": {"content": "lo"}}]}',
+            "data: [DONE]",
+            'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+        assert list(iter_sse_content(lines)) == ["Hel", "lo"]
+
+    def test_malformed_chunk_skipped(self):
+        lines = ["data: {not json", 'data: {"choices": [{"delta": {"content": "ok"}}]}', "data: [DONE]"]
+        assert list(iter_sse_content(lines)) == ["ok"]
+
+    def test_empty_choices_skipped(self):
+        lines = ['data: {"choices": []}', 'data: {"choices": [{"delta": {"content": "ok"}}]}']
+        assert list(iter_sse_content(lines)) == ["ok"]
+
+    def test_stream_error(self):
+        lines = ['data: {"error": {"message": "overloaded"}}']
+        with self.assertRaisesRegex(Exception, "overloaded"):
+            list(iter_sse_content(lines))
+
+
+class StreamWithRetriesTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("src.utils.streaming.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retries_until_content(self):
+        attempts = iter([iter([]), iter(["a", "b"])])
+
+        def failing_stream():
+            raise ConnectionError("connection reset")
+            yield
+
+        streams = iter([failing_stream, lambda: next(attempts), lambda: next(attempts)])
+        assert list(stream_with_retries(lambda: next(streams)(), max_retries=3)) == ["a", "b"]
+        assert self.sleep.call_count == 2
+
+    def test_gives_up_after_max_retries(self):
+        with self.assertRaisesRegex(Exception, "Failed to get non-empty response after 2 attempts"):
+            list(stream_with_retries(lambda: iter([]), max_retries=2))
+
+    def test_last_error_raised(self):
+        def failing_stream():
+            raise ConnectionError("connection reset")
+            yield
+
+        with self.assertRaises(ConnectionError):
+            list(stream_with_retries(failing_stream, max_retries=2))
+
+    def test_no_retry_after_content(self):
+        opened = []
+
+        def stream():
+            opened.append(True)
+            yield "partial"
+            raise ConnectionError("stream dropped")
+
+        deltas = []
+        with self.assertRaises(ConnectionError):
+            for delta in stream_with_retries(stream, max_retries=3):
+                deltas.append(delta)
+        assert deltas == ["partial"]
+        assert len(opened) == 1
+
+    def test_close_closes_stream(self):
+        closed = []
+
+        def stream():
+            try:
+                yield "a"
+                yield "b"
+            finally:
+                closed.append(True)
+
+        deltas = stream_with_retries(stream, max_retries=1)
+        assert next(deltas) == "a"
+        deltas.close()
+        assert closed == [True]
+
+
+class ClientStreamTest(unittest.TestCase):
+    def test_fireworks_stream_uses_timeout(self):
+        from src.utils.fireworks_client import FireworksClient
+
+        response = mock.MagicMock()
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"content": "<think>hmm</think>Hi"}}]}',
+            "data: [DONE]",
+        ]
+        session = mock.MagicMock()
+        session.post.return_value = response
+
+        client = FireworksClient(api_key="test-key", session=session, timeout=(5.0, 30.0))
+        assert list(client.chat_completion_stream([{"role": "user", "content": "Hello"}])) == ["Hi"]
+        assert session.post.call_args.kwargs["stream"] is True
+        assert session.post.call_args.kwargs["timeout"] == (5.0, 30.0)
@@ -0,0 +1,10 @@
+import unittest
+
+
+def start_patches(test_case: unittest.TestCase, *patchers):
+    """Helper method to start patchers for the rest of a test. Returns the started mocks."""
+    mocks = []
+    for patcher in patchers:
+        mocks.append(patcher.start())
+        test_case.addCleanup(patcher.stop)
+    return mocks
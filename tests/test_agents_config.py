@@ -172,4 +172,12 @@ agent_name:
         agent = get_agent("agent_name")
         assert agent.llm == "openai/gpt-4o"
         assert agent.provider == "openai"
-        assert agent.model == "gpt-4o"
\ No newline at end of file
+        assert agent.model == "gpt-4o"
+
+    def test_read_after_write(self):
+        shutil.copy(BASE_PATH / "fixtures/agents_max.yaml", self.project_dir / AGENTS_FILENAME)
+        assert get_agent('agent_name').llm == "openai/gpt-4o"
+
+        with AgentConfig("agent_name") as config:
+            config.llm = "anthropic/claude-3"
+        assert get_agent('agent_name').llm == "anthropic/claude-3"
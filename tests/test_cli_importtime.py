@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# Wall-clock budgets depend on the machine, so they are only checked when
+# AGENTSTACK_BENCHMARK_IMPORTTIME is set. The module checks always run.
+BENCHMARK = bool(os.getenv('AGENTSTACK_BENCHMARK_IMPORTTIME'))
+BUDGET_MS = 150  # for both `--version` and the `run` handoff
+RUNS = 5  # the fastest run is compared against the budget
+
+# Dependencies only some commands need; they must not be loaded to print the
+# version or to hand off to a project's `run`.
+HEAVY_MODULES = ('cookiecutter', 'inquirer', 'requests', 'asttokens', 'astor')
+
+VERSION_CODE = "import agentstack.main"
+# What `agentstack run` imports before calling the project: the telemetry and
+# update checks that every command goes through, then the run command itself.
+RUN_HANDOFF_CODE = (
+    "import agentstack.main\n"
+    "from agentstack.telemetry import track_cli_command, update_telemetry\n"
+    "from agentstack.update import check_for_updates\n"
+    "from agentstack.cli import run_project"
+)
+RUN_HANDOFF_MODULES = ('agentstack.main', 'agentstack.telemetry', 'agentstack.update', 'agentstack.cli.run')
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable, *args], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def _loaded_modules(code: str) -> set[str]:
+    """Names of the modules loaded after running `code` in a fresh interpreter."""
+    result = _run_python('-c', f"{code}\nimport sys, json\nprint(json.dumps(list(sys.modules)))")
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """
+    Run `code` under `python -X importtime` and return the cumulative import times, in
+    microseconds, of the top-level imports; nested imports are included in those.
+    """
+    result = _run_python('-X', 'importtime', '-c', code)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if name.startswith('  '):  # indented, so imported by another module
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestCLIImportTime(unittest.TestCase):
+    def _assert_light(self, code: str, modules: tuple[str, ...]):
+        loaded = _loaded_modules(code)
+        for module in modules:
+            assert module in loaded, f"`{module}` was not imported"
+        for heavy in HEAVY_MODULES:
+            assert heavy not in loaded, f"`{heavy}` was imported"
+
+    def _assert_fast(self, code: str):
+        startup = _importtime('pass')
+        runs = [_importtime(code) for _ in range(RUNS)]
+        # take the fastest run to keep scheduler noise out of the measurement
+        elapsed_ms = min(sum(time for name, time in run.items() if name not in startup) for run in runs) / 1000
+        assert elapsed_ms < BUDGET_MS, f"Running `{code}` took {elapsed_ms:.0f}ms"
+
+    def test_version_imports(self):
+        self._assert_light(VERSION_CODE, ('agentstack.main',))
+
+    def test_run_handoff_imports(self):
+        self._assert_light(RUN_HANDOFF_CODE, RUN_HANDOFF_MODULES)
+
+    @unittest.skipUnless(BENCHMARK, "set AGENTSTACK_BENCHMARK_IMPORTTIME=1 to check import time budgets")
+    def test_version_importtime(self):
+        self._assert_fast(VERSION_CODE)
+
+    @unittest.skipUnless(BENCHMARK, "set AGENTSTACK_BENCHMARK_IMPORTTIME=1 to check import time budgets")
+    def test_run_handoff_importtime(self):
+        self._assert_fast(RUN_HANDOFF_CODE)
@@ -3,6 +3,7 @@ import os, sys
 from pathlib import Path
 import shutil
 import unittest
+from unittest import mock
 from parameterized import parameterized, parameterized_class
 
 from agentstack.conf import ConfigFile, set_path
@@ -12,6 +13,7 @@ from agentstack._tools import ToolConfig, get_all_tools
 from agentstack.agents import AGENTS_FILENAME, AgentConfig
 from agentstack.tasks import TASKS_FILENAME, TaskConfig
 from agentstack import graph
+from agentstack.generation import asttools
 
 BASE_PATH = Path(__file__).parent
 
@@ -153,6 +155,52 @@ class TestFrameworks(unittest.TestCase):
         assert "*agentstack.tools['test_tool']" not in entrypoint_src
         assert "*agentstack.tools['test_tool_alt']" in entrypoint_src
 
+    def test_add_tool_to_agents(self):
+        self._populate_max_entrypoint()
+        self._get_test_agent()
+        self._get_test_task()
+        frameworks.add_agent(AgentConfig('second_agent_name'))
+        frameworks.add_tool_to_agents(self._get_test_tool(), ['agent_name', 'second_agent_name'])
+
+        assert frameworks.get_agent_tool_names('agent_name') == ['test_tool']
+        assert frameworks.get_agent_tool_names('second_agent_name') == ['test_tool']
+
+    def test_add_tool_to_agents_parses_once(self):
+        self._populate_max_entrypoint()
+        self._get_test_agent()
+        self._get_test_task()
+        frameworks.add_agent(AgentConfig('second_agent_name'))
+        with mock.patch.object(asttools.asttokens, 'ASTTokens', wraps=asttools.asttokens.ASTTokens) as atok:
+            frameworks.add_tool_to_agents(self._get_test_tool(), ['agent_name', 'second_agent_name'])
+            frameworks.add_tool_to_agents(self._get_test_tool_alternate(), ['agent_name', 'second_agent_name'])
+
+        assert atok.call_count == 4  # one read and one re-parse per call
+        assert len(frameworks.get_agent_tool_names('second_agent_name')) == 2
+
+    def test_add_tool_to_agents_invalid(self):
+        self._populate_max_entrypoint()
+        entrypoint_path = frameworks.get_entrypoint_path(self.framework)
+        original_src = open(entrypoint_path).read()
+        with self.assertRaises(ValidationError):
+            frameworks.add_tool_to_agents(self._get_test_tool(), ['agent_name', 'missing_agent_name'])
+
+        # no edits are applied if any agent is invalid
+        assert open(entrypoint_path).read() == original_src
+
+    def test_remove_tool_from_agents(self):
+        self._populate_max_entrypoint()
+        self._get_test_agent()
+        self._get_test_task()
+        frameworks.add_agent(AgentConfig('second_agent_name'))
+        frameworks.add_tool_to_agents(self._get_test_tool(), ['agent_name', 'second_agent_name'])
+        frameworks.add_tool_to_agents(self._get_test_tool_alternate(), ['agent_name', 'second_agent_name'])
+        frameworks.remove_tool_from_agents(self._get_test_tool(), ['agent_name', 'second_agent_name'])
+
+        entrypoint_src = open(frameworks.get_entrypoint_path(self.framework)).read()
+        assert "*agentstack.tools['test_tool']" not in entrypoint_src
+        assert frameworks.get_agent_tool_names('agent_name') == ['test_tool_alt']
+        assert frameworks.get_agent_tool_names('second_agent_name') == ['test_tool_alt']
+
     @parameterized.expand([(x,) for x in get_all_tools()])
     def test_get_tool_callables(self, tool_config):
         self._populate_max_entrypoint()
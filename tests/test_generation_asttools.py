@@ -0,0 +1,115 @@
+import os
+import ast
+import shutil
+import unittest
+from pathlib import Path
+
+from agentstack.exceptions import ValidationError
+from agentstack.generation import asttools
+
+BASE_PATH = Path(__file__).parent
+
+SOURCE = """\
+def first():
+    return [1, 2]
+
+
+def second():
+    return [3]
+"""
+
+
+class ASTToolsFileTest(unittest.TestCase):
+    def setUp(self):
+        self.project_dir = BASE_PATH / 'tmp' / 'asttools'
+        os.makedirs(self.project_dir)
+        self.filename = self.project_dir / 'module.py'
+        self.filename.write_text(SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def _get_list(self, file: asttools.File, method_name: str):
+        method = asttools.find_method(file.tree, method_name)
+        return method.body[0].value
+
+    def test_edit_node_range(self):
+        with asttools.File(self.filename) as file:
+            start, end = file.get_node_range(self._get_list(file, 'second'))
+            file.edit_node_range(start, end, '[4]')
+            assert self._get_list(file, 'second').elts[0].value == 4
+
+        assert "return [4]" in self.filename.read_text()
+
+    def test_edit_node_range_with_nodes(self):
+        with asttools.File(self.filename) as file:
+            start, end = file.get_node_range(self._get_list(file, 'second'))
+            with file.batch():
+                file.edit_node_range(start, end, ast.List(elts=[ast.Constant(value=4)], ctx=ast.Load()))
+            method = asttools.find_method(file.tree, 'first')
+            start, end = file.get_node_range(method.body[0])
+            file.edit_node_range(start, end, ast.Return(value=ast.Constant(value=None)))
+
+        source = self.filename.read_text()
+        assert "return [4]" in source
+        assert "return None" in source
+
+    def test_batch(self):
+        with asttools.File(self.filename) as file:
+            with file.batch():
+                # edits are made against the original offsets in any order
+                second = self._get_list(file, 'second')
+                first = self._get_list(file, 'first')
+                file.edit_node_range(*file.get_node_range(second), '[3, 4, 5]')
+                file.edit_node_range(*file.get_node_range(first), '[]')
+                assert file.source == SOURCE  # nothing is applied until the batch ends
+
+            assert self._get_list(file, 'second').elts[2].value == 5
+
+        source = self.filename.read_text()
+        assert "return []" in source
+        assert "return [3, 4, 5]" in source
+
+    def test_batch_same_range(self):
+        with asttools.File(self.filename) as file, file.batch():
+            start, end = file.get_node_range(self._get_list(file, 'first'))
+            file.edit_node_range(start, end, '[1, 2, 3]')
+            file.edit_node_range(start, end, '[1, 2, 3, 4]')
+
+        assert "return [1, 2, 3, 4]\n" in self.filename.read_text()
+
+    def test_batch_insertions_keep_order(self):
+        with asttools.File(self.filename) as file, file.batch():
+            file.edit_node_range(0, 0, '# one\n')
+            file.edit_node_range(0, 0, '# two\n')
+
+        assert self.filename.read_text().startswith('# one\n# two\ndef first():')
+
+    def test_batch_overlapping_edits(self):
+        file = asttools.File(self.filename)
+        start, end = file.get_node_range(self._get_list(file, 'first'))
+        with self.assertRaises(ValidationError):
+            with file.batch():
+                file.edit_node_range(start, end, '[]')
+                file.edit_node_range(start + 1, end + 1, '[]')
+
+        assert file.source == SOURCE
+
+    def test_batch_exception_discards_edits(self):
+        file = asttools.File(self.filename)
+        with self.assertRaises(KeyError):
+            with file.batch():
+                file.edit_node_range(0, 0, '# comment\n')
+                raise KeyError()
+
+        assert file.source == SOURCE
+        file.edit_node_range(0, 0, '# comment\n')  # edits apply immediately again
+        assert file.source.startswith('# comment\n')
+
+    def test_batch_invalid_source(self):
+        file = asttools.File(self.filename)
+        with self.assertRaises(ValidationError):
+            with file.batch():
+                file.edit_node_range(0, 0, 'def (')
+
+        assert file.source == SOURCE
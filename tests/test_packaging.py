@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+from mock_test_utils import start_patches
+
+from agentstack import packaging
+
+
+class PackagingTest(unittest.TestCase):
+    def setUp(self):
+        self.wrap_command, _ = start_patches(
+            self,
+            mock.patch.object(packaging, '_wrap_command_with_callbacks', return_value=True),
+            mock.patch.object(packaging, 'get_uv_bin', return_value='uv'),
+        )
+
+    def _installed_packages(self) -> list[list[str]]:
+        # everything after `uv add --python .venv/bin/python`
+        return [call.args[0][4:] for call in self.wrap_command.call_args_list]
+
+    def test_install(self):
+        packaging.install('requests')
+        assert self._installed_packages() == [['requests']]
+
+    def test_install_many(self):
+        packaging.install_many(['requests', 'httpx>=0.27'])
+        assert self._installed_packages() == [['requests', 'httpx>=0.27']]
+
+    def test_install_many_empty(self):
+        packaging.install_many([])
+        self.wrap_command.assert_not_called()
+
+    def test_batch_install(self):
+        with packaging.batch_install():
+            packaging.install('requests')
+            packaging.install('httpx>=0.27')
+            self.wrap_command.assert_not_called()
+
+        assert self._installed_packages() == [['requests', 'httpx>=0.27']]
+
+    def test_batch_install_duplicates(self):
+        with packaging.batch_install():
+            packaging.install('requests')
+            packaging.install('httpx>=0.27')
+            packaging.install('requests')
+            packaging.install('httpx>=0.28')
+
+        assert self._installed_packages() == [['requests', 'httpx>=0.27,>=0.28']]
+
+    def test_batch_install_merges_extras(self):
+        with packaging.batch_install():
+            packaging.install('httpx[http2]>=0.27')
+            packaging.install('httpx[socks]<1.0')
+
+        assert self._installed_packages() == [['httpx[http2,socks]<1.0,>=0.27']]
+
+    def test_batch_install_keeps_markers_apart(self):
+        with packaging.batch_install():
+            packaging.install('numpy<2; python_version < "3.10"')
+            packaging.install('numpy>=2')
+
+        assert self._installed_packages() == [['numpy<2; python_version < "3.10"', 'numpy>=2']]
+
+    def test_after_install(self):
+        callback = mock.Mock(side_effect=lambda: self.assertEqual(len(self._installed_packages()), 1))
+        with packaging.batch_install():
+            packaging.install('requests')
+            packaging.after_install(callback)
+            callback.assert_not_called()
+
+        callback.assert_called_once()
+        packaging.after_install(callback)  # runs right away outside of a batch
+        assert callback.call_count == 2
+
+    def test_after_install_skipped_on_exception(self):
+        callback = mock.Mock()
+        with self.assertRaises(ValueError):
+            with packaging.batch_install():
+                packaging.after_install(callback)
+                raise ValueError()
+
+        callback.assert_not_called()
+        with packaging.batch_install():
+            pass
+        callback.assert_not_called()
+
+    def test_batch_install_nested(self):
+        with packaging.batch_install():
+            with packaging.batch_install():
+                packaging.install('requests')
+            packaging.install('httpx')
+            self.wrap_command.assert_not_called()
+
+        assert self._installed_packages() == [['requests', 'httpx']]
+
+    def test_batch_install_empty(self):
+        with packaging.batch_install():
+            pass
+        self.wrap_command.assert_not_called()
+
+    def test_batch_install_exception(self):
+        with self.assertRaises(ValueError):
+            with packaging.batch_install():
+                packaging.install('requests')
+                raise ValueError()
+
+        self.wrap_command.assert_not_called()
+        packaging.install('httpx')  # installs immediately again
+        assert self._installed_packages() == [['httpx']]
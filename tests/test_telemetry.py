@@ -1,11 +1,19 @@
 import os
+import json
+import shutil
 import unittest
 import uuid
+from pathlib import Path
 from unittest.mock import patch, mock_open
+from mock_test_utils import start_patches
+import requests
 
+from agentstack import telemetry
 from agentstack.telemetry import _get_cli_user_guid
 from agentstack.utils import get_telemetry_opt_out
 
+BASE_PATH = Path(__file__).parent
+
 class TelemetryTest(unittest.TestCase):
     def test_telemetry_opt_out_env_var_set(self):
         AGENTSTACK_TELEMETRY_OPT_OUT = os.getenv("AGENTSTACK_TELEMETRY_OPT_OUT")
@@ -79,4 +87,134 @@ class TelemetryTest(unittest.TestCase):
 
         self.assertEqual(result, 'unknown')
         mock_exists.assert_called_once_with()
-        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
\ No newline at end of file
+        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+
+
+class TelemetrySpoolTest(unittest.TestCase):
+    def setUp(self):
+        self.spool_dir = BASE_PATH / 'tmp' / 'test_telemetry'
+        os.makedirs(self.spool_dir)
+        self.spool_path = self.spool_dir / 'spool.jsonl'
+        start_patches(
+            self,
+            patch.object(telemetry, 'SPOOL_FILE_PATH', self.spool_path),
+            patch.object(telemetry, 'run_in_background'),
+            patch.object(telemetry, 'collect_machine_telemetry', return_value={'os': 'test'}),
+            patch.object(telemetry, 'collect_location_telemetry', return_value={'country': 'test'}),
+            patch('agentstack.auth.get_stored_token', return_value=None),
+            patch.dict('os.environ', {'AGENTSTACK_IS_TEST_ENV': ''}),
+        )
+        self.run_in_background = telemetry.run_in_background
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir)
+
+    def _spooled(self) -> list[dict]:
+        if not self.spool_path.exists():
+            return []
+        return [json.loads(line) for line in self.spool_path.read_text().splitlines()]
+
+    @patch('requests.put')
+    @patch('requests.post')
+    def test_tracking_does_not_send(self, mock_post, mock_put):
+        event_id = telemetry.track_cli_command('run', 'run')
+        telemetry.update_telemetry(event_id, result=0)
+
+        mock_post.assert_not_called()
+        mock_put.assert_not_called()
+        assert [e['type'] for e in self._spooled()] == ['command', 'result']
+        self.run_in_background.assert_called_once_with('agentstack.telemetry', 'flush')
+
+    def test_opted_out_command_not_tracked(self):
+        with patch.object(telemetry, 'collect_machine_telemetry', return_value=None):
+            event_id = telemetry.track_cli_command('run')
+        telemetry.update_telemetry(event_id, result=0)
+
+        assert event_id is None
+        assert self._spooled() == []
+        self.run_in_background.assert_not_called()
+
+    @patch('requests.put')
+    @patch('requests.post')
+    def test_flush_pairs_result_with_server_id(self, mock_post, mock_put):
+        mock_post.return_value.json.return_value = {'id': 42}
+        event_id = telemetry.track_cli_command('run')
+        telemetry.update_telemetry(event_id, result=1, message="boom")
+
+        telemetry.flush_spool()
+
+        assert mock_post.call_args.kwargs['json'] == {'command': 'run', 'args': None, 'os': 'test', 'country': 'test'}
+        assert mock_put.call_args.kwargs['json'] == {'id': 42, 'result': 1, 'message': "boom"}
+        assert self._spooled() == []
+        assert list(self.spool_dir.iterdir()) == []
+
+    @patch('requests.put')
+    @patch('requests.post')
+    def test_flush_offline_keeps_events(self, mock_post, mock_put):
+        mock_post.side_effect = requests.ConnectionError()
+        for command in ('run', 'tools'):
+            telemetry.update_telemetry(telemetry.track_cli_command(command), result=0)
+
+        telemetry.flush_spool()
+
+        assert mock_post.call_count == 1  # gave up after the first failure
+        mock_put.assert_not_called()
+        assert [e['type'] for e in self._spooled()] == ['command', 'result', 'command', 'result']
+
+        mock_post.side_effect = None
+        mock_post.return_value.json.return_value = {'id': 7}
+        telemetry.flush_spool()
+        assert mock_post.call_count == 3
+        assert mock_put.call_count == 2
+        assert self._spooled() == []
+
+    @patch('requests.put')
+    @patch('requests.post')
+    def test_flush_keeps_result_when_put_fails(self, mock_post, mock_put):
+        mock_post.return_value.json.return_value = {'id': 42}
+        mock_put.side_effect = requests.Timeout()
+        telemetry.update_telemetry(telemetry.track_cli_command('run'), result=0)
+
+        telemetry.flush_spool()
+
+        spooled = self._spooled()
+        assert len(spooled) == 1
+        assert spooled[0]['type'] == 'result' and spooled[0]['id'] == 42
+
+    @patch('requests.post')
+    def test_flush_drops_old_events(self, mock_post):
+        telemetry.track_cli_command('run')
+        events = self._spooled()
+        events[0]['created_at'] -= telemetry.MAX_EVENT_AGE + 1
+        self.spool_path.write_text(json.dumps(events[0]) + "\n")
+
+        telemetry.flush_spool()
+
+        mock_post.assert_not_called()
+        assert self._spooled() == []
+
+    @patch('requests.put')
+    @patch('requests.post')
+    def test_flush_pairs_result_sent_by_later_flush(self, mock_post, mock_put):
+        """A long-running command's result is spooled after another process already sent its command."""
+        mock_post.return_value.json.return_value = {'id': 42}
+        event_id = telemetry.track_cli_command('run')
+        telemetry.flush_spool()
+        mock_put.assert_not_called()
+
+        telemetry.update_telemetry(event_id, result=0)
+        telemetry.flush_spool()
+
+        assert mock_put.call_args.kwargs['json'] == {'id': 42, 'result': 0, 'message': None}
+        assert list(self.spool_dir.iterdir()) == []
+
+    @patch('requests.put')
+    @patch('requests.post')
+    def test_flush_keeps_result_until_command_sent(self, mock_post, mock_put):
+        mock_post.return_value.json.return_value = {'id': 42}
+        telemetry._spool_event({'type': 'result', 'event_id': 'not-sent-yet', 'result': 0, 'message': None})
+
+        telemetry.flush_spool()
+
+        mock_put.assert_not_called()
+        assert [e['event_id'] for e in self._spooled()] == ['not-sent-yet']
@@ -0,0 +1,138 @@
+import json
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("Skipping agentql tests because `httpx[http2]` is not installed.")
+
+from agentstack._tools import agentql
+
+
+class FakeAgentQLHandler(BaseHTTPRequestHandler):
+    """Returns the page's url and query as its data, after a short delay."""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.1
+    requests: list[dict] = []
+    connections: set[int] = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append(body)
+        self.connections.add(self.client_address[1])
+        time.sleep(self.delay)
+
+        if self.headers['X-API-Key'] != 'test-key':
+            status, response = 401, {'detail': 'unauthorized'}
+        elif body['url'].endswith('/broken'):
+            status, response = 500, {'error_info': 'Page failed to load'}
+        else:
+            status, response = 200, {'data': {'url': body['url'], 'query': body['query']}}
+        data = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AgentQLTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAgentQLHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeAgentQLHandler.requests = []
+        FakeAgentQLHandler.connections = set()
+        host, port = self.server.server_address[:2]
+        start_patches(
+            self,
+            mock.patch.object(agentql, 'QUERY_DATA_ENDPOINT', f"http://{host}:{port}/v1/query-data"),
+            mock.patch.object(agentql, 'API_KEY', 'test-key'),
+            mock.patch.object(agentql, '_client', None),
+            mock.patch.dict(agentql._cache, clear=True),
+        )
+
+    def tearDown(self):
+        if agentql._client is not None:
+            agentql._client.close()
+
+    def test_query_data(self):
+        result = agentql.query_data("https://example.com", "{ title }", None)
+        assert result == {'url': "https://example.com", 'query': "{ title }"}
+        assert FakeAgentQLHandler.requests[0] == {'url': "https://example.com", 'query': "{ title }", 'prompt': None}
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "Page failed to load"):
+            agentql.query_data("https://example.com/broken", "{ title }", None)
+        with mock.patch.object(agentql, 'API_KEY', 'wrong-key'), mock.patch.object(agentql, '_client', None):
+            with self.assertRaisesRegex(ValueError, "valid API Key"):
+                agentql.query_data("https://example.com", "{ title }", None)
+
+    def test_connection_reused(self):
+        with mock.patch.object(FakeAgentQLHandler, 'delay', 0):
+            for i in range(3):
+                agentql.query_data(f"https://example.com/{i}", "{ title }", None)
+        assert len(FakeAgentQLHandler.connections) == 1
+
+    def test_cache(self):
+        first = agentql.query_data("https://example.com", "{ title }", None)
+        first['title'] = "modified"
+        second = agentql.query_data("https://example.com", "{ title }", None)
+        assert len(FakeAgentQLHandler.requests) == 1
+        assert 'title' not in second
+
+        agentql.query_data("https://example.com", "{ heading }", None)
+        agentql.query_data("https://example.com", None, "the title")
+        assert len(FakeAgentQLHandler.requests) == 3
+
+    def test_cache_expires(self):
+        with mock.patch.object(agentql, 'CACHE_TTL_SECONDS', 0.05):
+            agentql.query_data("https://example.com", "{ title }", None)
+            time.sleep(0.1)
+            agentql.query_data("https://example.com", "{ title }", None)
+        assert len(FakeAgentQLHandler.requests) == 2
+
+    def test_cache_disabled(self):
+        with mock.patch.object(agentql, 'CACHE_TTL_SECONDS', 0):
+            agentql.query_data("https://example.com", "{ title }", None)
+            agentql.query_data("https://example.com", "{ title }", None)
+        assert len(FakeAgentQLHandler.requests) == 2
+        assert not agentql._cache
+
+    def test_errors_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                agentql.query_data("https://example.com/broken", "{ title }", None)
+        assert len(FakeAgentQLHandler.requests) == 2
+
+    def test_query_data_many(self):
+        urls = [f"https://example.com/{i}" for i in range(5)] + ["https://example.com/broken"]
+        start = time.monotonic()
+        result = agentql.query_data_many(urls + urls[:2], "{ title }", None)
+        elapsed = time.monotonic() - start
+
+        assert list(result) == urls
+        assert result["https://example.com/3"] == {'url': "https://example.com/3", 'query': "{ title }"}
+        assert result["https://example.com/broken"] == {'error': "Page failed to load"}
+        assert len(FakeAgentQLHandler.requests) == 6
+        assert elapsed < 6 * FakeAgentQLHandler.delay
+
+    def test_query_data_many_empty(self):
+        assert agentql.query_data_many([], "{ title }", None) == {}
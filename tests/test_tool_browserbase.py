@@ -0,0 +1,164 @@
+import os
+import time
+import threading
+import unittest
+from importlib import import_module
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    env = {'BROWSERBASE_API_KEY': 'test-key', 'BROWSERBASE_PROJECT_ID': 'test-project'}
+    with mock.patch.dict(os.environ, env):
+        browserbase = import_module('agentstack._tools.browserbase')
+except ImportError:
+    raise unittest.SkipTest("Skipping browserbase tests because `browserbase` or `playwright` is not installed.")
+
+
+class FakePage:
+    def __init__(self, browser: 'FakeBrowser'):
+        self.browser = browser
+        self.url = None
+
+    def goto(self, url: str, **kwargs):
+        if not self.browser.connected:
+            raise RuntimeError("Browser has been closed")
+        if url.endswith('/broken'):
+            raise RuntimeError("net::ERR_NAME_NOT_RESOLVED")
+        time.sleep(self.browser.delay)
+        self.url = url
+
+    def inner_text(self, selector: str) -> str:
+        return f"text of {self.url}"
+
+    def content(self) -> str:
+        return f"<html>{self.url}</html>"
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    delay = 0.05
+
+    def __init__(self, connect_url: str):
+        self.connect_url = connect_url
+        self.connected = True
+        self.contexts = [SimpleNamespace(new_page=lambda: FakePage(self))]
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+class BrowserbaseTest(unittest.TestCase):
+    def setUp(self):
+        self.browsers: list[FakeBrowser] = []
+        self.sessions: list[dict] = []
+        self.released: list[str] = []
+        lock = threading.Lock()
+
+        def connect_over_cdp(connect_url: str) -> FakeBrowser:
+            browser = FakeBrowser(connect_url)
+            with lock:
+                self.browsers.append(browser)
+            return browser
+
+        @contextmanager
+        def sync_playwright():
+            yield SimpleNamespace(chromium=SimpleNamespace(connect_over_cdp=connect_over_cdp))
+
+        def create_session(**kwargs):
+            with lock:
+                self.sessions.append(kwargs)
+                session_id = f"session-{len(self.sessions)}"
+            return SimpleNamespace(id=session_id, connect_url=f"wss://fake/{session_id}")
+
+        client = mock.MagicMock()
+        client.sessions.create.side_effect = create_session
+        client.sessions.update.side_effect = lambda session_id, **kwargs: self.released.append(session_id)
+
+        start_patches(
+            self,
+            mock.patch.object(browserbase, '_client', client),
+            mock.patch.object(browserbase, 'sync_playwright', sync_playwright),
+            mock.patch.dict(browserbase._pools, clear=True),
+        )
+
+    def tearDown(self):
+        browserbase._close_pools()
+
+    def test_load_url(self):
+        assert browserbase.load_url("https://example.com") == "text of https://example.com"
+        assert browserbase.load_url("https://example.com", text_content=False) == "<html>https://example.com</html>"
+
+    def test_session_reused(self):
+        for i in range(3):
+            browserbase.load_url(f"https://example.com/{i}")
+        assert len(self.sessions) == 1
+        assert len(self.browsers) == 1
+
+    def test_proxy_sessions_separate(self):
+        browserbase.load_url("https://example.com")
+        browserbase.load_url("https://example.com", proxy=True)
+        assert [session['proxies'] for session in self.sessions] == [False, True]
+
+    def test_existing_session(self):
+        result = browserbase.load_url("https://example.com", session_id="my-session")
+        assert result == "text of https://example.com"
+        assert self.browsers[0].connect_url.endswith("apiKey=test-key&sessionId=my-session")
+        assert not self.sessions
+
+    def test_idle_session_released(self):
+        with mock.patch.object(browserbase, 'IDLE_TIMEOUT', 0.1):
+            browserbase.load_url("https://example.com")
+            deadline = time.monotonic() + 5
+            while not self.released:
+                assert time.monotonic() < deadline, "session wasn't released"
+                time.sleep(0.01)
+        assert self.released == ["session-1"]
+        assert not self.browsers[0].connected
+
+        # the next load starts a new session
+        browserbase.load_url("https://example.com")
+        assert len(self.sessions) == 2
+
+    def test_lost_session_replaced(self):
+        browserbase.load_url("https://example.com")
+        self.browsers[0].connected = False
+        assert browserbase.load_url("https://example.com/2") == "text of https://example.com/2"
+        assert len(self.sessions) == 2
+
+    def test_load_error(self):
+        with self.assertRaisesRegex(RuntimeError, "ERR_NAME_NOT_RESOLVED"):
+            browserbase.load_url("https://example.com/broken")
+        # the session is still usable
+        assert browserbase.load_url("https://example.com") == "text of https://example.com"
+        assert len(self.sessions) == 1
+
+    def test_load_urls(self):
+        urls = [f"https://example.com/{i}" for i in range(9)] + ["https://example.com/broken"]
+        start = time.monotonic()
+        result = browserbase.load_urls(urls + urls[:2])
+        elapsed = time.monotonic() - start
+
+        assert list(result) == urls
+        assert result["https://example.com/4"] == "text of https://example.com/4"
+        assert result["https://example.com/broken"].startswith("Error: failed to load https://example.com/broken")
+        # pages are spread over the pool's sessions
+        assert len(self.sessions) == browserbase.POOL_SIZE
+        assert elapsed < 9 * FakeBrowser.delay
+
+    def test_startup_failure_fails_queued_pages(self):
+        @contextmanager
+        def broken_playwright():
+            raise RuntimeError("playwright failed to start")
+            yield
+
+        with mock.patch.object(browserbase, 'sync_playwright', broken_playwright), \
+                mock.patch.object(browserbase, 'POOL_SIZE', 1):
+            result = browserbase.load_urls(["https://example.com/1", "https://example.com/2"])
+        assert all("playwright failed to start" in content for content in result.values())
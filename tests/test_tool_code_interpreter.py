@@ -0,0 +1,171 @@
+import unittest
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    import docker
+    from agentstack._tools import code_interpreter
+except ImportError:
+    raise unittest.SkipTest("Skipping code_interpreter tests because `docker` is not installed.")
+
+
+class FakeContainer:
+    def __init__(self, client: 'FakeDockerClient', image: str, **kwargs):
+        self.client = client
+        self.id = f"container-{len(client.containers.started)}"
+        self.image = image
+        self.kwargs = kwargs
+        self.commands: list[list[str]] = []
+        self.stopped = False
+        self.removed = False
+
+    def stop(self):
+        self.stopped = True
+
+    def remove(self):
+        self.removed = True
+
+
+class FakeImages:
+    def __init__(self):
+        self.tags: set[str] = set()
+        self.builds: list[dict] = []
+
+    def get(self, tag: str):
+        if tag not in self.tags:
+            raise docker.errors.ImageNotFound(tag)
+        return tag
+
+    def build(self, tag: str, **kwargs):
+        self.tags.add(tag)
+        self.builds.append(dict(tag=tag, **kwargs))
+
+
+class FakeContainers:
+    def __init__(self, client: 'FakeDockerClient'):
+        self.client = client
+        self.started: list[FakeContainer] = []
+
+    def run(self, image: str, **kwargs):
+        container = FakeContainer(self.client, image, **kwargs)
+        self.started.append(container)
+        return container
+
+
+class FakeAPI:
+    """Runs `exec` commands by returning the output queued with `FakeDockerClient.respond`."""
+
+    def __init__(self, client: 'FakeDockerClient'):
+        self.client = client
+        self.execs: dict[str, tuple[FakeContainer, list[str]]] = {}
+
+    def exec_create(self, container_id: str, command: list[str], workdir: str):
+        container = next(c for c in self.client.containers.started if c.id == container_id)
+        container.commands.append(command)
+        exec_id = f"exec-{len(self.execs)}"
+        self.execs[exec_id] = (container, command)
+        return {'Id': exec_id}
+
+    def exec_start(self, exec_id: str, stream: bool, demux: bool):
+        _, command = self.execs[exec_id]
+        if command == code_interpreter.RESET_COMMAND:
+            return iter([])
+        return iter(self.client.chunks)
+
+    def exec_inspect(self, exec_id: str):
+        _, command = self.execs[exec_id]
+        if command == code_interpreter.RESET_COMMAND:
+            return {'ExitCode': self.client.reset_exit_code}
+        return {'ExitCode': self.client.exit_code}
+
+
+class FakeDockerClient:
+    def __init__(self):
+        self.images = FakeImages()
+        self.images.tags.add(code_interpreter.DEFAULT_IMAGE_TAG)
+        self.containers = FakeContainers(self)
+        self.api = FakeAPI(self)
+        self.chunks: list[tuple] = []
+        self.exit_code = 0
+        self.reset_exit_code = 0
+
+    def respond(self, chunks: list[tuple], exit_code: int = 0):
+        self.chunks = chunks
+        self.exit_code = exit_code
+
+
+class CodeInterpreterTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeDockerClient()
+        self.pool = code_interpreter.ContainerPool(self.client, size=2)
+        _, self.echo_output = start_patches(
+            self,
+            mock.patch.object(code_interpreter, '_pool', self.pool),
+            mock.patch.object(code_interpreter, '_echo_output'),
+        )
+
+    def test_run_code(self):
+        self.client.respond([(b"hello\n", None)])
+        result = code_interpreter.run_code("print('hello')", [])
+
+        assert result == "exit code: 0\nhello\n"
+        container = self.client.containers.started[0]
+        assert container.commands[0] == ["python3", "-c", "print('hello')"]
+
+    def test_container_reused(self):
+        self.client.respond([(b"1\n", None)])
+        code_interpreter.run_code("print(1)", [])
+        code_interpreter.run_code("print(1)", [])
+
+        assert len(self.client.containers.started) == 1
+        container = self.client.containers.started[0]
+        assert container.commands.count(code_interpreter.RESET_COMMAND) == 2
+        assert not container.stopped
+
+    def test_failed_reset_discards_container(self):
+        self.client.reset_exit_code = 1
+        code_interpreter.run_code("print(1)", [])
+        code_interpreter.run_code("print(1)", [])
+
+        assert len(self.client.containers.started) == 2
+        assert all(c.stopped and c.removed for c in self.client.containers.started)
+
+    def test_output_streamed(self):
+        self.client.respond([(b"out\n", None), (None, b"err\n"), (b"done\n", None)], exit_code=1)
+        result = code_interpreter.run_code("...", [])
+
+        assert result == "exit code: 1\nout\nerr\ndone\n"
+        assert self.echo_output.call_args_list == [
+            mock.call('stdout', "out\n"),
+            mock.call('stderr', "err\n"),
+            mock.call('stdout', "done\n"),
+        ]
+
+    def test_output_split_character(self):
+        encoded = "é\n".encode('utf-8')
+        self.client.respond([(encoded[:1], None), (encoded[1:], None)])
+        assert code_interpreter.run_code("...", []) == "exit code: 0\né\n"
+
+    def test_library_image_cached(self):
+        code_interpreter.run_code("...", ["requests", "pandas"])
+        code_interpreter.run_code("...", ["pandas", "requests"])
+
+        assert len(self.client.images.builds) == 1
+        tag = self.client.images.builds[0]['tag']
+        assert tag.startswith("code-interpreter:libs-")
+        assert b"pip install --no-cache-dir pandas requests" in self.client.images.builds[0]['fileobj'].getvalue()
+        # the container for the library image is reused
+        assert [c.image for c in self.client.containers.started] == [tag]
+
+    def test_pool_size(self):
+        containers = [self.pool.acquire(code_interpreter.DEFAULT_IMAGE_TAG) for _ in range(3)]
+        for container in containers:
+            self.pool.release(container)
+
+        # the oldest idle container is stopped to keep the pool at `size`
+        assert [c.stopped for c in containers] == [True, False, False]
+
+    def test_shutdown(self):
+        code_interpreter.run_code("...", [])
+        self.pool.shutdown()
+        assert all(c.stopped and c.removed for c in self.client.containers.started)
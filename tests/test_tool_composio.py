@@ -0,0 +1,108 @@
+import time
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    from agentstack._tools import composio
+except ImportError:
+    raise unittest.SkipTest("Skipping composio tests because `composio-core` is not installed.")
+
+
+def make_account(app: str, account_id: str, status: str = "ACTIVE") -> SimpleNamespace:
+    return SimpleNamespace(id=account_id, appUniqueId=app, status=status)
+
+
+class ComposioTest(unittest.TestCase):
+    def setUp(self):
+        self.toolset = mock.MagicMock()
+        self.toolset.client.connected_accounts.get.return_value = [make_account("github", "account-1")]
+        self.toolset.execute_action.side_effect = lambda **kwargs: {"data": kwargs["params"], "successful": True}
+
+        start_patches(
+            self,
+            mock.patch.object(composio, '_toolset', None),
+            mock.patch.object(composio, 'ComposioToolSet', return_value=self.toolset),
+            mock.patch.object(composio, 'Action', side_effect=lambda name: SimpleNamespace(name=name, app=name.split('_')[0].lower())),
+            mock.patch.dict(composio._connected_accounts, clear=True),
+        )
+        self.accounts = self.toolset.client.connected_accounts.get
+
+    def test_execute_action(self):
+        result = composio.execute_action("GITHUB_STAR_REPO", {"repo": "agentstack"})
+        assert result == {"data": {"repo": "agentstack"}, "successful": True}
+        kwargs = self.toolset.execute_action.call_args.kwargs
+        assert kwargs["entity_id"] == composio.DEFAULT_ENTITY_ID
+        assert kwargs["connected_account_id"] == "account-1"
+        self.accounts.assert_called_once_with(entity_ids=[composio.DEFAULT_ENTITY_ID])
+
+    def test_toolset_and_accounts_reused(self):
+        for _ in range(3):
+            composio.execute_action("GITHUB_STAR_REPO", {})
+        assert composio.ComposioToolSet.call_count == 1
+        assert self.accounts.call_count == 1
+
+        # each entity has its own accounts
+        composio.execute_action("GITHUB_STAR_REPO", {}, entity_id="other")
+        self.accounts.assert_called_with(entity_ids=["other"])
+        assert self.accounts.call_count == 2
+
+    def test_accounts_expire(self):
+        composio.execute_action("GITHUB_STAR_REPO", {})
+        with mock.patch.object(composio, 'CONNECTED_ACCOUNTS_TTL', 0):
+            composio._connected_accounts.clear()
+            composio.execute_action("GITHUB_STAR_REPO", {})
+            composio.execute_action("GITHUB_STAR_REPO", {})
+        assert self.accounts.call_count == 3
+
+    def test_newly_connected_account(self):
+        composio.execute_action("GITHUB_STAR_REPO", {})
+        self.accounts.return_value = [make_account("github", "account-1"), make_account("slack", "account-2")]
+        composio.execute_action("SLACK_SEND_MESSAGE", {})
+        assert self.toolset.execute_action.call_args.kwargs["connected_account_id"] == "account-2"
+
+    def test_no_connected_account(self):
+        with self.assertRaises(RuntimeError):
+            composio.execute_action("SLACK_SEND_MESSAGE", {})
+        composio.execute_action("SLACK_SEND_MESSAGE", {}, no_auth=True)
+        assert self.toolset.execute_action.call_args.kwargs["connected_account_id"] is None
+
+    def test_active_account_preferred(self):
+        self.accounts.return_value = [
+            make_account("github", "expired", status="EXPIRED"),
+            make_account("github", "active"),
+        ]
+        composio.execute_action("GITHUB_STAR_REPO", {})
+        assert self.toolset.execute_action.call_args.kwargs["connected_account_id"] == "active"
+
+    def test_execute_actions(self):
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+
+        def execute(**kwargs):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return {"data": kwargs["params"], "successful": True}
+
+        self.toolset.execute_action.side_effect = execute
+        actions = [{"action_name": "GITHUB_STAR_REPO", "params": {"i": i}} for i in range(5)]
+        actions.append({"action_name": "SLACK_SEND_MESSAGE", "params": {}})
+        results = composio.execute_actions(actions)
+
+        assert [result["data"] for result in results[:5]] == [{"i": i} for i in range(5)]
+        assert results[5]["successful"] is False
+        assert "No connected account found for app `slack`" in results[5]["error"]
+        assert max_running > 1
+        # fetched once up front, and once more when slack wasn't found
+        assert self.accounts.call_count == 2
+
+    def test_execute_actions_empty(self):
+        assert composio.execute_actions([]) == []
@@ -1,8 +1,19 @@
 import json
 import unittest
 import re
+import sys
+import time
+import inspect
+import tempfile
 from pathlib import Path
-from agentstack._tools import ToolConfig, get_all_tool_paths, get_all_tool_names
+from agentstack.exceptions import ValidationError
+from agentstack._tools import (
+    ToolConfig,
+    LazyToolFunction,
+    get_all_tool_paths,
+    get_all_tool_names,
+    get_all_tools,
+)
 
 BASE_PATH = Path(__file__).parent
 
@@ -60,3 +71,69 @@ class ToolConfigTest(unittest.TestCase):
                 )
 
             assert config.name == path.stem
+
+    def test_lazy_module_does_not_import(self):
+        config = ToolConfig.from_tool_name('neon')
+        sys.modules.pop(config.module_name, None)
+
+        func = getattr(config.lazy_module, 'create_database')
+        assert isinstance(func, LazyToolFunction)
+        assert func.__name__ == 'create_database'
+        assert func.__doc__
+        assert list(inspect.signature(func).parameters) == ['project_name']
+        assert func.__annotations__ == {'project_name': str, 'return': str}
+        assert config.module_name not in sys.modules
+
+    def test_lazy_function_imports_on_call(self):
+        config = ToolConfig.from_tool_name('file_read')
+        sys.modules.pop(config.module_name, None)
+        func = config.lazy_module.read_file
+        assert config.module_name not in sys.modules
+
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("hello")
+        assert func(f.name) == "hello"
+        assert config.module_name in sys.modules
+
+    def test_lazy_function_missing_dependency_raises_on_call(self):
+        config = ToolConfig.from_tool_name('neon')
+        sys.modules.pop(config.module_name, None)
+        func = config.lazy_module.create_database
+        try:
+            import neon_api  # noqa: F401
+        except ImportError:
+            with self.assertRaises(ValidationError):
+                func("project")
+        else:
+            raise unittest.SkipTest("neon dependencies are installed")
+
+    def test_lazy_module_falls_back_for_async_tools(self):
+        # coroutine functions can't be proxied, so the real module is imported
+        config = ToolConfig.from_tool_name('agent_connect')
+        try:
+            module = config.lazy_module
+        except ValidationError:
+            return  # dependencies not installed, and the eager import said so
+        assert inspect.iscoroutinefunction(module.send_message)
+
+    def test_lazy_module_import_time(self):
+        """Resolving every tool lazily must not import tool modules or their SDKs."""
+        tools = get_all_tools()
+        for config in tools:
+            sys.modules.pop(config.module_name, None)
+
+        start = time.perf_counter()
+        lazy_tools = []
+        for config in tools:
+            try:
+                module = config.lazy_module
+            except ValidationError:
+                continue  # eager fallback for a tool whose dependencies aren't installed
+            if isinstance(getattr(module, config.tools[0]), LazyToolFunction):
+                lazy_tools.append(config)
+        elapsed = time.perf_counter() - start
+
+        assert len(lazy_tools) >= len(tools) - 2
+        for config in lazy_tools:
+            assert config.module_name not in sys.modules, f"{config.name} was imported"
+        assert elapsed < 0.5, f"Resolving {len(tools)} tools lazily took {elapsed:.3f}s"
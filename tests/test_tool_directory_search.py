@@ -0,0 +1,148 @@
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    import numpy as np
+    from agentstack._tools import directory_search
+except ImportError:
+    raise unittest.SkipTest("Skipping directory_search tests because `numpy` is not installed.")
+
+BASE_PATH = Path(__file__).parent
+
+# setUp replaces `_embed`; keep the real one for tests of the OpenAI requests
+embed = directory_search._embed
+
+VOCABULARY = ['invoice', 'payment', 'billing', 'weather', 'forecast', 'rain']
+
+
+def fake_embed(texts: list[str]) -> np.ndarray:
+    """Embed texts as normalized word counts over a tiny vocabulary."""
+    vectors = np.array(
+        [[text.lower().count(word) for word in VOCABULARY] for text in texts], dtype=np.float32
+    ) + 0.01
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class DirectorySearchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = BASE_PATH / 'tmp' / 'test_tool_directory_search'
+        self.directory = self.tmp_dir / 'docs'
+        os.makedirs(self.directory / 'nested')
+        (self.directory / 'billing.md').write_text("How to pay an invoice.\nPayment is due in 30 days.\n")
+        (self.directory / 'nested' / 'weather.txt').write_text("The forecast calls for rain tomorrow.\n")
+        (self.directory / 'image.png').write_bytes(b'\x89PNG\x00\x00binary')
+
+        start_patches(
+            self,
+            mock.patch.object(directory_search, 'INDEX_DIR', self.tmp_dir / 'index'),
+            mock.patch.object(directory_search, 'RESCAN_INTERVAL', 0),
+            mock.patch.object(directory_search, '_embed', side_effect=fake_embed),
+            mock.patch.dict(directory_search._indexes, clear=True),
+        )
+        self.embed = directory_search._embed
+
+    def tearDown(self):
+        for index in directory_search._indexes.values():
+            index.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_search_directory(self):
+        result = directory_search.search_directory(str(self.directory), "invoice")
+        assert result.startswith("billing.md:\nHow to pay an invoice.")
+
+        result = directory_search.search_directory(str(self.directory), "rain forecast")
+        assert result.startswith(os.path.join("nested", "weather.txt"))
+
+    def test_vector_match(self):
+        # "billing" isn't in any file, so only the embedding matches it to the invoice
+        result = directory_search.search_directory(str(self.directory), "billing")
+        assert result.startswith("billing.md")
+
+    def test_binary_files_skipped(self):
+        result = directory_search.search_directory(str(self.directory), "PNG binary")
+        assert "image.png" not in result
+
+    def test_no_results(self):
+        with mock.patch.object(directory_search, '_embed', return_value=None):
+            result = directory_search.search_directory(str(self.directory), "nothing matches this")
+        assert result.startswith("No results found")
+
+    def test_only_changed_files_reindexed(self):
+        directory_search.search_directory(str(self.directory), "invoice")
+        with mock.patch.object(directory_search, '_read_text', wraps=directory_search._read_text) as read_text:
+            directory_search.search_directory(str(self.directory), "invoice")
+            assert read_text.call_count == 0
+
+            (self.directory / 'billing.md').write_text("Invoices are sent monthly, with a payment link.\n")
+            result = directory_search.search_directory(str(self.directory), "monthly")
+            assert read_text.call_count == 1
+            assert "monthly" in result
+
+    def test_removed_files_dropped(self):
+        directory_search.search_directory(str(self.directory), "invoice")
+        os.remove(self.directory / 'billing.md')
+        result = directory_search.search_directory(str(self.directory), "invoice")
+        assert "billing.md" not in result
+
+    def test_index_persists(self):
+        directory_search.search_directory(str(self.directory), "invoice")
+        for index in directory_search._indexes.values():
+            index.db.close()
+        directory_search._indexes.clear()
+        self.embed.reset_mock()
+
+        # a fresh process loads the stored index, including the cached query embedding
+        with mock.patch.object(directory_search, '_read_text') as read_text:
+            result = directory_search.search_directory(str(self.directory), "invoice")
+        assert read_text.call_count == 0
+        assert self.embed.call_count == 0
+        assert result.startswith("billing.md")
+
+    def test_embedding_error_falls_back_to_bm25(self):
+        directory_search.search_directory(str(self.directory), "rain")
+        (self.directory / 'notes.md').write_text("Send the invoice reminder on Friday.\n")
+
+        client = mock.Mock()
+        client.embeddings.create.side_effect = ConnectionError("connection refused")
+        start_patches(
+            self,
+            mock.patch.object(directory_search, '_embed', embed),
+            mock.patch.object(directory_search, '_openai_client', client),
+            mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'test'}),
+            mock.patch('builtins.print'),
+        )
+
+        # neither the new file's chunks nor the query can be embedded
+        result = directory_search.search_directory(str(self.directory), "invoice")
+        assert client.embeddings.create.call_count == 2
+        assert "billing.md:\nHow to pay an invoice." in result
+        assert "notes.md:\nSend the invoice reminder" in result
+
+    def test_query_embeddings_capped(self):
+        index = directory_search._get_index(str(self.directory))
+        with mock.patch.object(directory_search, 'MAX_QUERY_EMBEDDINGS', 2):
+            directory_search.search_directory(str(self.directory), "invoice")
+            directory_search.search_directory(str(self.directory), "rain")
+            # using "invoice" again makes "rain" the least recently used
+            directory_search.search_directory(str(self.directory), "invoice")
+            directory_search.search_directory(str(self.directory), "forecast")
+
+        queries = {query for query, in index.db.execute("SELECT query FROM query_embeddings")}
+        assert queries == {"invoice", "forecast"}
+
+    def test_search_fixed_directory(self):
+        with mock.patch.dict(os.environ, {'DIRECTORY_SEARCH_TOOL_PATH': str(self.directory)}):
+            assert directory_search.search_fixed_directory("invoice").startswith("billing.md")
+
+    def test_split_text(self):
+        with mock.patch.multiple(directory_search, CHUNK_SIZE=100, CHUNK_OVERLAP=20):
+            text = "".join(f"line {i}\n" for i in range(100))
+            chunks = directory_search._split_text(text)
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert chunks[0].endswith("\n")
+        assert "line 99\n" in chunks[-1]
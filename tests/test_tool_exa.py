@@ -0,0 +1,109 @@
+import time
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    from agentstack._tools import exa
+    from agentstack.utils import RateLimiter
+except ImportError:
+    raise unittest.SkipTest("Skipping exa tests because `exa-py` is not installed.")
+
+# the rate limit tests patch `time.sleep`; searches still take their time
+sleep = time.sleep
+
+
+class FakeExa:
+    """Answers each search after a short delay with results named after the question."""
+
+    delay = 0.1
+
+    def __init__(self):
+        self.questions: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def search_and_contents(self, question: str, **kwargs):
+        with self.lock:
+            self.questions.append(question)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            sleep(1 if question == "slow" else self.delay)
+            if question == "fail":
+                raise ValueError("invalid request")
+            results = [
+                SimpleNamespace(title=f"{question} {i}", url=f"https://example.com/{i}", highlights=["a", "b"])
+                for i in range(2)
+            ]
+            return SimpleNamespace(results=results)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class ExaTest(unittest.TestCase):
+    def setUp(self):
+        self.exa = FakeExa()
+        start_patches(
+            self,
+            mock.patch.object(exa, '_exa', self.exa),
+            mock.patch.object(exa, '_rate_limiter', RateLimiter(60_000)),
+        )
+
+    def test_search_and_contents(self):
+        result = exa.search_and_contents("agents")
+        assert result == (
+            '<Title id=0>agents 0</Title><URL id=0>https://example.com/0</URL><Highlight id=0>ab</Highlight>'
+            '<Title id=1>agents 1</Title><URL id=1>https://example.com/1</URL><Highlight id=1>ab</Highlight>'
+        )
+
+    def test_search_and_contents_many(self):
+        questions = [f"question {i}" for i in range(5)]
+        start = time.monotonic()
+        result = exa.search_and_contents_many(questions + questions[:2])
+        elapsed = time.monotonic() - start
+
+        # duplicates are only searched once and the rest run side by side
+        assert sorted(self.exa.questions) == questions
+        assert self.exa.max_active > 1
+        assert elapsed < 5 * FakeExa.delay
+        expected = ''.join(
+            f'<Question id={i}>{question}</Question>{exa.search_and_contents(question)}'
+            for i, question in enumerate(questions)
+        )
+        assert result == expected
+
+    def test_search_and_contents_many_concurrency_limit(self):
+        with mock.patch.object(exa, 'MAX_CONCURRENT_SEARCHES', 2):
+            exa.search_and_contents_many([f"question {i}" for i in range(6)])
+        assert self.exa.max_active <= 2
+
+    def test_search_and_contents_many_error_isolated(self):
+        result = exa.search_and_contents_many(["first", "fail", "last"])
+        assert '<Question id=1>fail</Question>Search failed: invalid request<Question id=2>' in result
+        assert '<Title id=0>first 0</Title>' in result
+        assert '<Title id=0>last 0</Title>' in result
+
+    def test_search_and_contents_many_timeout(self):
+        start = time.monotonic()
+        with mock.patch.object(exa, 'TIMEOUT', 0.3):
+            result = exa.search_and_contents_many(["first", "slow"])
+        assert time.monotonic() - start < 1
+        assert '<Question id=1>slow</Question>Search timed out after 0.3 seconds' in result
+        assert '<Title id=0>first 0</Title>' in result
+
+    def test_search_and_contents_many_rate_limited(self):
+        with mock.patch.object(exa, '_rate_limiter', RateLimiter(60)), \
+                mock.patch('agentstack.utils.time.sleep') as limiter_sleep:
+            exa.search_and_contents_many(["a", "b", "c"])
+        # the first search starts right away and each one after waits its turn
+        waits = sorted(call.args[0] for call in limiter_sleep.call_args_list)
+        assert len(waits) == 2
+        assert 0 < waits[0] <= 1.0 < waits[1] <= 2.0
+
+    def test_search_and_contents_many_empty(self):
+        assert exa.search_and_contents_many([]) == 'No questions provided'
@@ -0,0 +1,96 @@
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+from mock_test_utils import start_patches
+
+from agentstack._tools import file_read
+
+BASE_PATH = Path(__file__).parent
+
+LINES = [f"line {i} {'error' if i % 100 == 0 else 'ok'}" for i in range(1, 1001)]
+
+
+class FileReadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = BASE_PATH / 'tmp' / 'test_tool_file_read'
+        os.makedirs(self.tmp_dir)
+        self.file_path = str(self.tmp_dir / 'file.log')
+        Path(self.file_path).write_text("\n".join(LINES) + "\n")
+
+        # use small chunks so the index spans many of them
+        start_patches(self, mock.patch.object(file_read, 'INDEX_CHUNK_SIZE', 1000))
+        file_read._index_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_read_file(self):
+        assert file_read.read_file(self.file_path) == "\n".join(LINES) + "\n"
+
+    def test_read_file_truncated(self):
+        with mock.patch.object(file_read, 'READ_FILE_MAX_BYTES', 20):
+            result = file_read.read_file(self.file_path)
+        assert result.startswith("line 1 ok\nline 2 ok\n")
+        assert "[Truncated" in result
+
+    def test_read_file_missing(self):
+        assert file_read.read_file(str(self.tmp_dir / 'missing')).startswith("Error: File not found")
+        assert file_read.read_file_lines(str(self.tmp_dir / 'missing'), 1).startswith("Failed to read file")
+
+    def test_read_file_bytes(self):
+        assert file_read.read_file_bytes(self.file_path, 0, 9) == "line 1 ok"
+        assert file_read.read_file_bytes(self.file_path, 10, 9) == "line 2 ok"
+        assert file_read.read_file_bytes(self.file_path, -10) == "000 error\n"
+
+    def test_read_file_lines(self):
+        assert file_read.read_file_lines(self.file_path, 1, 2) == "line 1 ok\nline 2 ok\n"
+        assert file_read.read_file_lines(self.file_path, 500, 2) == "line 500 error\nline 501 ok\n"
+        assert file_read.read_file_lines(self.file_path, 1000, 5) == "line 1000 error\n"
+        assert file_read.read_file_lines(self.file_path, 2000, 5) == ""
+
+    def test_read_file_lines_all_chunks(self):
+        for line in range(1, len(LINES) + 1, 37):
+            assert file_read.read_file_lines(self.file_path, line, 1) == LINES[line - 1] + "\n"
+
+    def test_line_index_cached(self):
+        with mock.patch.object(file_read, '_LineIndex', wraps=file_read._LineIndex) as line_index:
+            file_read.read_file_lines(self.file_path, 10, 1)
+            file_read.read_file_lines(self.file_path, 20, 1)
+            assert line_index.call_count == 1
+
+            # rewriting the file rebuilds the index
+            Path(self.file_path).write_text("changed\n")
+            stat = os.stat(self.file_path)
+            os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert file_read.read_file_lines(self.file_path, 1, 1) == "changed\n"
+            assert line_index.call_count == 2
+
+    def test_head_file(self):
+        assert file_read.head_file(self.file_path, 2) == "line 1 ok\nline 2 ok\n"
+        assert file_read.head_file(self.file_path, 5000) == "\n".join(LINES) + "\n"
+
+    def test_tail_file(self):
+        assert file_read.tail_file(self.file_path, 2) == "line 999 ok\nline 1000 error\n"
+        assert file_read.tail_file(self.file_path, 5000) == "\n".join(LINES) + "\n"
+
+    def test_no_trailing_newline(self):
+        Path(self.file_path).write_text("one\ntwo\nthree")
+        assert file_read.head_file(self.file_path, 5) == "one\ntwo\nthree"
+        assert file_read.tail_file(self.file_path, 1) == "three"
+        assert file_read.read_file_lines(self.file_path, 3, 1) == "three"
+
+    def test_empty_file(self):
+        Path(self.file_path).write_text("")
+        assert file_read.read_file_lines(self.file_path, 1) == ""
+        assert file_read.tail_file(self.file_path) == ""
+        assert file_read.grep_file(self.file_path, "x").startswith("No matches")
+
+    def test_grep_file(self):
+        result = file_read.grep_file(self.file_path, r"error$", max_matches=3)
+        assert result == "100: line 100 error\n200: line 200 error\n300: line 300 error"
+
+    def test_grep_file_ignore_case(self):
+        assert file_read.grep_file(self.file_path, "LINE 1000", ignore_case=True) == "1000: line 1000 error"
+        assert file_read.grep_file(self.file_path, "LINE 1000").startswith("No matches")
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import shutil
+import threading
+import unittest
+from pathlib import Path
+from importlib import import_module
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    with mock.patch.dict(os.environ, {'FIRECRAWL_API_KEY': 'test-key'}):
+        firecrawl = import_module('agentstack._tools.firecrawl')
+except ImportError:
+    raise unittest.SkipTest("Skipping firecrawl tests because `firecrawl-py` is not installed.")
+
+BASE_PATH = Path(__file__).parent
+
+
+class FakeFirecrawlHandler(BaseHTTPRequestHandler):
+    """Serves one crawl whose pages and status are set by the test, a few pages per response."""
+
+    page_size = 2
+    pages: list[dict] = []
+    status = 'scraping'
+    fail = False
+    status_requests: list[int] = []
+
+    def _respond(self, status: int, body: dict):
+        response = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self._respond(200, {'success': True, 'id': 'crawl-1', 'url': f"{self.server.url}/v1/crawl/crawl-1"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        skip = int(parse_qs(url.query).get('skip', ['0'])[0])
+        self.status_requests.append(skip)
+        if self.fail:
+            return self._respond(500, {'success': False, 'error': 'internal'})
+
+        cls = type(self)
+        data = cls.pages[skip : skip + cls.page_size]
+        body = {'status': cls.status, 'total': 5, 'completed': len(cls.pages), 'data': data}
+        if skip + cls.page_size < len(cls.pages):
+            body['next'] = f"{self.server.url}/v1/crawl/crawl-1?skip={skip + cls.page_size}"
+        self._respond(200, body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_page(i: int) -> dict:
+    return {'markdown': f"# Page {i}", 'metadata': {'sourceURL': f"https://example.com/{i}", 'title': f"Page {i}"}}
+
+
+class FirecrawlTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeFirecrawlHandler)
+        host, port = cls.server.server_address[:2]
+        cls.server.url = f"http://{host}:{port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp_dir = BASE_PATH / 'tmp' / 'test_tool_firecrawl'
+        FakeFirecrawlHandler.pages = []
+        FakeFirecrawlHandler.status = 'scraping'
+        FakeFirecrawlHandler.fail = False
+        FakeFirecrawlHandler.status_requests = []
+
+        start_patches(
+            self,
+            mock.patch.object(firecrawl.app, 'api_url', self.server.url),
+            mock.patch.object(firecrawl, 'CRAWL_DIR', self.tmp_dir),
+            mock.patch.object(firecrawl, 'MIN_POLL_INTERVAL', 0.01),
+            mock.patch.object(firecrawl, 'MAX_POLL_INTERVAL', 0.05),
+        )
+
+    def tearDown(self):
+        FakeFirecrawlHandler.status = 'completed'
+        for job in list(firecrawl._jobs.values()):
+            job.join(timeout=5)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _retrieve(self, cursor: int = 0) -> dict:
+        return json.loads(firecrawl.retrieve_web_crawl('crawl-1', cursor))
+
+    def _wait_for(self, condition, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "timed out waiting for the crawl"
+            time.sleep(0.01)
+
+    def test_web_crawl_returns_immediately(self):
+        result = firecrawl.web_crawl("https://example.com")
+        assert result.startswith("Started crawl crawl-1")
+        result = self._retrieve()
+        assert result['pages'] == []
+        assert result['done'] is False
+
+    def test_pages_stream_in(self):
+        firecrawl.web_crawl("https://example.com")
+
+        FakeFirecrawlHandler.pages = [make_page(i) for i in range(3)]
+        self._wait_for(lambda: self._retrieve()['stored'] == 3)
+        result = self._retrieve()
+        assert [page['url'] for page in result['pages']] == [f"https://example.com/{i}" for i in range(3)]
+        assert result['pages'][0] == {'url': "https://example.com/0", 'title': "Page 0", 'markdown': "# Page 0"}
+        assert result['next_cursor'] == 3
+        assert result['done'] is False
+
+        FakeFirecrawlHandler.pages += [make_page(i) for i in range(3, 5)]
+        FakeFirecrawlHandler.status = 'completed'
+        self._wait_for(lambda: self._retrieve()['status'] == 'completed')
+        result = self._retrieve(3)
+        assert [page['title'] for page in result['pages']] == ["Page 3", "Page 4"]
+        assert result['done'] is True
+
+        # stored pages aren't fetched again
+        assert all(skip in (0, 2, 3, 5) for skip in FakeFirecrawlHandler.status_requests)
+
+    def test_retrieve_limits(self):
+        FakeFirecrawlHandler.pages = [make_page(i) for i in range(5)]
+        FakeFirecrawlHandler.status = 'completed'
+        firecrawl.web_crawl("https://example.com")
+        self._wait_for(lambda: self._retrieve()['done'])
+
+        with mock.patch.object(firecrawl, 'MAX_PAGES_PER_RETRIEVE', 2):
+            result = self._retrieve(1)
+        assert [page['title'] for page in result['pages']] == ["Page 1", "Page 2"]
+        assert result['next_cursor'] == 3
+
+        with mock.patch.object(firecrawl, 'MAX_RETRIEVE_CHARS', 10):
+            result = self._retrieve()
+        assert len(result['pages']) == 1
+
+        assert self._retrieve(10)['pages'] == []
+
+    def test_poll_backs_off(self):
+        with mock.patch.object(firecrawl, 'MAX_POLL_INTERVAL', 0.2):
+            firecrawl.web_crawl("https://example.com")
+            time.sleep(0.6)
+        # with no new pages the interval grows instead of polling every 10ms
+        assert len(FakeFirecrawlHandler.status_requests) < 20
+
+    def test_resumes_after_restart(self):
+        firecrawl.web_crawl("https://example.com")
+        FakeFirecrawlHandler.pages = [make_page(0)]
+        self._wait_for(lambda: self._retrieve()['stored'] == 1)
+
+        # stop polling, as if the process had exited
+        job = firecrawl._jobs['crawl-1']
+        with mock.patch.object(job, 'poll', return_value=(False, True)):
+            job.join(timeout=5)
+        assert 'crawl-1' not in firecrawl._jobs
+
+        FakeFirecrawlHandler.pages.append(make_page(1))
+        FakeFirecrawlHandler.status = 'completed'
+        self._wait_for(lambda: self._retrieve()['done'])
+        assert [page['title'] for page in self._retrieve()['pages']] == ["Page 0", "Page 1"]
+
+    def test_uncounted_pages_discarded(self):
+        firecrawl.web_crawl("https://example.com")
+        FakeFirecrawlHandler.pages = [make_page(0)]
+        self._wait_for(lambda: self._retrieve()['stored'] == 1)
+        job = firecrawl._jobs['crawl-1']
+        with mock.patch.object(job, 'poll', return_value=(False, True)):
+            job.join(timeout=5)
+
+        # as if the process exited after writing pages but before counting them
+        store = firecrawl._CrawlStore('crawl-1')
+        store.append_pages([firecrawl._page(make_page(1))])
+        with open(store.pages_path, 'a') as file:
+            file.write('{"url": "https://example.com/partial", "tit')
+
+        FakeFirecrawlHandler.pages += [make_page(1), make_page(2)]
+        FakeFirecrawlHandler.status = 'completed'
+        self._wait_for(lambda: self._retrieve()['done'])
+        assert [page['title'] for page in self._retrieve()['pages']] == ["Page 0", "Page 1", "Page 2"]
+        assert len(store.pages_path.read_text().splitlines()) == 3
+
+    def test_failed_poll_pages_discarded(self):
+        FakeFirecrawlHandler.pages = [make_page(i) for i in range(3)]
+        fetch = firecrawl._CrawlJob._fetch
+        skips = []
+
+        def fail_on_next_part(job, skip):
+            # the second part of the first poll fails after the first part was written
+            skips.append(skip)
+            if len(skips) == 2:
+                raise firecrawl.requests.ConnectionError("connection reset")
+            return fetch(job, skip)
+
+        with mock.patch.object(firecrawl._CrawlJob, '_fetch', fail_on_next_part):
+            firecrawl.web_crawl("https://example.com")
+            self._wait_for(lambda: self._retrieve()['stored'] == 3)
+        FakeFirecrawlHandler.status = 'completed'
+        self._wait_for(lambda: self._retrieve()['done'])
+
+        assert skips[:3] == [0, 2, 0]
+        assert [page['title'] for page in self._retrieve()['pages']] == ["Page 0", "Page 1", "Page 2"]
+
+    def test_poll_errors(self):
+        FakeFirecrawlHandler.fail = True
+        with mock.patch.object(firecrawl, 'MAX_POLL_ERRORS', 2):
+            firecrawl.web_crawl("https://example.com")
+            self._wait_for(lambda: self._retrieve()['status'] == 'failed')
+        result = self._retrieve()
+        assert result['error'].startswith("Failed to check crawl status")
+        assert result['done'] is True
+
+    def test_unknown_crawl(self):
+        assert firecrawl.retrieve_web_crawl('missing').startswith("No crawl found")
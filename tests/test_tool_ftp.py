@@ -0,0 +1,123 @@
+import io
+import os
+import shutil
+import threading
+import unittest
+from importlib import import_module
+from pathlib import Path
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import ThreadedFTPServer
+except ImportError:
+    raise unittest.SkipTest("Skipping ftp tests because `pyftpdlib` is not installed.")
+
+BASE_PATH = Path(__file__).parent
+
+
+class FTPToolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        env = {'FTP_HOST': '127.0.0.1', 'FTP_USER': 'user', 'FTP_PASSWORD': 'password'}
+        with mock.patch.dict(os.environ, env):
+            cls.ftp = import_module('agentstack._tools.ftp')
+
+    def setUp(self):
+        self.tmp_dir = BASE_PATH / 'tmp' / 'test_tool_ftp'
+        self.local_dir = self.tmp_dir / 'local'
+        self.remote_dir = self.tmp_dir / 'remote'
+        os.makedirs(self.local_dir)
+        os.makedirs(self.remote_dir)
+
+        self.logins = 0
+
+        class Handler(FTPHandler):
+            def on_login(handler, username):
+                self.logins += 1
+
+        authorizer = DummyAuthorizer()
+        authorizer.add_user('user', 'password', str(self.remote_dir), perm='elradfmwMT')
+        Handler.authorizer = authorizer
+        self.server = ThreadedFTPServer(('127.0.0.1', 0), Handler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+        start_patches(self, mock.patch.object(self.ftp, 'PORT', self.server.socket.getsockname()[1]))
+
+        # files are stored on the server under the path they are uploaded from
+        try:
+            self.original_cwd = os.getcwd()
+        except FileNotFoundError:  # an earlier test removed the directory it left us in
+            self.original_cwd = str(BASE_PATH)
+        os.chdir(self.local_dir)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.server.close_all()
+        self.server_thread.join()
+        shutil.rmtree(self.tmp_dir)
+
+    def _create_file(self, name: str, size: int) -> bytes:
+        data = os.urandom(size)
+        (self.local_dir / name).write_bytes(data)
+        return data
+
+    def test_upload_files(self):
+        files = {f"file_{i}.bin": self._create_file(f"file_{i}.bin", 10_000 + i) for i in range(10)}
+
+        with mock.patch.object(self.ftp, 'MAX_WORKERS', 3):
+            assert self.ftp.upload_files(list(files))
+
+        for name, data in files.items():
+            assert (self.remote_dir / name).read_bytes() == data
+        # each worker logs in once and reuses its connection
+        assert self.logins <= 3
+
+    def test_upload_files_missing(self):
+        self._create_file('exists.bin', 100)
+        assert not self.ftp.upload_files(['exists.bin', 'missing.bin'])
+        assert (self.remote_dir / 'exists.bin').exists()
+
+    def test_upload_resumes(self):
+        data = self._create_file('large.bin', 512 * 1024)
+        storbinary = self.ftp.FTP.storbinary
+        offsets = []
+
+        def interrupt_first_upload(ftp, cmd, fp, blocksize=8192, callback=None, rest=None):
+            offsets.append(rest)
+            if len(offsets) == 1:
+                # the server receives the first half before the connection drops
+                storbinary(ftp, cmd, io.BytesIO(fp.read(len(data) // 2)), blocksize, callback, rest)
+                raise ConnectionResetError("connection dropped")
+            return storbinary(ftp, cmd, fp, blocksize, callback, rest)
+
+        with mock.patch.multiple(self.ftp, RESUME_MIN_SIZE=1024, RETRY_DELAY=0.2):
+            with mock.patch.object(self.ftp.FTP, 'storbinary', interrupt_first_upload):
+                assert self.ftp.upload_files(['large.bin'])
+
+        assert offsets[0] is None
+        assert offsets[1] == len(data) // 2  # the second attempt continued from the server's copy
+        assert (self.remote_dir / 'large.bin').read_bytes() == data
+
+    def test_stale_remote_file_not_resumed(self):
+        data = self._create_file('large.bin', 512 * 1024)
+        # left on the server by an earlier upload of a different version of the file
+        (self.remote_dir / 'large.bin').write_bytes(os.urandom(len(data) // 2))
+        storbinary = self.ftp.FTP.storbinary
+        offsets = []
+
+        def fail_before_transfer(ftp, cmd, fp, blocksize=8192, callback=None, rest=None):
+            offsets.append(rest)
+            if len(offsets) == 1:
+                raise ConnectionResetError("connection dropped")
+            return storbinary(ftp, cmd, fp, blocksize, callback, rest)
+
+        with mock.patch.multiple(self.ftp, RESUME_MIN_SIZE=1024, RETRY_DELAY=0.2):
+            with mock.patch.object(self.ftp.FTP, 'storbinary', fail_before_transfer):
+                assert self.ftp.upload_files(['large.bin'])
+
+        assert offsets == [None, None]  # nothing was sent, so the upload started over
+        assert (self.remote_dir / 'large.bin').read_bytes() == data
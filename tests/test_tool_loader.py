@@ -0,0 +1,87 @@
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import agentstack
+from agentstack.conf import set_path
+from agentstack import frameworks
+
+BASE_PATH = Path(__file__).parent
+
+
+class ToolLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.project_dir = BASE_PATH / 'tmp' / 'test_tool_loader'
+        os.makedirs(self.project_dir)
+        shutil.copy(BASE_PATH / 'fixtures' / 'agentstack.json', self.project_dir / 'agentstack.json')
+        set_path(self.project_dir)
+        self.loader = agentstack.ToolLoader()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def _mock_callables(self):
+        def tool_func():
+            """Test tool."""
+
+        return mock.patch.object(frameworks, 'get_tool_callables', side_effect=lambda name: [tool_func])
+
+    def test_resolves_once(self):
+        with self._mock_callables() as get_tool_callables:
+            first = self.loader['file_read']
+            second = self.loader['file_read']
+
+        assert get_tool_callables.call_count == 1
+        assert first == second
+        assert first is not second  # callers get their own list
+
+    def test_tools_cached_separately(self):
+        with self._mock_callables() as get_tool_callables:
+            self.loader['file_read']
+            self.loader['ftp']
+            self.loader['file_read']
+
+        assert get_tool_callables.call_count == 2
+
+    def test_project_config_change_invalidates(self):
+        with self._mock_callables() as get_tool_callables:
+            self.loader['file_read']
+            config_path = self.project_dir / 'agentstack.json'
+            stat = os.stat(config_path)
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.loader['file_read']
+
+        assert get_tool_callables.call_count == 2
+
+    def test_project_path_change_invalidates(self):
+        with self._mock_callables() as get_tool_callables:
+            self.loader['file_read']
+            set_path(BASE_PATH / 'tmp')
+            self.loader['file_read']
+
+        assert get_tool_callables.call_count == 2
+
+    def test_invalidate(self):
+        with self._mock_callables() as get_tool_callables:
+            self.loader['file_read']
+            self.loader['ftp']
+            self.loader.invalidate('file_read')
+            self.loader['file_read']
+            self.loader['ftp']
+            assert get_tool_callables.call_count == 3
+
+            self.loader.invalidate()
+            self.loader['file_read']
+            self.loader['ftp']
+            assert get_tool_callables.call_count == 5
+
+    def test_errors_not_cached(self):
+        with mock.patch.object(frameworks, 'get_tool_callables', side_effect=Exception("not installed")) as get_tool_callables:
+            with self.assertRaises(Exception):
+                self.loader['file_read']
+            with self.assertRaises(Exception):
+                self.loader['file_read']
+
+        assert get_tool_callables.call_count == 2
@@ -0,0 +1,95 @@
+import json
+import time
+import threading
+import unittest
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    from agentstack._tools import mem0
+except ImportError:
+    raise unittest.SkipTest("Skipping mem0 tests because `mem0ai` is not installed.")
+
+
+class Mem0Test(unittest.TestCase):
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.client.search.return_value = [{'memory': "Likes potatoes"}]
+        start_patches(
+            self,
+            mock.patch.object(mem0, 'client', self.client),
+            mock.patch.object(mem0, '_write_buffer', mem0._WriteBuffer()),
+            mock.patch.object(mem0, 'FLUSH_INTERVAL', 0.05),
+            mock.patch.object(mem0, 'RETRY_DELAY', 0),
+            mock.patch.dict(mem0._read_cache, clear=True),
+        )
+
+    def tearDown(self):
+        mem0._write_buffer.flush()
+
+    def _wait_for_adds(self, count: int, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while self.client.add.call_count < count:
+            assert time.monotonic() < deadline, "timed out waiting for writes"
+            time.sleep(0.01)
+
+    def test_write_returns_before_sending(self):
+        sent = threading.Event()
+        self.client.add.side_effect = lambda *args, **kwargs: sent.wait(5)
+        assert json.loads(mem0.write_to_memory("My favorite food is potatoes")) == {"status": "queued"}
+        assert not sent.is_set()
+        sent.set()
+
+    def test_writes_batched(self):
+        for i in range(3):
+            mem0.write_to_memory(f"fact {i}")
+        self._wait_for_adds(1)
+        time.sleep(0.1)
+        assert self.client.add.call_count == 1
+        messages = self.client.add.call_args.args[0]
+        assert [message['content'] for message in messages] == ["fact 0", "fact 1", "fact 2"]
+        assert self.client.add.call_args.kwargs == {'user_id': 'default'}
+
+    def test_full_batch_sent_early(self):
+        with mock.patch.object(mem0, 'FLUSH_INTERVAL', 60), mock.patch.object(mem0, 'FLUSH_BATCH_SIZE', 2):
+            for i in range(4):
+                mem0.write_to_memory(f"fact {i}")
+            self._wait_for_adds(2)
+        sent = [message['content'] for call in self.client.add.call_args_list for message in call.args[0]]
+        assert sent == ["fact 0", "fact 1", "fact 2", "fact 3"]
+
+    def test_failed_writes_retried(self):
+        self.client.add.side_effect = [Exception("unavailable"), None]
+        mem0.write_to_memory("fact")
+        self._wait_for_adds(2)
+        assert self.client.add.call_args_list[0] == self.client.add.call_args_list[1]
+
+    def test_read_cached(self):
+        assert mem0.read_from_memory("food") == "Likes potatoes"
+        assert mem0.read_from_memory("food") == "Likes potatoes"
+        assert self.client.search.call_count == 1
+
+        mem0.read_from_memory("drinks")
+        assert self.client.search.call_count == 2
+
+    def test_read_cache_expires(self):
+        with mock.patch.object(mem0, 'READ_CACHE_TTL', 0):
+            mem0.read_from_memory("food")
+            mem0.read_from_memory("food")
+        assert self.client.search.call_count == 2
+
+    def test_write_invalidates_reads(self):
+        mem0.read_from_memory("food")
+        mem0.write_to_memory("My favorite food is carrots")
+        self.client.search.return_value = [{'memory': "Likes carrots"}]
+        assert mem0.read_from_memory("food") == "Likes carrots"
+
+    def test_read_sends_pending_writes_first(self):
+        with mock.patch.object(mem0, 'FLUSH_INTERVAL', 60):
+            mem0.write_to_memory("My favorite food is carrots")
+            mem0.read_from_memory("food")
+        assert [call[0] for call in self.client.method_calls] == ['add', 'search']
+
+    def test_no_memories(self):
+        self.client.search.return_value = []
+        assert mem0.read_from_memory("food") == "No relevant memories found."
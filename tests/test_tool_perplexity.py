@@ -0,0 +1,99 @@
+import json
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from mock_test_utils import start_patches
+
+from agentstack._tools import perplexity
+from agentstack.utils import RateLimiter
+
+
+class FakePerplexityHandler(BaseHTTPRequestHandler):
+    """Answers each query after a short delay, echoing it back."""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+    requests: list[dict] = []
+    connections: set[int] = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append(body)
+        self.connections.add(self.client_address[1])
+        time.sleep(self.delay)
+
+        query = body['messages'][1]['content']
+        if query == "fail":
+            status, response = 500, b'{"error": "internal"}'
+        else:
+            status, response = 200, json.dumps({"choices": [{"message": {"content": f"answer to {query}"}}]}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PerplexityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakePerplexityHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakePerplexityHandler.requests = []
+        FakePerplexityHandler.connections = set()
+        host, port = self.server.server_address[:2]
+        start_patches(
+            self,
+            mock.patch.object(perplexity, 'url', f"http://{host}:{port}/chat/completions"),
+            mock.patch.object(perplexity, '_session', None),
+            mock.patch.object(perplexity, '_rate_limiter', RateLimiter(60_000)),
+        )
+
+    def test_query_perplexity(self):
+        result = json.loads(perplexity.query_perplexity("what is agentstack?"))
+        assert result['choices'][0]['message']['content'] == "answer to what is agentstack?"
+
+    def test_query_perplexity_failed(self):
+        with mock.patch('builtins.print'):
+            assert perplexity.query_perplexity("fail") == "Failed to query perplexity"
+
+    def test_query_perplexity_timeout(self):
+        with mock.patch.object(perplexity, 'TIMEOUT', (1, 0.05)), mock.patch('builtins.print'):
+            assert perplexity.query_perplexity("slow") == "Failed to query perplexity"
+
+    def test_query_perplexity_many(self):
+        queries = [f"question {i}" for i in range(5)]
+        start = time.monotonic()
+        result = perplexity.query_perplexity_many(queries + queries[:2])
+        elapsed = time.monotonic() - start
+
+        # duplicates are only asked once and the rest run side by side
+        assert len(FakePerplexityHandler.requests) == 5
+        assert elapsed < 5 * FakePerplexityHandler.delay
+        sections = result.split("\n\n")
+        for query, section in zip(queries, sections):
+            header, answer = section.split("\n", 1)
+            assert header == f"{query}:"
+            assert answer == perplexity.query_perplexity(query)
+
+    def test_session_reused(self):
+        with mock.patch.object(FakePerplexityHandler, 'delay', 0):
+            for i in range(3):
+                perplexity.query_perplexity(f"question {i}")
+        assert len(FakePerplexityHandler.connections) == 1
+
+    def test_query_perplexity_many_empty(self):
+        assert perplexity.query_perplexity_many([]) == "No queries provided"
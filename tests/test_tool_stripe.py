@@ -0,0 +1,182 @@
+import os
+import json
+import threading
+import unittest
+from importlib import import_module
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    import stripe
+
+    with mock.patch.dict(os.environ, {'STRIPE_SECRET_KEY': 'sk_test_123'}):
+        stripe_tool = import_module('agentstack._tools.stripe')
+except ImportError:
+    raise unittest.SkipTest("Skipping stripe tests because `stripe-agent-toolkit` is not installed.")
+
+
+class FakeStripeHandler(BaseHTTPRequestHandler):
+    """A minimal stand-in for the Stripe API's product and price endpoints."""
+
+    objects: dict[str, list[dict]] = {}
+    requests: list[tuple[str, dict]] = []
+    api_keys: list[str] = []
+
+    def _respond(self, body: dict):
+        response = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def do_GET(self):
+        self.api_keys.append(self.headers['Authorization'].removeprefix('Bearer '))
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        resource = url.path.rsplit('/', 1)[-1]
+        self.requests.append((url.path, params))
+
+        objects = self.objects[resource]
+        if 'product' in params:
+            objects = [obj for obj in objects if obj['product'] == params['product']]
+        ids = [obj['id'] for obj in objects]
+        start = ids.index(params['starting_after']) + 1 if 'starting_after' in params else 0
+        limit = int(params.get('limit', 10))
+        page = objects[start : start + limit]
+        self._respond({'object': 'list', 'url': url.path, 'data': page, 'has_more': start + limit < len(objects)})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        params = {key: values[0] for key, values in parse_qs(body).items()}
+        resource = url.path.rsplit('/', 1)[-1]
+        self.requests.append((url.path, params))
+
+        if resource == 'products':
+            obj = make_product(len(self.objects['products']), params['name'])
+        else:
+            obj = make_price(len(self.objects['prices']), params['product'], int(params['unit_amount']))
+        self.objects[resource].append(obj)
+        self._respond(obj)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_product(i: int, name: str) -> dict:
+    return {'id': f"prod_{i}", 'object': 'product', 'name': name}
+
+
+def make_price(i: int, product: str, unit_amount: int) -> dict:
+    return {'id': f"price_{i}", 'object': 'price', 'product': product, 'unit_amount': unit_amount, 'currency': 'usd'}
+
+
+class StripeToolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeStripeHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeStripeHandler.objects = {
+            'products': [make_product(i, f"Product {i}") for i in range(5)],
+            'prices': [make_price(i, f"prod_{i % 2}", 100 * i) for i in range(5)],
+        }
+        FakeStripeHandler.requests = []
+        FakeStripeHandler.api_keys = []
+        host, port = self.server.server_address[:2]
+        start_patches(
+            self,
+            mock.patch.object(stripe, 'api_base', f"http://{host}:{port}"),
+            mock.patch.object(stripe_tool, 'PAGE_SIZE', 2),
+            mock.patch.object(stripe_tool, '_catalog', stripe_tool._CatalogSnapshot()),
+        )
+
+    def test_iter_products(self):
+        products = stripe_tool.iter_products()
+        assert next(products)['id'] == "prod_0"
+        # only the first page has been fetched
+        assert len(FakeStripeHandler.requests) == 1
+
+        # the key is sent with each request, without relying on the global `stripe.api_key`
+        with mock.patch.object(stripe, 'api_key', None):
+            assert [product['id'] for product in products] == [f"prod_{i}" for i in range(1, 5)]
+        assert len(FakeStripeHandler.requests) == 3
+        assert all(params['limit'] == '2' for _, params in FakeStripeHandler.requests)
+        assert FakeStripeHandler.api_keys == ['sk_test_123'] * 3
+
+    def test_iter_prices(self):
+        assert [price['id'] for price in stripe_tool.iter_prices()] == [f"price_{i}" for i in range(5)]
+        assert [price['id'] for price in stripe_tool.iter_prices("prod_1")] == ["price_1", "price_3"]
+
+    def test_list_all_products_cached(self):
+        products = json.loads(stripe_tool.list_all_products())
+        assert [product['name'] for product in products['data']] == [f"Product {i}" for i in range(5)]
+        assert products['has_more'] is False
+        requests = len(FakeStripeHandler.requests)
+
+        assert json.loads(stripe_tool.list_all_products()) == products
+        assert len(FakeStripeHandler.requests) == requests
+
+    def test_list_all_prices(self):
+        prices = json.loads(stripe_tool.list_all_prices())
+        assert len(prices['data']) == 5
+        prices = json.loads(stripe_tool.list_all_prices("prod_0"))
+        assert [price['id'] for price in prices['data']] == ["price_0", "price_2", "price_4"]
+        # filtering uses the same snapshot
+        assert len(FakeStripeHandler.requests) == 3
+
+    def test_list_all_pages(self):
+        ids = []
+        starting_after = None
+        with mock.patch.object(stripe_tool, 'MAX_LIST_RESULTS', 2):
+            while True:
+                page = json.loads(stripe_tool.list_all_products(starting_after=starting_after))
+                assert len(page['data']) <= 2
+                ids += [product['id'] for product in page['data']]
+                if not page['has_more']:
+                    break
+                starting_after = page['next_starting_after']
+
+            prices = json.loads(stripe_tool.list_all_prices("prod_0", starting_after="price_2"))
+        assert ids == [f"prod_{i}" for i in range(5)]
+        assert [price['id'] for price in prices['data']] == ["price_4"]
+        # every page comes from the same snapshot
+        assert len(FakeStripeHandler.requests) == 6
+
+    def test_list_all_unknown_cursor(self):
+        assert stripe_tool.list_all_products(starting_after="prod_missing").startswith("No object with ID")
+
+    def test_snapshot_expires(self):
+        with mock.patch.object(stripe_tool, 'CATALOG_TTL', 0):
+            stripe_tool.list_all_products()
+            stripe_tool.list_all_products()
+        assert len(FakeStripeHandler.requests) == 6
+
+    def test_create_invalidates_snapshot(self):
+        stripe_tool.list_all_products()
+        stripe_tool.list_all_prices()
+
+        stripe_tool.create_product(name="New product")
+        products = json.loads(stripe_tool.list_all_products())
+        assert products['data'][-1]['name'] == "New product"
+
+        stripe_tool.create_price(product="prod_5", currency="usd", unit_amount=500)
+        prices = json.loads(stripe_tool.list_all_prices("prod_5"))
+        assert [price['unit_amount'] for price in prices['data']] == [500]
+
+    def test_create_during_fetch_not_cached(self):
+        def fetch():
+            yield from stripe_tool.iter_products()
+            stripe_tool.invalidate_catalog()
+
+        stripe_tool._catalog.get("products", fetch)
+        assert not stripe_tool._catalog.lists
@@ -0,0 +1,168 @@
+import io
+import os
+import json
+import base64
+import shutil
+import threading
+import unittest
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    from PIL import Image
+    from agentstack._tools import vision
+    from agentstack.utils import RateLimiter
+except ImportError:
+    raise unittest.SkipTest("Skipping vision tests because `pillow` is not installed.")
+
+BASE_PATH = Path(__file__).parent
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers chat completions with the size of the uploaded image."""
+
+    requests: list[dict] = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append(body)
+        url = body['messages'][0]['content'][1]['image_url']['url']
+        if url.startswith('data:'):
+            header, data = url.split(',', 1)
+            with Image.open(io.BytesIO(base64.b64decode(data))) as image:
+                answer = f"{header} {image.width}x{image.height}"
+        else:
+            answer = f"remote {url}"
+
+        response = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body['model'],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": answer},
+            }],
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class VisionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenAIHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp_dir = BASE_PATH / 'tmp' / 'test_tool_vision'
+        os.makedirs(self.tmp_dir)
+        FakeOpenAIHandler.requests = []
+
+        host, port = self.server.server_address[:2]
+        start_patches(
+            self,
+            mock.patch.dict(os.environ, {
+                'OPENAI_API_KEY': 'test-key',
+                'OPENAI_BASE_URL': f"http://{host}:{port}/v1",
+            }),
+            mock.patch.object(vision, '_client', None),
+            mock.patch.object(vision, '_rate_limiter', RateLimiter(60_000)),
+            mock.patch.dict(vision._analysis_cache, clear=True),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _save_image(self, name: str, size: tuple[int, int], mode: str = 'RGB', color=(200, 30, 30)) -> str:
+        path = self.tmp_dir / name
+        Image.new(mode, size, color).save(path)
+        return str(path)
+
+    def test_large_image_downscaled(self):
+        path = self._save_image('large.png', (4000, 3000))
+        assert vision.analyze_image(path) == "data:image/jpeg;base64 1024x768"
+
+    def test_wide_image_fits_max_dimension(self):
+        path = self._save_image('wide.jpg', (8000, 1000))
+        assert vision.analyze_image(path) == "data:image/jpeg;base64 2048x256"
+
+    def test_transparent_image_kept_as_png(self):
+        path = self._save_image('logo.png', (3000, 3000), mode='RGBA', color=(0, 0, 0, 0))
+        assert vision.analyze_image(path) == "data:image/png;base64 768x768"
+
+    def test_small_image_sent_unchanged(self):
+        path = self._save_image('small.png', (100, 50))
+        assert vision.analyze_image(path) == "data:image/png;base64 100x50"
+        url = FakeOpenAIHandler.requests[0]['messages'][0]['content'][1]['image_url']['url']
+        assert base64.b64decode(url.split(',', 1)[1]) == Path(path).read_bytes()
+
+    def test_unsupported_format_reencoded(self):
+        path = self._save_image('image.bmp', (100, 50))
+        assert vision.analyze_image(path) == "data:image/jpeg;base64 100x50"
+
+    def test_web_image(self):
+        assert vision.analyze_image("https://example.com/cat.jpg") == "remote https://example.com/cat.jpg"
+
+    def test_prompt(self):
+        path = self._save_image('small.png', (10, 10))
+        vision.analyze_image(path, "How many cats are there?")
+        assert FakeOpenAIHandler.requests[0]['messages'][0]['content'][0]['text'] == "How many cats are there?"
+
+    def test_cached_by_content_and_prompt(self):
+        path = self._save_image('first.png', (10, 10))
+        copy = self.tmp_dir / 'copy.png'
+        shutil.copy(path, copy)
+
+        vision.analyze_image(path)
+        vision.analyze_image(str(copy))
+        assert len(FakeOpenAIHandler.requests) == 1
+
+        vision.analyze_image(path, "Describe the colors.")
+        assert len(FakeOpenAIHandler.requests) == 2
+
+        self._save_image('first.png', (10, 10), color=(0, 0, 255))
+        vision.analyze_image(path)
+        assert len(FakeOpenAIHandler.requests) == 3
+
+    def test_client_reused(self):
+        with mock.patch.object(vision, 'OpenAI', wraps=vision.OpenAI) as client:
+            vision.analyze_image(self._save_image('a.png', (10, 10)))
+            vision.analyze_image(self._save_image('b.png', (20, 20)))
+        assert client.call_count == 1
+
+    def test_analyze_images(self):
+        paths = [self._save_image(f"{i}.png", (10 * (i + 1), 10)) for i in range(6)]
+        result = vision.analyze_images(paths + paths[:2])
+        assert len(FakeOpenAIHandler.requests) == 6
+        for i, path in enumerate(paths):
+            assert f"{path}:\ndata:image/png;base64 {10 * (i + 1)}x10" in result
+
+    def test_analyze_images_rate_limited(self):
+        paths = [self._save_image(f"{i}.png", (10 * (i + 1), 10)) for i in range(3)]
+        with mock.patch.object(vision, '_rate_limiter', RateLimiter(60)), \
+                mock.patch('agentstack.utils.time.sleep') as sleep:
+            vision.analyze_images(paths)
+        # the first request starts right away and each one after waits its turn
+        waits = sorted(call.args[0] for call in sleep.call_args_list)
+        assert len(waits) == 2
+        assert 0 < waits[0] <= 1.0 < waits[1] <= 2.0
+
+    def test_errors(self):
+        assert vision.analyze_image("") == "Image Path or URL is required."
+        assert vision.analyze_image(str(self.tmp_dir / 'missing.png')).startswith("Failed to analyze image")
+        assert vision.analyze_images([]) == "Image Paths or URLs are required."
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import threading
+import unittest
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock
+from mock_test_utils import start_patches
+
+try:
+    from weaviate.exceptions import WeaviateConnectionError
+
+    env = {'WEAVIATE_URL': 'http://localhost:8080', 'WEAVIATE_API_KEY': 'test', 'OPENAI_API_KEY': 'test'}
+    with mock.patch.dict(os.environ, env):
+        weaviate_tool = import_module('agentstack.tools.weaviate')
+except ImportError:
+    raise unittest.SkipTest("Skipping weaviate tests because `weaviate-client` is not installed.")
+
+
+class FakeCollection:
+    """Answers near-text queries and batch inserts the way a Weaviate collection does."""
+
+    def __init__(self):
+        self.query = SimpleNamespace(near_text=self.near_text)
+        self.data = SimpleNamespace(insert_many=self.insert_many)
+        self.batches: list[list[dict]] = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def near_text(self, query: str, limit: int):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            # later queries answer first, so results come back out of order
+            time.sleep(0.05 / (1 + len(query)))
+            if query.startswith("fail"):
+                raise ValueError(f"bad query {query}")
+            return SimpleNamespace(objects=[SimpleNamespace(properties={"text": f"{query} {i}"}) for i in range(limit)])
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def insert_many(self, objects: list[dict]):
+        self.batches.append(objects)
+        errors = {i: SimpleNamespace(message="invalid") for i, obj in enumerate(objects) if obj.get("invalid")}
+        return SimpleNamespace(errors=errors)
+
+
+class FakeClient:
+    def __init__(self, collection: FakeCollection):
+        self.collections = SimpleNamespace(get=lambda name: collection, exists=lambda name: name == "Docs")
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class WeaviateTest(unittest.TestCase):
+    def setUp(self):
+        self.collection = FakeCollection()
+        self.client = FakeClient(self.collection)
+        start_patches(self, mock.patch.object(weaviate_tool, '_client', self.client))
+
+    def test_search_collection_many(self):
+        queries = ["a", "bb", "ccc", "a"]
+        result = json.loads(weaviate_tool.search_collection_many("Docs", queries, limit=2))
+
+        # keyed in the order the queries were given, each asked once
+        assert list(result) == ["a", "bb", "ccc"]
+        assert result["bb"] == [{"text": "bb 0"}, {"text": "bb 1"}]
+        assert self.collection.max_active > 1
+
+    def test_search_collection_many_concurrency_limit(self):
+        queries = [f"query {i}" for i in range(6)]
+        with mock.patch.object(weaviate_tool, 'MAX_CONCURRENT_QUERIES', 2):
+            result = json.loads(weaviate_tool.search_collection_many("Docs", queries))
+        assert list(result) == queries
+        assert self.collection.max_active <= 2
+
+    def test_search_collection_many_error_isolated(self):
+        result = json.loads(weaviate_tool.search_collection_many("Docs", ["a", "fail", "b"], limit=1))
+        assert result["a"] == [{"text": "a 0"}]
+        assert result["fail"] == {"error": "bad query fail"}
+        assert result["b"] == [{"text": "b 0"}]
+
+    def test_search_collection_many_reconnects(self):
+        near_text = self.collection.near_text
+        calls = []
+
+        def dropped_once(query, limit):
+            calls.append(query)
+            if len(calls) == 1:
+                raise WeaviateConnectionError("connection lost")
+            return near_text(query, limit)
+
+        self.collection.query.near_text = dropped_once
+        with mock.patch.object(weaviate_tool, '_get_client', side_effect=[self.client, self.client]):
+            result = json.loads(weaviate_tool.search_collection_many("Docs", ["a"], limit=1))
+        assert result == {"a": [{"text": "a 0"}]}
+        assert self.client.closed
+
+    def test_insert_objects_batches(self):
+        objects = [{"text": f"doc {i}", "invalid": i in (1, 4)} for i in range(5)]
+        with mock.patch.object(weaviate_tool, 'INSERT_BATCH_SIZE', 2):
+            result = json.loads(weaviate_tool.insert_objects("Docs", objects))
+
+        assert [len(batch) for batch in self.collection.batches] == [2, 2, 1]
+        assert [obj for batch in self.collection.batches for obj in batch] == objects
+        # indexes refer to the position in `objects`, not in the batch
+        assert result == {"inserted": 3, "failed": ["object 1: invalid", "object 4: invalid"]}
+
+    def test_insert_objects_missing_collection(self):
+        with self.assertRaisesRegex(ValueError, "Collection Missing not found"):
+            weaviate_tool.insert_objects("Missing", [{"text": "doc"}])
+        assert self.collection.batches == []
+
+    def test_insert_objects_empty(self):
+        assert json.loads(weaviate_tool.insert_objects("Docs", [])) == {"inserted": 0, "failed": []}
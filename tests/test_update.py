@@ -6,6 +6,7 @@ from parameterized import parameterized
 from pathlib import Path
 from packaging.version import Version
 import requests
+from agentstack import update
 from agentstack.update import (
     _is_ci_environment,
     CI_ENV_VARS,
@@ -16,6 +17,9 @@ from agentstack.update import (
     record_update_check,
     INSTALL_PATH,
     CHECK_EVERY,
+    check_for_updates,
+    get_cached_latest_version,
+    refresh_latest_version,
 )
 
 BASE_DIR = Path(__file__).parent
@@ -142,3 +146,76 @@ class TestUpdate(unittest.TestCase):
             str(INSTALL_PATH): 1000000 - CHECK_EVERY - 1
         }  # CHECK_EVERY + 1 second ago
         self.assertTrue(should_update())
+
+    @patch('agentstack.update.record_update_check')
+    @patch('agentstack.update.run_in_background')
+    @patch('agentstack.update.get_latest_version')
+    @patch('agentstack.update._is_ci_environment', return_value=False)
+    @patch('agentstack.update.should_update', return_value=True)
+    def test_check_for_updates_does_not_block(self, _, __, mock_get_latest, mock_background, ___):
+        """
+        A due update check compares against the cached version and refreshes it in the background.
+        """
+        with patch('agentstack.update.get_cached_latest_version', return_value=None):
+            check_for_updates()
+
+        mock_get_latest.assert_not_called()
+        mock_background.assert_called_once_with('agentstack.update', 'refresh')
+
+    @patch('inquirer.confirm', return_value=False)
+    @patch('agentstack.update.record_update_check')
+    @patch('agentstack.update.run_in_background')
+    @patch('agentstack.update._is_ci_environment', return_value=False)
+    @patch('agentstack.update.should_update', return_value=True)
+    def test_check_for_updates_prompts_from_cache(self, _, __, mock_background, ___, mock_confirm):
+        with patch('agentstack.update.get_cached_latest_version', return_value=Version('999.0.0')):
+            check_for_updates()
+
+        mock_confirm.assert_called_once()
+
+    @patch.dict('os.environ', {}, clear=True)
+    @patch(
+        'agentstack.update.LAST_CHECK_FILE_PATH',
+        new_callable=lambda: BASE_DIR / 'tests/tmp/test_update/last_check.json',
+    )
+    @patch('agentstack.update._is_ci_environment', return_value=False)
+    @patch('agentstack.update.run_in_background')
+    def test_check_for_updates_refreshes_once(self, mock_background, _, mock_file_path):
+        """
+        The check is recorded before the background refresh starts, so a refresh
+        that never finishes isn't started again by the next invocation.
+        """
+        check_for_updates()
+        check_for_updates()
+
+        mock_background.assert_called_once_with('agentstack.update', 'refresh')
+
+        os.remove(mock_file_path)
+        mock_file_path.parent.rmdir()
+
+    @patch('agentstack.update.run_in_background')
+    @patch('agentstack.update.should_update', return_value=False)
+    def test_check_for_updates_not_due(self, _, mock_background):
+        check_for_updates()
+        mock_background.assert_not_called()
+
+    @patch(
+        'agentstack.update.LAST_CHECK_FILE_PATH',
+        new_callable=lambda: BASE_DIR / 'tests/tmp/test_update/last_check.json',
+    )
+    @patch('agentstack.update._is_ci_environment', return_value=False)
+    @patch('agentstack.update.get_latest_version')
+    def test_refresh_latest_version(self, mock_get_latest, _, mock_file_path):
+        mock_get_latest.return_value = Version('1.2.3')
+        refresh_latest_version()
+        self.assertEqual(get_cached_latest_version(), Version('1.2.3'))
+        self.assertEqual(mock_get_latest.call_args.kwargs['timeout'], update.REQUEST_TIMEOUT)
+
+        # failures keep the previous result but still count as a check
+        mock_get_latest.side_effect = requests.ConnectionError()
+        refresh_latest_version()
+        self.assertEqual(get_cached_latest_version(), Version('1.2.3'))
+        self.assertIn(str(INSTALL_PATH), load_update_data())
+
+        os.remove(mock_file_path)
+        mock_file_path.parent.rmdir()
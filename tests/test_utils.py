@@ -1,4 +1,5 @@
 import os
+import shutil
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -7,7 +8,10 @@ from agentstack.utils import (
     clean_input,
     is_snake_case,
     validator_not_empty,
-    get_base_dir
+    get_base_dir,
+    load_yaml_snapshot,
+    invalidate_yaml_snapshot,
+    RateLimiter,
 )
 from inquirer import errors as inquirer_errors
 
@@ -69,4 +73,67 @@ class TestUtils(unittest.TestCase):
         result = get_base_dir()
 
         self.assertIsInstance(result, Path)
-        self.assertTrue(result.is_absolute())
\ No newline at end of file
+        self.assertTrue(result.is_absolute())
+
+
+class TestYamlSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.project_dir = Path(__file__).parent / 'tmp' / 'yaml_snapshot'
+        os.makedirs(self.project_dir)
+        self.path = self.project_dir / 'config.yaml'
+        self.path.write_text("agent:\n  role: writer\n  tools: [a, b]\n")
+
+    def tearDown(self):
+        invalidate_yaml_snapshot()
+        shutil.rmtree(self.project_dir)
+
+    def test_parses_once(self):
+        first = load_yaml_snapshot(self.path)
+        with patch('ruamel.yaml.YAML') as mock_yaml:
+            second = load_yaml_snapshot(self.path)
+        mock_yaml.assert_not_called()
+        assert first is second
+        assert first['agent']['role'] == 'writer'
+        assert first['agent']['tools'] == ('a', 'b')
+
+    def test_snapshot_is_immutable(self):
+        data = load_yaml_snapshot(self.path)
+        with self.assertRaises(TypeError):
+            data['agent'] = {}  # type: ignore[index]
+        with self.assertRaises(TypeError):
+            data['agent']['role'] = 'editor'  # type: ignore[index]
+
+    def test_reloads_when_file_changes(self):
+        load_yaml_snapshot(self.path)
+        self.path.write_text("agent:\n  role: editor\n")
+        assert load_yaml_snapshot(self.path)['agent']['role'] == 'editor'
+
+    def test_invalidate(self):
+        first = load_yaml_snapshot(self.path)
+        # same size and mtime, so only an explicit invalidation notices the rewrite
+        stat = os.stat(self.path)
+        self.path.write_text("agent:\n  role: xriter\n  tools: [a, b]\n")
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert load_yaml_snapshot(self.path) is first
+
+        invalidate_yaml_snapshot(self.path)
+        assert load_yaml_snapshot(self.path)['agent']['role'] == 'xriter'
+
+    def test_empty_file(self):
+        self.path.write_text("")
+        assert load_yaml_snapshot(self.path) is None
+
+
+class TestRateLimiter(unittest.TestCase):
+    @patch('agentstack.utils.time.sleep')
+    @patch('agentstack.utils.time.monotonic', return_value=100.0)
+    def test_rate_limiter(self, monotonic, sleep):
+        limiter = RateLimiter(per_minute=30)
+        for _ in range(3):
+            limiter.wait()
+        # the first call returns at once and each later one waits its turn
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [2.0, 4.0])
+
+        monotonic.return_value = 110.0
+        limiter.wait()
+        self.assertEqual(sleep.call_count, 2)